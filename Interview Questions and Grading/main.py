@@ -1,95 +1,377 @@
 # interview_system_embeddings.py
+"""
+Standalone interview grader.
 
+    python main.py                                   # interactive interview
+    python main.py --batch answers.csv --output scored.csv [--workers 4]
+
+Batch mode grades archived answers without prompting: the input is a CSV
+(`Question Number`, `Answer` columns) or JSONL (`question_number`, `answer`
+keys) file, read `--chunk-size` rows at a time. Every chunk is encoded in one
+pass and compared against a cached reference-answer index, so reference
+answers are never re-encoded. The backend's index is reused when it was built
+from the same questions CSV; any other CSV gets its own index under
+`<cache-dir>/batch/<csv sha256>`, so the backend's cache is never overwritten.
+With `--workers`
+above 1, chunks are scored in a process pool; results are written in input
+order as soon as each chunk is done, with every input column kept and
+`similarity` / `is_correct` added.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
-import random
-from sentence_transformers import SentenceTransformer, util
 
-# -----------------------------
-# Step 1: Load CSV files
-# -----------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(os.path.dirname(BASE_DIR), "my-interview-app", "backend")
+# Same default as the backend's INTERVIEW_CACHE_DIR, so both can share one index
+DEFAULT_CACHE_DIR = os.environ.get('INTERVIEW_CACHE_DIR', os.path.join(BACKEND_DIR, '.cache'))
+MODEL_NAME = 'all-MiniLM-L6-v2'  # lightweight, fast
+CORRECT_THRESHOLD = 0.5
 
-# Categories to include in the interview (automatic from categories.csv)
-categories_df = pd.read_csv("categories.csv")  # Column: Category
-chosen_categories = categories_df['Category'].tolist()
-print(f"Categories selected for this interview: {chosen_categories}")
+QUESTION_KEYS = ('Question Number', 'question_number', 'question_id')
+ANSWER_KEYS = ('Answer', 'answer')
 
-# Load questions dataset
-questions_df = pd.read_csv("questions.csv")  # Columns: Question Number, Question, Answer1-4, Category, Difficulty
 
-# -----------------------------
-# Step 2: Pick questions
-# -----------------------------
+def run_interview():
+    from sentence_transformers import SentenceTransformer, util
 
-questions_per_category = 1
-interview_questions = pd.DataFrame()
+    # -----------------------------
+    # Step 1: Load CSV files
+    # -----------------------------
 
-for cat in chosen_categories:
-    cat_questions = questions_df[questions_df['Category'] == cat]
-    # Pick min(questions_per_category, available questions)
-    num_to_pick = min(questions_per_category, len(cat_questions))
-    selected = cat_questions.sample(num_to_pick, random_state=42)
-    interview_questions = pd.concat([interview_questions, selected])
+    # Categories to include in the interview (automatic from categories.csv)
+    categories_df = pd.read_csv("categories.csv")  # Column: Category
+    chosen_categories = categories_df['Category'].tolist()
+    print(f"Categories selected for this interview: {chosen_categories}")
 
-# Shuffle questions
-interview_questions = interview_questions.sample(frac=1, random_state=42).reset_index(drop=True)
-print(f"Total questions selected: {len(interview_questions)}")
+    # Load questions dataset
+    questions_df = pd.read_csv("questions.csv")  # Columns: Question Number, Question, Answer1-4, Category, Difficulty
 
-# -----------------------------
-# Step 3: Load sentence embedding model
-# -----------------------------
+    # -----------------------------
+    # Step 2: Pick questions
+    # -----------------------------
+
+    questions_per_category = 1
+    interview_questions = pd.DataFrame()
+
+    for cat in chosen_categories:
+        cat_questions = questions_df[questions_df['Category'] == cat]
+        # Pick min(questions_per_category, available questions)
+        num_to_pick = min(questions_per_category, len(cat_questions))
+        selected = cat_questions.sample(num_to_pick, random_state=42)
+        interview_questions = pd.concat([interview_questions, selected])
+
+    # Shuffle questions
+    interview_questions = interview_questions.sample(frac=1, random_state=42).reset_index(drop=True)
+    print(f"Total questions selected: {len(interview_questions)}")
+
+    # -----------------------------
+    # Step 3: Load sentence embedding model
+    # -----------------------------
+
+    print("\nLoading sentence-transformer model...")
+    model = SentenceTransformer(MODEL_NAME)
+    print("Model loaded successfully!\n")
+
+    # -----------------------------
+    # Step 4: Define NLP scoring function
+    # -----------------------------
+
+    def score_answer(user_answer, ref_answers):
+        """
+        Compares user_answer with 4 reference answers using sentence embeddings.
+        Returns 1, 0.5, or 0 marks based on similarity thresholds.
+        """
+        # Get embeddings
+        embeddings = model.encode(ref_answers + [user_answer])
+        user_emb = embeddings[-1]
+        ref_embs = embeddings[:-1]
+
+        # Compute cosine similarity
+        sim_scores = [util.cos_sim(user_emb, ref_emb)[0][0].item() for ref_emb in ref_embs]
+        max_sim = max(sim_scores)
+
+        # Scoring thresholds
+        # if max_sim >= 0.8:
+        #     return 1
+        # elif max_sim >= 0.6:
+        #     return 0.5
+        # else:
+        #     return 0
+        return max_sim
+
+    # -----------------------------
+    # Step 5: Conduct interview
+    # -----------------------------
+
+    total_score = 0
+
+    print("\n--- Humanless Interview Started ---\n")
+
+    for idx, row in interview_questions.iterrows():
+        print(f"Q{idx+1}: {row['Question']}")
+        user_ans = input("Your Answer: ")
+        ref_answers = [row['Answer1'], row['Answer2'], row['Answer3'], row['Answer4']]
+
+        score = score_answer(user_ans, ref_answers)
+        print(f"Score for this question: {score}\n")
+        total_score += score
+
+    # -----------------------------
+    # Step 6: Compute final score
+    # -----------------------------
+
+    final_score = round((total_score / len(interview_questions)) * 10, 2)
+    print(f"\n--- Interview Completed ---")
+    print(f"Your Final Score: {final_score} / 10")
 
-print("\nLoading sentence-transformer model...")
-model = SentenceTransformer('all-MiniLM-L6-v2')  # lightweight, fast
-print("Model loaded successfully!\n")
 
 # -----------------------------
-# Step 4: Define NLP scoring function
+# Batch mode
 # -----------------------------
 
-def score_answer(user_answer, ref_answers):
+def _is_jsonl(path):
+    return path.lower().endswith(('.jsonl', '.ndjson'))
+
+
+def _pick(row, keys):
+    for key in keys:
+        if key in row:
+            return row[key]
+    return None
+
+
+def check_columns(path):
+    """Raise ValueError unless the input has a question number and an answer column"""
+    if _is_jsonl(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            first = next((line for line in f if line.strip()), None)
+        if first is None:
+            raise ValueError(f"{path} is empty")
+        columns = json.loads(first)
+        if not isinstance(columns, dict):
+            raise ValueError(f"{path}: every line must be a JSON object")
+    else:
+        columns = pd.read_csv(path, nrows=0).columns
+    for keys in (QUESTION_KEYS, ANSWER_KEYS):
+        if not any(key in columns for key in keys):
+            raise ValueError(f"{path} has none of the columns {', '.join(keys)}")
+
+
+def read_chunks(path, chunk_size):
+    """Yield lists of row dicts, `chunk_size` at a time, without reading the whole file"""
+    if _is_jsonl(path):
+        chunk = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    chunk.append(json.loads(line))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+        return
+    for df in pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False):
+        yield df.to_dict('records')
+
+
+class ResultWriter:
+    """Appends scored rows to a CSV or JSONL file, flushing after every chunk"""
+
+    def __init__(self, path):
+        self.jsonl = _is_jsonl(path)
+        self.f = open(path, 'w', encoding='utf-8', newline='')
+        self.writer = None
+
+    def write(self, rows):
+        if self.jsonl:
+            for row in rows:
+                self.f.write(json.dumps(row, ensure_ascii=False) + '\n')
+        else:
+            if self.writer is None:
+                self.writer = csv.DictWriter(self.f, fieldnames=list(rows[0]), extrasaction='ignore')
+                self.writer.writeheader()
+            self.writer.writerows(rows)
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+def _backend_imports():
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+
+
+def prepare_reference_index(questions_path, cache_dir, model_name, backend):
     """
-    Compares user_answer with 4 reference answers using sentence embeddings.
-    Returns 1, 0.5, or 0 marks based on similarity thresholds.
+    (index directory, CSV sha256) of a current reference index for `questions_path`.
+
+    The backend's index in `cache_dir` is used as is when it matches the CSV;
+    otherwise the index is built in a per-CSV subdirectory, so grading another
+    bank never replaces the files the backend is serving from.
     """
-    # Get embeddings
-    embeddings = model.encode(ref_answers + [user_answer])
-    user_emb = embeddings[-1]
-    ref_embs = embeddings[:-1]
-    
-    # Compute cosine similarity
-    sim_scores = [util.cos_sim(user_emb, ref_emb)[0][0].item() for ref_emb in ref_embs]
-    max_sim = max(sim_scores)
-    
-    # Scoring thresholds
-    # if max_sim >= 0.8:
-    #     return 1
-    # elif max_sim >= 0.6:
-    #     return 0.5
-    # else:
-    #     return 0
-    return max_sim
+    _backend_imports()
+    from bank_compiler import load_or_compile
+    from encoders import encoder_id, load_encoder
+    from reference_index import ReferenceIndex, file_sha256
 
-# -----------------------------
-# Step 5: Conduct interview
-# -----------------------------
+    csv_sha256 = file_sha256(questions_path)
+    model_id = encoder_id(model_name, backend)
+    if ReferenceIndex.load(cache_dir, model_id, csv_sha256) is not None:
+        return cache_dir, csv_sha256
 
-total_score = 0
+    index_dir = os.path.join(cache_dir, 'batch', csv_sha256[:16])
+    bank = load_or_compile(questions_path, index_dir)
+    if ReferenceIndex.load(index_dir, model_id, bank.csv_sha256) is None:
+        ReferenceIndex.load_or_build(
+            questions_path, bank, load_encoder(model_name, backend), model_id, index_dir,
+            csv_sha256=bank.csv_sha256,
+        )
+    return index_dir, bank.csv_sha256
 
-print("\n--- Humanless Interview Started ---\n")
 
-for idx, row in interview_questions.iterrows():
-    print(f"Q{idx+1}: {row['Question']}")
-    user_ans = input("Your Answer: ")
-    ref_answers = [row['Answer1'], row['Answer2'], row['Answer3'], row['Answer4']]
-    
-    score = score_answer(user_ans, ref_answers)
-    print(f"Score for this question: {score}\n")
-    total_score += score
+class ChunkScorer:
+    """Scores (question ids, answers) chunks against the memory-mapped reference index"""
+
+    def __init__(self, cache_dir, model_name, backend, csv_sha256, num_threads=None):
+        _backend_imports()
+        from encoders import encoder_id, load_encoder
+        from reference_index import ReferenceIndex
+
+        self.model = load_encoder(model_name, backend, num_threads=num_threads)
+        self.index = ReferenceIndex.load(cache_dir, encoder_id(model_name, backend), csv_sha256)
+        if self.index is None:
+            raise RuntimeError(f"No reference index for this questions.csv in {cache_dir}")
+
+    def score(self, question_ids, answers):
+        """Similarity per answer; NaN where the question is not in the index"""
+        rows = self.index.rows_for(question_ids)
+        known = np.flatnonzero(rows >= 0)
+        sims = np.full(len(answers), np.nan, dtype=np.float32)
+        if known.size:
+            answer_embs = self.model.encode(
+                [answers[i] for i in known],
+                batch_size=64,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+            ref_embs = self.index.embeddings[rows[known]]  # (answers, references, dim)
+            sims[known] = np.einsum('ard,ad->ar', ref_embs, answer_embs).max(axis=1)
+        return sims
+
+
+_worker_scorer = None
+
+
+def _init_worker(*args):
+    global _worker_scorer
+    _worker_scorer = ChunkScorer(*args, num_threads=1)
+
+
+def _score_in_worker(question_ids, answers):
+    return _worker_scorer.score(question_ids, answers)
+
+
+def _merge(rows, sims, threshold):
+    for row, sim in zip(rows, sims):
+        if np.isnan(sim):
+            row['similarity'] = None
+            row['is_correct'] = None
+            row['error'] = 'Unknown question'
+        else:
+            row['similarity'] = round(float(sim), 4)
+            row['is_correct'] = bool(sim > threshold)
+            row['error'] = None
+    return rows
+
+
+def run_batch(input_path, output_path, questions_path, cache_dir, model_name=MODEL_NAME, backend='torch',
+              workers=1, chunk_size=1024, threshold=CORRECT_THRESHOLD):
+    start = time.perf_counter()
+    check_columns(input_path)
+    index_dir, csv_sha256 = prepare_reference_index(questions_path, cache_dir, model_name, backend)
+    scorer_args = (index_dir, model_name, backend, csv_sha256)
+
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=scorer_args)
+        print(f"✓ Scoring with {workers} worker processes")
+    else:
+        scorer = ChunkScorer(*scorer_args)
+
+    writer = ResultWriter(output_path)
+    # At most two chunks per worker in flight, so memory stays bounded on any input size
+    pending = deque()
+    scored = 0
+
+    def write_next():
+        nonlocal scored
+        rows, future = pending.popleft()
+        writer.write(_merge(rows, future.result(), threshold))
+        scored += len(rows)
+        elapsed = time.perf_counter() - start
+        print(f"✓ {scored} answers scored ({scored / elapsed:.0f}/s)")
+
+    try:
+        for rows in read_chunks(input_path, chunk_size):
+            question_ids = [_pick(row, QUESTION_KEYS) for row in rows]
+            answers = ["" if a is None else str(a) for a in (_pick(row, ANSWER_KEYS) for row in rows)]
+            if pool is None:
+                writer.write(_merge(rows, scorer.score(question_ids, answers), threshold))
+                scored += len(rows)
+                print(f"✓ {scored} answers scored ({scored / (time.perf_counter() - start):.0f}/s)")
+                continue
+            pending.append((rows, pool.submit(_score_in_worker, question_ids, answers)))
+            if len(pending) >= 2 * workers:
+                write_next()
+        while pending:
+            write_next()
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - start
+    print(f"🎉 Scored {scored} answers in {elapsed:.1f}s -> {output_path}")
+    return scored
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", metavar="INPUT", help="CSV or JSONL file of (question number, answer) rows")
+    parser.add_argument("--output", help="scored CSV or JSONL file (default: <input>.scored.<ext>)")
+    parser.add_argument("--questions", default=os.path.join(BASE_DIR, "questions.csv"))
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--backend", default='torch', help="encoder backend: torch, torch-int8, onnx, onnx-int8")
+    parser.add_argument("--workers", type=int, default=1, help="scoring processes (1 scores in this process)")
+    parser.add_argument("--chunk-size", type=int, default=1024)
+    parser.add_argument("--threshold", type=float, default=CORRECT_THRESHOLD)
+    args = parser.parse_args()
+
+    if not args.batch:
+        run_interview()
+        return
+    root, ext = os.path.splitext(args.batch)
+    output = args.output or f"{root}.scored{ext}"
+    try:
+        check_columns(args.batch)
+    except (OSError, ValueError) as e:
+        sys.exit(f"❌ Cannot grade {args.batch}: {e}")
+    run_batch(args.batch, output, args.questions, args.cache_dir, args.model, args.backend,
+              workers=max(args.workers, 1), chunk_size=max(args.chunk_size, 1), threshold=args.threshold)
 
-# -----------------------------
-# Step 6: Compute final score
-# -----------------------------
 
-final_score = round((total_score / len(interview_questions)) * 10, 2)
-print(f"\n--- Interview Completed ---")
-print(f"Your Final Score: {final_score} / 10")
+if __name__ == "__main__":
+    main()
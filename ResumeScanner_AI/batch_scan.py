@@ -0,0 +1,233 @@
+"""
+Batch resume scanner.
+
+    python batch_scan.py resumes/ --output scan_results.jsonl --workers 4
+
+Walks a directory (recursively) for .pdf, .docx and .txt resumes and scans
+them over a process pool; every worker compiles the taxonomy once. One row
+per resume (file, sha256, categories, keyword hits, timings) is appended to
+the CSV or JSONL output as soon as it completes, so an interrupted run loses
+at most the scans in flight. Re-running with the same output skips every
+file whose SHA-256 is already in it (scanned under the same taxonomy, failed
+rows included), so a crashed run picks up where it stopped.
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from modules.pdf_parser import is_extraction_error
+from modules.scan_cache import file_digest
+from resume_scanner import (
+    DEFAULT_ALLCATEGORIES, compile_categories, extract_resume_text, read_allcategories, taxonomy_version,
+)
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.txt')
+FIELDS = ['file', 'sha256', 'taxonomy', 'categories', 'hits', 'text_length', 'extract_ms', 'match_ms', 'error']
+
+
+def iter_resumes(root):
+    """Resume paths under `root`, yielded while the walk is still going"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(RESUME_EXTENSIONS):
+                yield os.path.join(dirpath, name)
+
+
+def _is_jsonl(path):
+    return path.lower().endswith(('.jsonl', '.ndjson'))
+
+
+def completed_hashes(output_path, taxonomy):
+    """SHA-256 of every resume already in `output_path` that was scanned under `taxonomy`"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, newline='', encoding='utf-8') as f:
+        rows = _read_jsonl(f) if _is_jsonl(output_path) else _read_csv(f)
+        for row in rows:
+            if row.get('sha256') and row.get('taxonomy') == taxonomy:
+                done.add(row['sha256'])
+    return done
+
+
+def _read_csv(f):
+    for row in csv.DictReader(f):
+        # A row cut off by a crash is missing its last columns (DictReader
+        # fills them with None) or has a half-written hits field
+        if None in row or any(row.get(field) is None for field in FIELDS):
+            continue
+        try:
+            hits = json.loads(row['hits'])
+        except ValueError:
+            continue
+        if isinstance(hits, dict):
+            yield row
+
+
+def _read_jsonl(f):
+    for line in f:
+        try:
+            yield json.loads(line)
+        except ValueError:
+            # Skip anything unparseable rather than give up on the rest of the file
+            continue
+
+
+def _drop_torn_line(path, block_size=1 << 16):
+    """Truncate a half-written last line left by a crash, so new rows are not appended to it"""
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(pos - block_size, 0)
+            f.seek(start)
+            newline = f.read(pos - start).rfind(b'\n')
+            if newline >= 0:
+                pos = start + newline + 1
+                break
+            pos = start
+        if pos < end:
+            f.truncate(pos)
+
+
+class ResultWriter:
+    """Appends scan rows to a CSV or JSONL file, flushing each one"""
+
+    def __init__(self, path):
+        self.jsonl = _is_jsonl(path)
+        if os.path.exists(path):
+            _drop_torn_line(path)
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.f = open(path, 'a', encoding='utf-8', newline='')
+        self.writer = None
+        if not self.jsonl:
+            self.writer = csv.DictWriter(self.f, fieldnames=FIELDS)
+            if new_file:
+                self.writer.writeheader()
+
+    def write(self, row):
+        if self.jsonl:
+            self.f.write(json.dumps(row, ensure_ascii=False) + '\n')
+        else:
+            self.writer.writerow({
+                **row,
+                'categories': '; '.join(row['categories']),
+                'hits': json.dumps(row['hits'], ensure_ascii=False),
+            })
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+class _Worker:
+    def __init__(self, allcats_path, root, skip):
+        self.matcher = compile_categories(read_allcategories(allcats_path))
+        self.taxonomy = taxonomy_version(allcats_path)
+        self.root = root
+        self.skip = skip
+
+    def scan(self, path):
+        """Result row for one resume, or None if its hash is already done"""
+        row = {'file': os.path.relpath(path, self.root), 'sha256': None, 'taxonomy': self.taxonomy,
+               'categories': [], 'hits': {}, 'text_length': 0, 'extract_ms': 0.0, 'match_ms': 0.0, 'error': None}
+        try:
+            row['sha256'] = file_digest(path)
+            if row['sha256'] in self.skip:
+                return None
+            start = time.perf_counter()
+            text = extract_resume_text(path)
+            row['extract_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            row['text_length'] = len(text)
+            if not text or is_extraction_error(text):
+                row['error'] = text or 'No text extracted'
+                return row
+            start = time.perf_counter()
+            row['hits'] = self.matcher.category_hits(text)
+            row['match_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            row['categories'] = list(row['hits'])
+        except Exception as e:
+            row['error'] = str(e)
+        return row
+
+
+_worker = None
+
+
+def _init_worker(allcats_path, root, skip):
+    global _worker
+    _worker = _Worker(allcats_path, root, skip)
+
+
+def _scan_in_worker(path):
+    return _worker.scan(path)
+
+
+def run(root, output_path, allcats_path=DEFAULT_ALLCATEGORIES, workers=1, progress_every=500):
+    start = time.perf_counter()
+    taxonomy = taxonomy_version(allcats_path)
+    skip = completed_hashes(output_path, taxonomy)
+    if skip:
+        print(f"Resuming: {len(skip)} resumes already in {output_path}")
+
+    writer = ResultWriter(output_path)
+    counts = {'scanned': 0, 'skipped': 0, 'failed': 0}
+
+    def record(row):
+        if row is None:
+            counts['skipped'] += 1
+            return
+        writer.write(row)
+        counts['failed' if row['error'] else 'scanned'] += 1
+        done = counts['scanned'] + counts['failed']
+        if done % progress_every == 0:
+            print(f"{done} resumes scanned ({done / (time.perf_counter() - start):.1f} resumes/s)")
+
+    try:
+        if workers <= 1:
+            worker = _Worker(allcats_path, root, skip)
+            for path in iter_resumes(root):
+                record(worker.scan(path))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(allcats_path, root, skip)) as pool:
+                # A few files per worker in flight keeps the pool busy without
+                # listing the whole directory up front
+                pending = set()
+                for path in iter_resumes(root):
+                    pending.add(pool.submit(_scan_in_worker, path))
+                    if len(pending) >= 4 * workers:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            record(future.result())
+                for future in wait(pending).done:
+                    record(future.result())
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    processed = counts['scanned'] + counts['failed']
+    summary = {**counts, 'seconds': round(elapsed, 2),
+               'resumes_per_s': round(processed / elapsed, 2) if elapsed > 0 else 0.0}
+    print(f"Scanned {processed} resumes ({counts['failed']} failed, {counts['skipped']} skipped) "
+          f"in {elapsed:.1f}s: {summary['resumes_per_s']} resumes/s -> {output_path}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('directory', help='folder of resumes (scanned recursively)')
+    parser.add_argument('--output', default='scan_results.jsonl', help='CSV or JSONL file, appended to')
+    parser.add_argument('--taxonomy', default=DEFAULT_ALLCATEGORIES, help='allcategories.csv to match against')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--progress-every', type=int, default=500)
+    args = parser.parse_args()
+    run(args.directory, args.output, args.taxonomy, workers=args.workers, progress_every=max(args.progress_every, 1))
+
+
+if __name__ == '__main__':
+    main()
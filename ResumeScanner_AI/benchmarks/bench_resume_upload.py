@@ -0,0 +1,117 @@
+"""
+Resume upload latency: per-upload subprocess vs the in-process ResumeScanner.
+
+"subprocess" is what /api/upload-resume used to do for every upload: start
+`python resume_scanner.py <file>` (interpreter start, imports, taxonomy read),
+then read categories_output.csv back. "in_process" is the long-lived scanner
+the endpoint now uses: one scan() call on its worker pool. Both run against a
+temporary copy of ResumeScanner_AI so the real categories_output.csv is never
+touched, over the sample PDFs in ResumeScanner_AI/resumes plus a synthetic
+text resume.
+
+    python benchmarks/bench_resume_upload.py --runs 10 --json upload.json
+"""
+import argparse
+import csv
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCANNER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_TEXT = (
+    "Software engineer with experience in Python, JavaScript and TypeScript. Built data science "
+    "pipelines and machine learning models, deployed services on AWS and Azure cloud computing, "
+    "and worked on cybersecurity reviews and data structures and algorithms interviews.\n"
+) * 20
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def summarize(timings):
+    return {
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "mean_ms": round(statistics.mean(timings), 2),
+    }
+
+
+def upload_subprocess(scanner_dir, path):
+    subprocess.run(
+        [sys.executable, "resume_scanner.py", path],
+        capture_output=True, text=True, cwd=scanner_dir, timeout=60, check=True,
+    )
+    with open(os.path.join(scanner_dir, "categories_output.csv"), newline='', encoding='utf-8') as f:
+        return [row["Category"] for row in csv.DictReader(f)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="uploads per file and path")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_resume_upload_")
+    try:
+        scanner_dir = os.path.join(workdir, "ResumeScanner_AI")
+        shutil.copytree(SCANNER_DIR, scanner_dir, ignore=shutil.ignore_patterns("__pycache__", "benchmarks"))
+        resumes = [os.path.join(scanner_dir, "resumes", name) for name in sorted(os.listdir(os.path.join(scanner_dir, "resumes")))]
+        text_resume = os.path.join(workdir, "sample_resume.txt")
+        with open(text_resume, "w", encoding="utf-8") as f:
+            f.write(SAMPLE_TEXT)
+        resumes.append(text_resume)
+
+        sys.path.insert(0, scanner_dir)
+        from resume_scanner import ResumeScanner, write_categories_output
+
+        start = time.perf_counter()
+        scanner = ResumeScanner(os.path.join(scanner_dir, "allcategories.csv"))
+        scanner_init_ms = (time.perf_counter() - start) * 1000
+
+        results = []
+        for path in resumes:
+            before, after = [], []
+            expected = None
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                expected = upload_subprocess(scanner_dir, path)
+                before.append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                scan = scanner.scan(path)
+                # The endpoint still writes the file start-interview reads
+                write_categories_output(os.path.join(scanner_dir, "categories_output.csv"), scan["categories"])
+                after.append((time.perf_counter() - start) * 1000)
+            row = {
+                "file": os.path.basename(path),
+                "subprocess": summarize(before),
+                "in_process": summarize(after),
+                "speedup_p50": round(statistics.median(before) / max(statistics.median(after), 1e-6), 1),
+                "same_categories": expected == scan["categories"],
+            }
+            results.append(row)
+            print(json.dumps(row))
+        scanner.shutdown()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {"runs": args.runs, "scanner_init_ms": round(scanner_init_ms, 2), "results": results}
+    print(json.dumps({"scanner_init_ms": report["scanner_init_ms"]}))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if not all(r["same_categories"] for r in results):
+        print("❌ In-process scanner disagrees with the subprocess scanner")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
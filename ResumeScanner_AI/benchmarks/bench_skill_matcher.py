@@ -0,0 +1,126 @@
+"""
+Skill matching benchmark: the Aho-Corasick SkillMatcher vs the original
+per-category loop of scan_single_resume.
+
+A synthetic taxonomy of `--skills` categories is built in the style of
+allcategories.csv ("Name Word (ABBR) and Other"), from a vocabulary of
+made-up words plus the words of the real taxonomy, and resumes are random
+prose over the same vocabulary. The legacy loop re-extracts every
+category's keywords per resume and substring-scans the text once per
+keyword; the matcher is built once and scans each resume in one pass.
+Categories the legacy loop finds only through substrings ("java" inside
+"javascript") are reported as `legacy_substring_only`.
+
+    python benchmarks/bench_skill_matcher.py --skills 10000 --resumes 50
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import string
+import sys
+import time
+
+SCANNER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCANNER_DIR)
+
+from resume_scanner import (  # noqa: E402
+    DEFAULT_ALLCATEGORIES, compile_categories, extract_keywords_from_category, read_allcategories,
+)
+
+FILLER = ("experience with building and maintaining production systems for the team using modern tools "
+          "led projects delivered results improved performance across several products").split()
+
+
+def legacy_match(text, allcats):
+    """scan_single_resume's matching loop before SkillMatcher"""
+    text_lower = text.lower()
+    found = []
+    for category in allcats:
+        keywords = extract_keywords_from_category(category)
+        if sum(1 for keyword in keywords if keyword in text_lower) >= 1:
+            found.append(category)
+    return found
+
+
+def make_taxonomy(size, rng):
+    real_words = sorted({w for c in read_allcategories(DEFAULT_ALLCATEGORIES) for w in extract_keywords_from_category(c)})
+    made_up = {''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))) for _ in range(size * 2)}
+    vocab = real_words + sorted(made_up)
+    categories = []
+    for i in range(size):
+        words = [rng.choice(vocab).title() for _ in range(rng.randint(1, 3))]
+        name = ' '.join(words)
+        if i % 3 == 0:
+            name += f" ({''.join(w[0] for w in words).upper()})"
+        if i % 4 == 0:
+            name += f" and {rng.choice(vocab).title()}"
+        categories.append(name)
+    return categories, vocab
+
+
+def make_resume(vocab, rng, words=900):
+    out = []
+    for _ in range(words):
+        out.append(rng.choice(vocab) if rng.random() < 0.15 else rng.choice(FILLER))
+        if rng.random() < 0.08:
+            out[-1] += '.'
+    return ' '.join(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skills", type=int, default=10000)
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    categories, vocab = make_taxonomy(args.skills, rng)
+    resumes = [make_resume(vocab, rng) for _ in range(args.resumes)]
+
+    start = time.perf_counter()
+    matcher = compile_categories(categories)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    legacy_ms, matcher_ms = [], []
+    substring_only = missing = 0
+    for text in resumes:
+        start = time.perf_counter()
+        legacy = legacy_match(text, categories)
+        legacy_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        matched = matcher.match(text)
+        matcher_ms.append((time.perf_counter() - start) * 1000)
+
+        legacy_set, matched_set = set(legacy), set(matched)
+        substring_only += len(legacy_set - matched_set)
+        missing += len(matched_set - legacy_set)
+
+    report = {
+        "skills": len(categories),
+        "keywords": len(matcher.keywords),
+        "automaton_states": matcher.states,
+        "resumes": len(resumes),
+        "resume_chars_mean": round(statistics.mean(len(t) for t in resumes)),
+        "build_ms": round(build_ms, 1),
+        "legacy_p50_ms": round(statistics.median(legacy_ms), 2),
+        "matcher_p50_ms": round(statistics.median(matcher_ms), 2),
+        "speedup_p50": round(statistics.median(legacy_ms) / max(statistics.median(matcher_ms), 1e-6), 1),
+        "legacy_substring_only": substring_only,
+        "matcher_only": missing,
+    }
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if missing:
+        print("❌ SkillMatcher found categories the substring loop did not")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
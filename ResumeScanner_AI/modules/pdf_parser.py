@@ -5,6 +5,10 @@ try:
 except ImportError:
     HAS_PYPDF2 = False
 
+def is_extraction_error(text):
+    """True for the placeholder texts extract_text_from_pdf returns on failure"""
+    return text == "PyPDF2 not available" or text.startswith("Error extracting PDF:")
+
 def extract_text_from_pdf(pdf_path):
     """Extracts all text from a PDF file using PyPDF2."""
     if not HAS_PYPDF2:
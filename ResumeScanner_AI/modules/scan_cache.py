@@ -0,0 +1,154 @@
+"""Content-addressed cache of resume text and matched categories."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ScanCache:
+    """
+    Extracted text and keyword hits of resumes, keyed by the SHA-256 of the
+    file's bytes.
+
+    Each entry records the taxonomy version its hits were computed with.
+    A lookup under a newer taxonomy still returns the text, so only the
+    (cheap) matching is redone and text extraction is skipped. Tier one is an
+    in-process LRU bounded by entry count and by bytes of text. Tier two is an
+    optional SQLite file (text zlib-compressed) capped at `max_disk_bytes`.
+    The least recently used rows are deleted once the cap is passed.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=32 * 1024 * 1024, db_path=None, max_disk_bytes=256 * 1024 * 1024):
+        self.max_entries = max(int(max_entries), 0)
+        self.max_bytes = max(int(max_bytes), 0)
+        self.max_disk_bytes = max(int(max_disk_bytes), 0)
+        self.db_path = db_path
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'disk_evictions': 0}
+
+        self._db = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS scans '
+                '(digest TEXT PRIMARY KEY, taxonomy TEXT NOT NULL, text BLOB NOT NULL, '
+                'hits TEXT NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS scans_used ON scans (used)')
+            self._db.commit()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _size(entry):
+        return len(entry['text'].encode('utf-8'))
+
+    # ---------- memory tier ----------
+    def _remember(self, digest, entry):
+        size = self._size(entry)
+        if self.max_entries == 0 or size > self.max_bytes:
+            return
+        old = self._entries.pop(digest, None)
+        if old is not None:
+            self._bytes -= self._size(old)
+        self._entries[digest] = entry
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= self._size(evicted)
+            self.stats['evictions'] += 1
+
+    # ---------- disk tier ----------
+    def _load_from_disk(self, digest):
+        row = self._db.execute('SELECT taxonomy, text, hits FROM scans WHERE digest = ?', (digest,)).fetchone()
+        if row is None:
+            return None
+        self._db.execute('UPDATE scans SET used = ? WHERE digest = ?', (time.time(), digest))
+        self._db.commit()
+        return {'taxonomy': row[0], 'text': zlib.decompress(row[1]).decode('utf-8'), 'hits': json.loads(row[2])}
+
+    def _store_on_disk(self, digest, entry):
+        blob = zlib.compress(entry['text'].encode('utf-8'))
+        self._db.execute(
+            'INSERT OR REPLACE INTO scans (digest, taxonomy, text, hits, size, used) VALUES (?, ?, ?, ?, ?, ?)',
+            (digest, entry['taxonomy'], blob, json.dumps(entry['hits']), len(blob), time.time()),
+        )
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM scans').fetchone()[0]
+        if total > self.max_disk_bytes:
+            # Drop least recently used rows until the cap is met again
+            excess = total - self.max_disk_bytes
+            for old_digest, size in self._db.execute('SELECT digest, size FROM scans ORDER BY used').fetchall():
+                if excess <= 0:
+                    break
+                self._db.execute('DELETE FROM scans WHERE digest = ?', (old_digest,))
+                excess -= size
+                self.stats['disk_evictions'] += 1
+        self._db.commit()
+
+    # ---------- public API ----------
+    def get(self, digest):
+        """{'taxonomy', 'text', 'hits'} for a file digest, or None"""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+                self.stats['hits'] += 1
+                return entry
+            if self._db is not None:
+                entry = self._load_from_disk(digest)
+                if entry is not None:
+                    self._remember(digest, entry)
+                    self.stats['disk_hits'] += 1
+                    return entry
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, digest, text, taxonomy, hits):
+        entry = {'taxonomy': taxonomy, 'text': text, 'hits': dict(hits)}
+        with self._lock:
+            self._remember(digest, entry)
+            if self._db is not None:
+                self._store_on_disk(digest, entry)
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['disk_hits'] + self.stats['misses']
+            stats = dict(self.stats)
+            stats.update({
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hit_rate': round((self.stats['hits'] + self.stats['disk_hits']) / lookups, 4) if lookups else 0.0,
+                'disk_enabled': self._db is not None,
+            })
+            if self._db is not None:
+                count, size = self._db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM scans').fetchone()
+                stats['disk_entries'] = count
+                stats['disk_bytes'] = size
+                stats['max_disk_bytes'] = self.max_disk_bytes
+        return stats
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
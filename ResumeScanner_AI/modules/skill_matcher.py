@@ -0,0 +1,110 @@
+"""Multi-pattern skill matching with an Aho-Corasick automaton."""
+from collections import deque
+
+# Bump when matching semantics change, so cached scan results are recomputed
+MATCHER_VERSION = 1
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+class SkillMatcher:
+    """
+    Finds every keyword of a skill taxonomy in one pass over the text.
+
+    Built once from (category, keywords) pairs: all keywords go into one
+    Aho-Corasick automaton, so scanning costs O(text length + hits) however
+    many categories and keywords there are. A hit only counts on word
+    boundaries, so "java" does not match inside "javascript". Keywords are
+    matched case-insensitively and may contain spaces or punctuation
+    ("machine learning", "c++").
+    """
+
+    def __init__(self, taxonomy):
+        self.categories = []
+        # keyword -> indexes of the categories it belongs to
+        self._owners = {}
+        for category, keywords in taxonomy:
+            index = len(self.categories)
+            self.categories.append(category)
+            for keyword in keywords:
+                keyword = keyword.strip().lower()
+                if keyword:
+                    owners = self._owners.setdefault(keyword, [])
+                    if index not in owners:
+                        owners.append(index)
+        self.keywords = list(self._owners)
+        self._build()
+
+    def _build(self):
+        # State 0 is the root; goto[s] maps a character to the next state
+        goto = [{}]
+        outputs = [[]]
+        for keyword_id, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(keyword_id)
+
+        # Breadth-first failure links; each state also inherits the outputs of
+        # its failure state, so a hit never needs a walk along the fail chain
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = [tuple(out) for out in outputs]
+        self._lengths = [len(keyword) for keyword in self.keywords]
+
+    @property
+    def states(self):
+        return len(self._goto)
+
+    def find(self, text):
+        """Yield (start, end, keyword) for every whole-word keyword hit in `text`"""
+        text = text.lower()
+        goto, fail, outputs, lengths = self._goto, self._fail, self._outputs, self._lengths
+        size = len(text)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not outputs[state]:
+                continue
+            end = i + 1
+            if end < size and _is_word_char(text[end]):
+                continue
+            for keyword_id in outputs[state]:
+                start = end - lengths[keyword_id]
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                yield start, end, self.keywords[keyword_id]
+
+    def category_hits(self, text):
+        """{category: keyword hits} for the categories with at least one hit, in taxonomy order"""
+        counts = [0] * len(self.categories)
+        for _, _, keyword in self.find(text):
+            for index in self._owners[keyword]:
+                counts[index] += 1
+        return {self.categories[i]: n for i, n in enumerate(counts) if n}
+
+    def match(self, text):
+        """Categories with at least one keyword hit, in taxonomy order"""
+        return list(self.category_hits(text))
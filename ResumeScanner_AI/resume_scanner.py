@@ -1,7 +1,15 @@
 import os
 import csv
+import hashlib
 import re
-from modules.pdf_parser import extract_text_from_pdf
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from modules.pdf_parser import extract_text_from_pdf, is_extraction_error
+from modules.scan_cache import file_digest
+from modules.skill_matcher import MATCHER_VERSION, SkillMatcher
+
+DEFAULT_ALLCATEGORIES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'allcategories.csv')
 
 def extract_text_from_docx(docx_path):
     try:
@@ -52,47 +60,195 @@ def extract_keywords_from_category(category):
     
     return list(set(keywords))  # Remove duplicates
 
-def scan_single_resume(resume_path, allcats):
-    """Scan ONLY ONE specific resume file"""
+def taxonomy_version(path):
+    """Hash of the taxonomy file and the matcher version, for cache invalidation"""
+    digest = hashlib.sha256(f"matcher-{MATCHER_VERSION}\0".encode('utf-8'))
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+def compile_categories(allcats):
+    """SkillMatcher over every category's keywords, built once per taxonomy"""
+    return SkillMatcher((category, extract_keywords_from_category(category)) for category in allcats)
+
+def match_categories(text, matcher):
+    """Categories with at least one keyword in `text` (whole words only)"""
+    return matcher.match(text)
+
+def extract_resume_text(resume_path):
+    """Text of a .pdf, .docx or .txt resume ('' for other file types)"""
     ext = os.path.splitext(resume_path)[1].lower()
     if ext == '.pdf':
-        text = extract_text_from_pdf(resume_path)
-    elif ext == '.docx':
-        text = extract_text_from_docx(resume_path)
-    elif ext == '.txt':
+        return extract_text_from_pdf(resume_path)
+    if ext == '.docx':
+        return extract_text_from_docx(resume_path)
+    if ext == '.txt':
         with open(resume_path, encoding='utf-8', errors='ignore') as f:
-            text = f.read()
-    else:
-        text = ''
+            return f.read()
+    return ''
+
+def write_categories_output(output_csv, categories):
+    with open(output_csv, 'w', newline='', encoding='utf-8') as out:
+        writer = csv.writer(out)
+        writer.writerow(['Category'])
+        for category in categories:
+            writer.writerow([category])
+
+def scan_single_resume(resume_path, allcats):
+    """Scan ONLY ONE specific resume file"""
+    text = extract_resume_text(resume_path)
     
     if not text:
         print(f"ERROR: No text extracted from {resume_path}")
         return []
     
-    text_lower = text.lower()
-    found_categories = []
-    
     print(f"Scanning: {os.path.basename(resume_path)}")
     print(f"Text length: {len(text)} characters")
     
-    # For each category, check if its keywords appear in resume
-    for category in allcats:
-        keywords = extract_keywords_from_category(category)
-        
-        # Check if enough keywords from this category appear in resume
-        matching_keywords = 0
-        for keyword in keywords:
-            if keyword in text_lower:
-                matching_keywords += 1
-                #print(f"  Matched: '{keyword}' → '{category}'")
-        
-        # If at least 1 keyword matches, consider it a match
-        if matching_keywords >= 1:
-            found_categories.append(category)
+    # A category matches if at least 1 of its keywords appears in the resume
+    found_categories = match_categories(text, compile_categories(allcats))
     
     print(f"Found {len(found_categories)} categories: {found_categories}")
     return found_categories
 
+class ScannerBusy(Exception):
+    """Raised by ResumeScanner.submit() when every worker and queue slot is taken"""
+
+
+class ResumeScanner:
+    """
+    Long-lived resume scanner for use inside a server process.
+
+    The taxonomy is read from allcategories.csv and compiled into a
+    SkillMatcher once, and re-read only when the file changes. Scans run on
+    a bounded thread pool: at most `workers` run at once and `max_pending`
+    more may wait, beyond which submit() raises ScannerBusy instead of
+    queueing without limit. scan() waits at most `timeout_s` for a result.
+
+    With a ScanCache, a file whose bytes were scanned before skips text
+    extraction, and also matching unless the taxonomy changed since.
+    """
+
+    def __init__(self, allcats_path=DEFAULT_ALLCATEGORIES, workers=2, max_pending=16, timeout_s=60, cache=None):
+        self.allcats_path = allcats_path
+        self.cache = cache
+        self.taxonomy_version = None
+        self.workers = max(int(workers), 1)
+        self.timeout_s = timeout_s
+        self._lock = threading.Lock()
+        self._taxonomy_mtime = None
+        self.categories = []
+        self._matcher = None
+        self.stats = {'scanned': 0, 'failed': 0, 'rejected': 0, 'timed_out': 0, 'taxonomy_loads': 0}
+        self._load_taxonomy()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='resume-scan')
+        self._slots = threading.BoundedSemaphore(self.workers + max(int(max_pending), 0))
+
+    def _load_taxonomy(self):
+        mtime = os.path.getmtime(self.allcats_path) if os.path.exists(self.allcats_path) else None
+        with self._lock:
+            if mtime == self._taxonomy_mtime and self._matcher is not None:
+                return
+            categories = read_allcategories(self.allcats_path)
+            self.categories = categories
+            self._matcher = compile_categories(categories)
+            self.taxonomy_version = taxonomy_version(self.allcats_path)
+            self._taxonomy_mtime = mtime
+            self.stats['taxonomy_loads'] += 1
+        print(f"Loaded {len(categories)} categories from {os.path.basename(self.allcats_path)}")
+
+    def scan_text(self, text):
+        """{category: keyword hits} for already extracted resume text"""
+        self._load_taxonomy()
+        return self._matcher.category_hits(text)
+
+    def scan_file(self, resume_path):
+        """
+        Scan one resume in the calling thread; returns a result dict. `cache`
+        is 'hit' (nothing recomputed), 'text' (cached text, re-matched under a
+        new taxonomy), 'miss', or None without a cache.
+        """
+        start = time.perf_counter()
+        self._load_taxonomy()
+        digest = file_digest(resume_path) if self.cache is not None else None
+        entry = self.cache.get(digest) if digest is not None else None
+        cache_state = None if digest is None else 'miss'
+        if entry is not None and entry['taxonomy'] == self.taxonomy_version:
+            text, hits, cache_state = entry['text'], entry['hits'], 'hit'
+        else:
+            if entry is not None:
+                text, cache_state = entry['text'], 'text'
+            else:
+                text = extract_resume_text(resume_path)
+            hits = self.scan_text(text) if text else {}
+            if digest is not None and text and not is_extraction_error(text):
+                self.cache.put(digest, text, self.taxonomy_version, hits)
+
+        result = {'file': os.path.basename(resume_path), 'text_length': len(text),
+                  'categories': list(hits), 'hits': hits, 'cache': cache_state}
+        if digest is not None:
+            result['sha256'] = digest
+        if not text:
+            result['error'] = 'No text extracted'
+        result['seconds'] = round(time.perf_counter() - start, 4)
+        return result
+
+    def _run(self, resume_path):
+        try:
+            result = self.scan_file(resume_path)
+            with self._lock:
+                self.stats['scanned'] += 1
+            return result
+        except Exception:
+            with self._lock:
+                self.stats['failed'] += 1
+            raise
+
+    def submit(self, resume_path):
+        """Queue a scan; the Future resolves to scan_file()'s result"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.stats['rejected'] += 1
+            raise ScannerBusy(f"Resume scanner is busy ({self.workers} workers, queue full)")
+        try:
+            future = self._executor.submit(self._run, resume_path)
+        except Exception:
+            self._slots.release()
+            raise
+        # Also runs for scans cancelled before they started
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def scan(self, resume_path, timeout=None):
+        """
+        Scan on the pool and wait for the result. Raises TimeoutError after
+        `timeout` (default `timeout_s`) seconds; a scan that already started
+        keeps its worker until it finishes.
+        """
+        future = self.submit(resume_path)
+        try:
+            return future.result(timeout=self.timeout_s if timeout is None else timeout)
+        except FutureTimeout:
+            future.cancel()
+            with self._lock:
+                self.stats['timed_out'] += 1
+            raise TimeoutError(f"Resume scan timed out: {os.path.basename(resume_path)}")
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats['categories'] = len(self.categories)
+        stats['taxonomy_version'] = self.taxonomy_version
+        stats['workers'] = self.workers
+        if self.cache is not None:
+            stats['cache'] = self.cache.get_stats()
+        return stats
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
 def main(specific_resume=None):
     """Main function - can scan all resumes or just one specific resume"""
     base_dir = os.path.dirname(__file__)
@@ -116,27 +272,28 @@ def main(specific_resume=None):
             print(f"ERROR: Resume file not found: {specific_resume}")
             matched_categories = []
     else:
-        # Scan all resumes in folder (old behavior)
-        matched_categories = []
+        # Scan all resumes in folder (old behavior); for large folders use batch_scan.py
+        matcher = compile_categories(allcats)
+        matched = {}
         if os.path.isdir(resumes_dir):
-            for filename in os.listdir(resumes_dir):
+            for filename in sorted(os.listdir(resumes_dir)):
                 filepath = os.path.join(resumes_dir, filename)
                 if not os.path.isfile(filepath):
                     continue
                 if not filename.lower().endswith(('.pdf', '.docx', '.txt')):
                     continue
-                
-                matched = scan_single_resume(filepath, allcats)
-                for category in matched:
-                    if category not in matched_categories:
-                        matched_categories.append(category)
+
+                text = extract_resume_text(filepath)
+                if not text:
+                    print(f"ERROR: No text extracted from {filepath}")
+                    continue
+                found = match_categories(text, matcher)
+                print(f"Scanning: {filename} - {len(found)} categories")
+                matched.update(dict.fromkeys(found))
+        matched_categories = list(matched)
 
     # Write output
-    with open(output_csv, 'w', newline='', encoding='utf-8') as out:
-        writer = csv.writer(out)
-        writer.writerow(['Category'])
-        for category in matched_categories:
-            writer.writerow([category])
+    write_categories_output(output_csv, matched_categories)
 
     print(f'Wrote {len(matched_categories)} matched categories to {output_csv}')
     return matched_categories
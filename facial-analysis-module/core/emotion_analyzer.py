@@ -1,4 +1,3 @@
-from deepface import DeepFace
 import cv2
 import numpy as np
 
@@ -12,6 +11,9 @@ class EmotionAnalyzer:
             # Convert to RGB (DeepFace expects RGB)
             rgb_face = cv2.cvtColor(face_roi, cv2.COLOR_BGR2RGB)
             
+            # DeepFace pulls in TensorFlow, so import it on first analysis only
+            from deepface import DeepFace
+
             # Analyze emotions
             analysis = DeepFace.analyze(rgb_face, actions=['emotion'], enforce_detection=False)
             
@@ -0,0 +1,149 @@
+"""
+Length-bounded scoring of long answers.
+
+Sentence encoders only see their first `max_seq_length` tokens, so a long
+transcribed answer would be scored on its opening alone. AnswerChunker splits each answer on sentence
+boundaries into windows that fit the model, caps the number of windows per
+answer, and reduces the per-window similarities back to one score per answer.
+Answers that fit in one window are left exactly as they are.
+"""
+import math
+import re
+import threading
+
+import numpy as np
+
+AGGREGATES = ('max', 'mean')
+DEFAULT_WINDOW_TOKENS = 128
+# [CLS] and [SEP] take two of the model's positions
+SPECIAL_TOKENS = 2
+# Sub-word tokens per whitespace word, for encoders without a tokenizer
+TOKENS_PER_WORD = 1.3
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+|\n+')
+
+
+def split_sentences(text):
+    return [sentence.strip() for sentence in _SENTENCE_END.split(text or '') if sentence.strip()]
+
+
+class AnswerChunker:
+    """
+    Splits answers into model-sized windows and aggregates their scores.
+
+    Windows are whole sentences packed greedily up to `window_tokens`; a
+    sentence longer than that is cut on word boundaries. An answer never
+    yields more than `max_tokens // window_tokens` windows: beyond that,
+    evenly spaced windows are kept, so the start, middle and end of a very
+    long answer all still count while the encoder cost stays bounded.
+
+    `aggregate` picks how window similarities become the answer's score:
+    'max' takes the best window (an answer is as good as its best part),
+    'mean' averages them (rambling around a correct sentence costs points).
+    """
+
+    def __init__(self, window_tokens=DEFAULT_WINDOW_TOKENS, max_tokens=2048, aggregate='max', tokenizer=None):
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate '{aggregate}' (expected one of {', '.join(AGGREGATES)})")
+        self.window_tokens = max(int(window_tokens), 8)
+        self.max_windows = max(int(max_tokens) // self.window_tokens, 1)
+        self.aggregate = aggregate
+        self.tokenizer = tokenizer
+        # Request threads and BatchScorer workers share one chunker
+        self._lock = threading.Lock()
+        self.stats = {'answers': 0, 'chunked': 0, 'windows': 0, 'capped': 0}
+
+    @classmethod
+    def for_model(cls, model, window_tokens=0, max_tokens=2048, aggregate='max'):
+        """Chunker sized for `model` (a SentenceTransformer-like encoder)"""
+        limit = getattr(model, 'max_seq_length', None)
+        if limit:
+            limit -= SPECIAL_TOKENS
+            window_tokens = min(window_tokens, limit) if window_tokens > 0 else limit
+        return cls(window_tokens or DEFAULT_WINDOW_TOKENS, max_tokens, aggregate,
+                   tokenizer=getattr(model, 'tokenizer', None))
+
+    def count_tokens(self, sentences):
+        """Sub-word token count of each sentence (estimated without a tokenizer)"""
+        if self.tokenizer is not None:
+            try:
+                encoded = self.tokenizer(sentences, add_special_tokens=False)['input_ids']
+                return [len(ids) for ids in encoded]
+            except Exception:
+                self.tokenizer = None
+        return [math.ceil(len(sentence.split()) * TOKENS_PER_WORD) for sentence in sentences]
+
+    def split(self, text):
+        """Windows of one answer; a single window is the answer text unchanged"""
+        text = '' if text is None else str(text)
+        words = len(text.split())
+        # Cheap pre-check: clearly short answers skip sentence splitting
+        if words * TOKENS_PER_WORD * 2 <= self.window_tokens:
+            return [text]
+        sentences = split_sentences(text)
+        lengths = self.count_tokens(sentences)
+        if sum(lengths) <= self.window_tokens:
+            return [text]
+
+        windows, current, current_len = [], [], 0
+        for sentence, length in zip(sentences, lengths):
+            if length > self.window_tokens:
+                if current:
+                    windows.append(' '.join(current))
+                    current, current_len = [], 0
+                sentence_words = sentence.split()
+                # Same tokens-per-word ratio as the sentence as a whole
+                step = max(int(len(sentence_words) * self.window_tokens / length), 1)
+                windows.extend(' '.join(sentence_words[i:i + step]) for i in range(0, len(sentence_words), step))
+                continue
+            if current and current_len + length > self.window_tokens:
+                windows.append(' '.join(current))
+                current, current_len = [], 0
+            current.append(sentence)
+            current_len += length
+        if current:
+            windows.append(' '.join(current))
+
+        if len(windows) > self.max_windows:
+            with self._lock:
+                self.stats['capped'] += 1
+            keep = np.linspace(0, len(windows) - 1, self.max_windows).round().astype(int)
+            windows = [windows[i] for i in keep]
+        return windows
+
+    def windows(self, texts):
+        """
+        Windows of every answer, flattened for one encode call, and offsets:
+        the windows of answer i are windows[offsets[i]:offsets[i + 1]].
+        """
+        windows = []
+        offsets = [0]
+        chunked = 0
+        for text in texts:
+            parts = self.split(text)
+            windows.extend(parts)
+            offsets.append(len(windows))
+            if len(parts) > 1:
+                chunked += 1
+        with self._lock:
+            self.stats['chunked'] += chunked
+            self.stats['answers'] += len(offsets) - 1
+            self.stats['windows'] += len(windows)
+        return windows, np.asarray(offsets, dtype=np.int64)
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+    def combine(self, window_scores):
+        """Score of one answer from the scores of its windows"""
+        return float(np.max(window_scores) if self.aggregate == 'max' else np.mean(window_scores))
+
+    def reduce(self, window_scores, offsets):
+        """One score per answer from per-window scores (every answer has a window)"""
+        window_scores = np.asarray(window_scores, dtype=np.float32)
+        if len(offsets) < 2:
+            return np.zeros(0, dtype=np.float32)
+        if self.aggregate == 'max':
+            return np.maximum.reduceat(window_scores, offsets[:-1])
+        return np.add.reduceat(window_scores, offsets[:-1]) / np.diff(offsets)
@@ -1,31 +1,51 @@
-from flask import Flask, request, jsonify, make_response
+from flask import Flask, request, jsonify, make_response, Response, stream_with_context
 from flask_cors import CORS
 import os
-import subprocess
 import sys
 import csv
 from datetime import datetime
 import base64
-import cv2
 import numpy as np
-from interview_system import interview_system
+from interview_system import interview_system, CORRECT_THRESHOLD, BANK_RELOAD_S
+from lazy_loader import ComponentRegistry
+from live_scoring import LiveScorer
+from async_scoring import AsyncScorer
+from question_search import MAX_PER_PAGE
+from skill_store import SkillStore
 import io
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics.charts.barcharts import VerticalBarChart
-from reportlab.graphics.charts.piecharts import Pie
-from reportlab.graphics.charts.lineplots import LinePlot
 from collections import Counter
-import smtplib
-from email.mime.base import MIMEBase
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email import encoders
 import re
+import json
+import threading
+import time
+
+# cv2, reportlab, smtplib and the facial module are imported on first use (or by
+# the warm-up thread) so that the API can answer /api/health straight away.
+# INTERVIEW_STARTUP_MODE: 'background' (default) warms up in a thread,
+# 'lazy' loads only on demand, 'eager' loads everything before serving.
+STARTUP_MODE = os.environ.get('INTERVIEW_STARTUP_MODE', 'background').lower()
+# Threads scoring submitted answers in the background (0 scores them inline,
+# in the request); results and reports wait up to RESULTS_WAIT_S for them
+ASYNC_SCORING_WORKERS = int(os.environ.get('INTERVIEW_ASYNC_SCORING_WORKERS', '0'))
+RESULTS_WAIT_S = float(os.environ.get('INTERVIEW_RESULTS_WAIT_S', '10'))
+# In-process resume scanning: concurrent scans, extra uploads allowed to wait,
+# and the longest an upload waits for its scan
+RESUME_SCAN_WORKERS = int(os.environ.get('INTERVIEW_RESUME_SCAN_WORKERS', '2'))
+RESUME_SCAN_QUEUE = int(os.environ.get('INTERVIEW_RESUME_SCAN_QUEUE', '16'))
+RESUME_SCAN_TIMEOUT_S = float(os.environ.get('INTERVIEW_RESUME_SCAN_TIMEOUT_S', '60'))
+# Re-uploads of the same file reuse its extracted text and skills (0 entries
+# disables the memory tier, an empty DB path disables the disk tier)
+RESUME_CACHE_ENTRIES = int(os.environ.get('INTERVIEW_RESUME_CACHE_ENTRIES', '256'))
+RESUME_CACHE_MB = float(os.environ.get('INTERVIEW_RESUME_CACHE_MB', '32'))
+RESUME_CACHE_DB = os.environ.get('INTERVIEW_RESUME_CACHE_DB', '')
+RESUME_CACHE_DISK_MB = float(os.environ.get('INTERVIEW_RESUME_CACHE_DISK_MB', '256'))
+# Skills extracted per upload, looked up by upload_id at start-interview; an
+# empty DB path keeps them in memory only. Set INTERVIEW_WRITE_SKILLS_CSV=1 to
+# also write the shared categories_output.csv for clients that send no upload_id
+SKILLS_TTL_S = float(os.environ.get('INTERVIEW_SKILLS_TTL_S', str(24 * 3600)))
+SKILLS_MAX_ENTRIES = int(os.environ.get('INTERVIEW_SKILLS_MAX_ENTRIES', '10000'))
+SKILLS_DB = os.environ.get('INTERVIEW_SKILLS_DB', '')
+WRITE_SKILLS_CSV = os.environ.get('INTERVIEW_WRITE_SKILLS_CSV', '0') == '1'
 
 app = Flask(__name__)
 CORS(app)
@@ -52,10 +72,9 @@ print(f"Exists: {os.path.exists(CATEGORIES_OUTPUT_PATH)}")
 print("=====================")
 
 # ==================== FACIAL ANALYSIS MODULE INTEGRATION ====================
-FACIAL_ANALYSIS_AVAILABLE = False
-facial_analyzer = None
+components = ComponentRegistry()
 
-try:
+def _load_facial_analyzer():
     # Calculate path to facial-analysis-module
     possible_paths = [
         os.path.join(PARENT_DIR, "facial-analysis-module"),
@@ -63,41 +82,103 @@ try:
         os.path.join(PARENT_DIR, "FacialAnalysisModule"),
     ]
     
-    FACIAL_MODULE_PATH = None
+    facial_module_path = None
     for path in possible_paths:
         if os.path.exists(path):
-            FACIAL_MODULE_PATH = path
+            facial_module_path = path
             break
     
-    if not FACIAL_MODULE_PATH:
+    if not facial_module_path:
         raise ImportError("Facial analysis module folder not found")
     
-    print(f"🔍 Found facial module at: {FACIAL_MODULE_PATH}")
-    sys.path.append(FACIAL_MODULE_PATH)
-    
-    # Try to import dynamically
-    try:
-        import importlib
-        fac_mod = importlib.import_module('facial_api_integration')
-        FacialAnalysisAPI = getattr(fac_mod, 'FacialAnalysisAPI')
-        facial_analyzer = FacialAnalysisAPI()
-        FACIAL_ANALYSIS_AVAILABLE = True
-        print("✅ Facial Analysis Module loaded successfully!")
-    except Exception as e:
-        print(f"❌ Could not import FacialAnalysisAPI: {e}")
-        FACIAL_ANALYSIS_AVAILABLE = False
+    print(f"🔍 Found facial module at: {facial_module_path}")
+    if facial_module_path not in sys.path:
+        sys.path.append(facial_module_path)
     
-except Exception as e:
-    FACIAL_ANALYSIS_AVAILABLE = False
-    print(f"❌ Error loading Facial Analysis Module: {e}")
+    import importlib
+    import importlib.util
+    # Same availability rule as before DeepFace became a deferred import
+    if importlib.util.find_spec('deepface') is None:
+        raise ImportError("deepface is not installed")
+    fac_mod = importlib.import_module('facial_api_integration')
+    FacialAnalysisAPI = getattr(fac_mod, 'FacialAnalysisAPI')
+    analyzer = FacialAnalysisAPI()
+    print("✅ Facial Analysis Module loaded successfully!")
+    return analyzer
+
+def _load_opencv():
+    import cv2
+    return cv2
+
+def _load_face_cascade():
+    cv2 = components['opencv'].get()
+    return cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+
+def _load_reportlab():
+    import reportlab.platypus
+    import reportlab.graphics.charts.barcharts
+    import reportlab.graphics.charts.piecharts
+    import reportlab.graphics.charts.lineplots
+    return reportlab
+
+def _load_resume_scanner():
+    scanner_dir = os.path.dirname(RESUME_SCANNER_PATH)
+    if scanner_dir not in sys.path:
+        sys.path.append(scanner_dir)
+    from resume_scanner import ResumeScanner
+    from modules.scan_cache import ScanCache
+    cache = ScanCache(
+        max_entries=RESUME_CACHE_ENTRIES,
+        max_bytes=int(RESUME_CACHE_MB * 1024 * 1024),
+        db_path=RESUME_CACHE_DB or None,
+        max_disk_bytes=int(RESUME_CACHE_DISK_MB * 1024 * 1024),
+    )
+    return ResumeScanner(
+        workers=RESUME_SCAN_WORKERS,
+        max_pending=RESUME_SCAN_QUEUE,
+        timeout_s=RESUME_SCAN_TIMEOUT_S,
+        cache=cache,
+    )
+
+components.add('opencv', _load_opencv, required=False)
+components.add('face_cascade', _load_face_cascade, required=False)
+components.add('reportlab', _load_reportlab, required=False)
+components.add('facial_analysis', _load_facial_analyzer, required=False)
+components.add('resume_scanner', _load_resume_scanner, required=False)
+
+def get_facial_analyzer():
+    """FacialAnalysisAPI instance, or None when the module is unavailable"""
+    return components['facial_analysis'].get_or_none()
 
 # ==================== GLOBAL SESSIONS ====================
 interview_sessions = {}
 facial_sessions = {}
+skill_store = SkillStore(ttl_s=SKILLS_TTL_S, max_entries=SKILLS_MAX_ENTRIES, db_path=SKILLS_DB or None)
+_sessions_lock = threading.Lock()
+
+# Provisional scores for answers that are still being dictated
+live_scorer = LiveScorer(
+    lambda text, ref_answers, question_id, bank=None: interview_system.score_answer(
+        text, ref_answers, question_id=question_id, bank=bank, raise_errors=True
+    ),
+    min_tokens=int(os.environ.get('INTERVIEW_LIVE_MIN_TOKENS', '8')),
+    min_interval_ms=float(os.environ.get('INTERVIEW_LIVE_MIN_INTERVAL_MS', '750')),
+)
+
+# Deferred scoring of submitted answers, when enabled
+async_scorer = AsyncScorer(
+    lambda text, ref_answers, question_id, bank=None: interview_system.score_answer(
+        text, ref_answers, question_id=question_id, bank=bank
+    ),
+    workers=ASYNC_SCORING_WORKERS,
+) if ASYNC_SCORING_WORKERS > 0 else None
+# Guards session answer/score lists, which scoring threads fill in
+_scores_lock = threading.Lock()
 
 # =============== FACIAL HELPERS ===============
 def _decode_base64_image(data_url: str):
     try:
+        cv2 = components['opencv'].get()
         if data_url.startswith('data:image'):
             header, b64data = data_url.split(',', 1)
         else:
@@ -110,22 +191,19 @@ def _decode_base64_image(data_url: str):
         print(f"❌ Failed to decode base64 image: {e}")
         return None
 
-try:
-    FACE_CASCADE = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-except Exception as e:
-    print(f"⚠️ Failed to load Haar cascade: {e}")
-    FACE_CASCADE = None
-
 def _detect_faces(frame):
-    if frame is None or FACE_CASCADE is None:
+    face_cascade = components['face_cascade'].get_or_none()
+    if frame is None or face_cascade is None:
         return []
+    cv2 = components['opencv'].get()
     gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    faces = FACE_CASCADE.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30,30))
+    faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30,30))
     return faces
 
 def _estimate_attention(frame):
     # Simple heuristic: use brightness variance as proxy
     try:
+        cv2 = components['opencv'].get()
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         score = float(np.clip(np.var(gray) / 2550.0, 0.3, 0.95))
         return score
@@ -153,6 +231,16 @@ def home():
 def health_check():
     return jsonify({"status": "Backend is running!"})
 
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: 200 once every required component has loaded, 503 before"""
+    ready = interview_system.components.is_ready and components.is_ready
+    return jsonify({
+        "ready": ready,
+        "startup_mode": STARTUP_MODE,
+        "components": {**interview_system.components.status(), **components.status()}
+    }), (200 if ready else 503)
+
 # ==================== RESUME UPLOAD ====================
 @app.route('/api/upload-resume', methods=['POST'])
 def upload_resume():
@@ -179,46 +267,56 @@ def upload_resume():
         if not os.path.exists(RESUMES_FOLDER):
             os.makedirs(RESUMES_FOLDER)
         
-        # Save the uploaded file
-        file_location = os.path.join(RESUMES_FOLDER, file.filename)
+        # Save the uploaded file under its upload id, so parallel uploads of
+        # files with the same name never overwrite each other
+        upload_id = SkillStore.new_id()
+        file_location = os.path.join(RESUMES_FOLDER, f"{upload_id}_{os.path.basename(file.filename)}")
         file.save(file_location)
         print(f"File saved to: {file_location}")
         
-        # Run the resume scanner
-        scanner_dir = os.path.dirname(RESUME_SCANNER_PATH)
-        print(f"Running scanner from: {scanner_dir}")
-        
-        result = subprocess.run(
-            [sys.executable, "resume_scanner.py", file_location],
-            capture_output=True,
-            text=True,
-            cwd=scanner_dir,
-            timeout=60
-        )
-        
-        print(f"Script return code: {result.returncode}")
-        if result.stdout:
-            print(f"Script output: {result.stdout}")
-        if result.stderr:
-            print(f"Script errors: {result.stderr}")
-        
-        if result.returncode != 0:
-            return jsonify({"error": f"Resume processing failed: {result.stderr}"}), 500
-        
-        # Read the extracted skills
-        skills_data = read_extracted_skills()
+        # Scan in-process on the scanner's worker pool
+        scanner = components['resume_scanner'].get()
+        from resume_scanner import ScannerBusy, write_categories_output
+        try:
+            scan = scanner.scan(file_location)
+        except ScannerBusy as e:
+            return jsonify({"error": str(e)}), 503, {"Retry-After": "5"}
+        except TimeoutError as e:
+            return jsonify({"error": f"Resume processing failed: {e}"}), 504
+        print(f"✓ Scanned {scan['file']} in {scan['seconds'] * 1000:.0f} ms "
+              f"(cache: {scan['cache']}): {len(scan['categories'])} categories")
+        
+        scan['filename'] = file.filename
+        skill_store.put(scan, upload_id=upload_id)
+        skills_data = _skills_data(scan)
+        if WRITE_SKILLS_CSV:
+            write_categories_output(CATEGORIES_OUTPUT_PATH, scan['categories'])
+            skills_data["file_path"] = CATEGORIES_OUTPUT_PATH
         print(f"Skills found: {skills_data}")
         
         return jsonify({
             "message": "Resume uploaded and processed successfully",
+            "upload_id": upload_id,
             "filename": file.filename,
-            "extracted_skills": skills_data
+            "extracted_skills": skills_data,
+            "scan_ms": round(scan['seconds'] * 1000, 1),
         })
         
     except Exception as e:
         print(f"Error: {str(e)}")
         return jsonify({"error": f"Upload failed: {str(e)}"}), 500
 
+def _skills_data(scan):
+    """extracted_skills payload for a stored scan result"""
+    skills_data = {
+        "skills_found": [{"Category": category} for category in scan['categories']],
+        "total_skills": len(scan['categories']),
+        "keyword_hits": scan.get('hits', {}),
+    }
+    if 'error' in scan:
+        skills_data["error"] = scan['error']
+    return skills_data
+
 def read_extracted_skills():
     """Read extracted skills from categories_output.csv"""
     try:
@@ -250,21 +348,48 @@ def read_extracted_skills():
 # ==================== INTERVIEW ENDPOINTS ====================
 @app.route('/api/start-interview', methods=['POST'])
 def start_interview():
-    """Start a new interview session with personalized questions"""
+    """Start a new interview session with personalized questions.
+    Optional JSON: { "upload_id": str } picks questions from the skills of
+    that resume upload; "resume_text" selects questions by semantic match
+    against the resume instead of by extracted category; "difficulty" and
+    "num_questions" narrow the pick; "bank" names the question bank to use."""
     try:
-        questions = interview_system.generate_questions(questions_per_category=3)
+        data = request.get_json(silent=True) or {}
+        bank = data.get('bank')
+        try:
+            interview_system.banks.get(bank)
+        except KeyError:
+            return jsonify({"error": f"Unknown question bank: {bank}"}), 404
+        upload_id = data.get('upload_id')
+        skills = None
+        if upload_id:
+            skills = skill_store.get(upload_id)
+            if skills is None:
+                return jsonify({"error": f"Unknown or expired upload_id: {upload_id}"}), 404
+        questions = interview_system.generate_questions(
+            questions_per_category=3,
+            difficulty=data.get('difficulty'),
+            resume_text=data.get('resume_text'),
+            num_questions=data.get('num_questions'),
+            bank=bank,
+            categories=skills['categories'] if skills is not None else None,
+        )
         
         if not questions:
             return jsonify({"error": "No questions available for the extracted skills"}), 400
         
-        session_id = len(interview_sessions) + 1
-        interview_sessions[session_id] = {
-            'questions': questions,
-            'current_question': 0,
-            'answers': [],
-            'scores': [],
-            'total_score': 0
-        }
+        # Interviews now start concurrently, so ids are allocated under a lock
+        with _sessions_lock:
+            session_id = len(interview_sessions) + 1
+            interview_sessions[session_id] = {
+                'questions': questions,
+                'bank': bank,
+                'upload_id': upload_id,
+                'current_question': 0,
+                'answers': [],
+                'scores': [],
+                'total_score': 0
+            }
         
         return jsonify({
             "session_id": session_id,
@@ -297,6 +422,98 @@ def get_question(session_id, question_index):
     except Exception as e:
         return jsonify({"error": f"Failed to get question: {str(e)}"}), 500
 
+def _reference_answers(question):
+    return [
+        question['Answer1'],
+        question['Answer2'], 
+        question['Answer3'],
+        question['Answer4']
+    ]
+
+@app.route('/api/score-partial', methods=['POST'])
+def score_partial():
+    """Provisional score for a transcript that is still streaming in.
+    Expected JSON: { "session_id", "question_index", "delta": str } to append,
+    or { ..., "text": str } with the full transcript so far.
+    """
+    try:
+        data = request.get_json(force=True)
+        session_id = data.get('session_id')
+        question_index = data.get('question_index')
+        
+        if session_id not in interview_sessions:
+            return jsonify({"error": "Session not found"}), 404
+        
+        questions = interview_sessions[session_id]['questions']
+        if not isinstance(question_index, int) or isinstance(question_index, bool):
+            return jsonify({"error": "question_index must be an integer"}), 400
+        if question_index < 0 or question_index >= len(questions):
+            return jsonify({"error": "Question index out of range"}), 400
+        if any(data.get(key) is not None and not isinstance(data.get(key), str) for key in ('delta', 'text')):
+            return jsonify({"error": "delta and text must be strings"}), 400
+        
+        current_question = questions[question_index]
+        result = live_scorer.update(
+            session_id,
+            question_index,
+            _reference_answers(current_question),
+            question_id=current_question.get('Question Number'),
+            delta=data.get('delta'),
+            text=data.get('text'),
+            bank=interview_sessions[session_id].get('bank'),
+        )
+        return jsonify(result)
+        
+    except Exception as e:
+        return jsonify({"error": f"Failed to score partial answer: {str(e)}"}), 500
+
+def _add_answer(session, question, user_answer):
+    """Append an answer awaiting its score; returns its index"""
+    with _scores_lock:
+        session['answers'].append({
+            'question': question['Question'],
+            'user_answer': user_answer,
+            'score': None,
+            'is_correct': None,
+            'status': 'pending'
+        })
+        session['scores'].append(None)
+        return len(session['answers']) - 1
+
+def _record_score(session, answer_index, similarity_score, is_correct):
+    with _scores_lock:
+        session['answers'][answer_index].update(
+            score=similarity_score, is_correct=is_correct, status='scored'
+        )
+        session['scores'][answer_index] = similarity_score
+        session['total_score'] = sum(score for score in session['scores'] if score is not None)
+        session.get('pending', {}).pop(answer_index, None)
+
+def _finish_async_score(session, answer_index, result, error):
+    # Runs on the scoring thread before the future resolves, so a results
+    # request that waited on the future always finds the score recorded
+    if error is not None:
+        print(f"❌ Background scoring failed: {error}")
+        result = (0.0, False)
+    similarity_score, is_correct = result
+    _record_score(session, answer_index, similarity_score, is_correct)
+
+def _scoring_in_progress(session):
+    """Wait up to RESULTS_WAIT_S for the session's pending scores; a 202 response if some are still missing"""
+    with _scores_lock:
+        pending = list(session.get('pending', {}).values())
+    AsyncScorer.wait(pending, RESULTS_WAIT_S)
+    with _scores_lock:
+        still_pending = sum(1 for score in session['scores'] if score is None)
+    if not still_pending:
+        return None
+    response = jsonify({
+        "status": "scoring",
+        "pending_answers": still_pending,
+        "message": "Answers are still being scored, retry shortly",
+    })
+    return response, 202, {"Retry-After": "1"}
+
 @app.route('/api/submit-answer', methods=['POST'])
 def submit_answer():
     """Submit answer for current question and get score"""
@@ -319,40 +536,178 @@ def submit_answer():
             return jsonify({"error": "Question index out of range"}), 400
         
         current_question = questions[question_index]
-        ref_answers = [
-            current_question['Answer1'],
-            current_question['Answer2'], 
-            current_question['Answer3'],
-            current_question['Answer4']
-        ]
+        ref_answers = _reference_answers(current_question)
         
-        # Get both score and correctness
-        similarity_score, is_correct = interview_system.score_answer(user_answer, ref_answers)
-        
-        # Store answer and score with correctness
-        session['answers'].append({
-            'question': current_question['Question'],
-            'user_answer': user_answer,
-            'score': similarity_score,
-            'is_correct': is_correct
-        })
-        session['scores'].append(similarity_score)
-        session['total_score'] = sum(session['scores'])
+        # Reuse the live provisional score when the text has not changed since
+        cached = live_scorer.take(session_id, question_index, user_answer)
         
         # Check if interview is complete
         is_complete = (question_index + 1) >= len(questions)
+        next_question_index = question_index + 1 if not is_complete else None
+        
+        if cached is None and async_scorer is not None:
+            # Score in the background; results wait for it
+            answer_index = _add_answer(session, current_question, user_answer)
+            future = async_scorer.submit(
+                user_answer, ref_answers, question_id=current_question.get('Question Number'),
+                bank=session.get('bank'),
+                on_done=lambda result, error: _finish_async_score(session, answer_index, result, error),
+            )
+            with _scores_lock:
+                if not future.done():
+                    session.setdefault('pending', {})[answer_index] = future
+            return jsonify({
+                "status": "pending",
+                "score": None,
+                "is_correct": None,
+                "current_score": session['total_score'],
+                "is_complete": is_complete,
+                "next_question_index": next_question_index
+            })
+        
+        if cached is not None:
+            similarity_score, is_correct = cached
+        else:
+            # Get both score and correctness
+            similarity_score, is_correct = interview_system.score_answer(
+                user_answer, ref_answers, question_id=current_question.get('Question Number'),
+                bank=session.get('bank'),
+            )
+        answer_index = _add_answer(session, current_question, user_answer)
+        _record_score(session, answer_index, similarity_score, is_correct)
         
         return jsonify({
+            "status": "scored",
             "score": similarity_score,
             "is_correct": is_correct,
             "current_score": session['total_score'],
             "is_complete": is_complete,
-            "next_question_index": question_index + 1 if not is_complete else None
+            "next_question_index": next_question_index
         })
         
     except Exception as e:
         return jsonify({"error": f"Failed to submit answer: {str(e)}"}), 500
 
+def _score_batch_item(item, position):
+    """(question_id, answer) of one score-batch item, or a ValueError saying what is wrong with it"""
+    if not isinstance(item, dict):
+        return ValueError(f"Invalid item {position}: expected an object, got {type(item).__name__}")
+    return item.get('question_id'), item.get('answer', '')
+
+def _iter_score_batch_items(data):
+    """Yield (question_id, answer) pairs from a JSON list or an NDJSON request body.
+
+    A malformed item yields a ValueError in its place, so it gets its own
+    error row and does not stop the rest of the batch.
+    """
+    if data is not None:
+        for position, item in enumerate(data.get('answers', []), 1):
+            yield _score_batch_item(item, position)
+        return
+    for position, line in enumerate(request.stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid item {position}: {e}")
+            continue
+        yield _score_batch_item(item, position)
+
+@app.route('/api/score-batch', methods=['POST'])
+def score_batch():
+    """Score many answers at once and stream the results back as NDJSON.
+
+    Accepts either JSON { "answers": [{"question_id", "answer"}], "chunk_size", "threshold", "bank" }
+    or an application/x-ndjson body with one {"question_id", "answer"} object per line
+    (chunk_size/threshold/bank then come from the query string).
+    """
+    try:
+        is_ndjson = request.mimetype in ('application/x-ndjson', 'application/jsonl')
+        data = None if is_ndjson else request.get_json(force=True)
+        if not is_ndjson and not (isinstance(data, dict) and isinstance(data.get('answers', []), list)):
+            raise ValueError('expected an object with an "answers" list')
+        options = request.args if is_ndjson else data
+        chunk_size = int(options.get('chunk_size', 256))
+        threshold = float(options.get('threshold', CORRECT_THRESHOLD))
+        bank = options.get('bank')
+        if chunk_size <= 0:
+            return jsonify({"error": "chunk_size must be positive"}), 400
+        interview_system.banks.get(bank)
+    except KeyError:
+        return jsonify({"error": f"Unknown question bank: {bank}"}), 404
+    except Exception as e:
+        return jsonify({"error": f"Invalid score-batch request: {str(e)}"}), 400
+
+    def generate():
+        try:
+            results = interview_system.score_answers_batch(
+                _iter_score_batch_items(data), chunk_size=chunk_size, threshold=threshold, bank=bank
+            )
+            for result in results:
+                yield json.dumps(result) + "\n"
+        except Exception as e:
+            print(f"❌ score-batch error: {e}")
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/question-banks', methods=['GET'])
+def question_banks():
+    """Available question banks and which of them are currently loaded"""
+    interview_system.banks.discover()
+    return jsonify(interview_system.banks.status())
+
+@app.route('/api/questions/search', methods=['GET'])
+def search_questions():
+    """Keyword search over a question bank, for curating it.
+
+    Query string: q (words, all must match), category, difficulty (exact),
+    page (from 1), per_page (max 100) and bank. Results are ranked by
+    relevance unless `ranked` is false (no q, or too many matches to rank).
+    """
+    bank = request.args.get('bank')
+    try:
+        page = int(request.args.get('page', 1))
+        per_page = int(request.args.get('per_page', 20))
+        if page < 1 or not 1 <= per_page <= MAX_PER_PAGE:
+            raise ValueError(f"page must be >= 1 and per_page between 1 and {MAX_PER_PAGE}")
+        search_index = interview_system.banks.get(bank).question_search
+    except KeyError:
+        return jsonify({"error": f"Unknown question bank: {bank}"}), 404
+    except ValueError as e:
+        return jsonify({"error": f"Invalid search request: {str(e)}"}), 400
+
+    try:
+        start = time.perf_counter()
+        results, total, ranked = search_index.search(
+            request.args.get('q'),
+            category=request.args.get('category'),
+            difficulty=request.args.get('difficulty'),
+            page=page,
+            per_page=per_page,
+        )
+        return jsonify({
+            "results": results,
+            "total": total,
+            "ranked": ranked,
+            "page": page,
+            "per_page": per_page,
+            "took_ms": round((time.perf_counter() - start) * 1000, 2),
+        })
+    except Exception as e:
+        return jsonify({"error": f"Search failed: {str(e)}"}), 500
+
+@app.route('/api/scoring-stats', methods=['GET'])
+def scoring_stats():
+    """Counters for sizing the scoring caches and batcher"""
+    stats = interview_system.get_stats()
+    stats["live_scoring"] = live_scorer.get_stats()
+    if async_scorer is not None:
+        stats["async_scoring"] = async_scorer.get_stats()
+    return jsonify(stats)
+
 @app.route('/api/interview-results/<int:session_id>', methods=['GET'])
 def get_interview_results(session_id):
     """Get final interview results - WITH CHART DATA"""
@@ -361,6 +716,9 @@ def get_interview_results(session_id):
             return jsonify({"error": f"Session {session_id} not found"}), 404
         
         session = interview_sessions[session_id]
+        in_progress = _scoring_in_progress(session)
+        if in_progress is not None:
+            return in_progress
         total_questions = len(session['questions'])
         answers_count = len(session.get('answers', []))
         
@@ -463,6 +821,9 @@ def download_pdf_report(session_id):
             return jsonify({"error": "Session not found"}), 404
         
         session = interview_sessions[session_id]
+        in_progress = _scoring_in_progress(session)
+        if in_progress is not None:
+            return in_progress
         answers_count = len(session.get('answers', []))
         
         if answers_count == 0:
@@ -475,7 +836,18 @@ def download_pdf_report(session_id):
         average_similarity = total_similarity / answers_count
         
         # Get skills from resume
-        skills_data = read_extracted_skills()
+        skills = skill_store.get(session.get('upload_id'))
+        skills_data = _skills_data(skills) if skills is not None else read_extracted_skills()
+
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        from reportlab.lib import colors
+        from reportlab.lib.units import inch
+        from reportlab.graphics.shapes import Drawing
+        from reportlab.graphics.charts.barcharts import VerticalBarChart
+        from reportlab.graphics.charts.piecharts import Pie
+        from reportlab.graphics.charts.lineplots import LinePlot
         
         # Create PDF buffer
         buffer = io.BytesIO()
@@ -722,14 +1094,15 @@ def start_facial_analysis():
             'is_active': True,
             'alerts': []
         }
-        if not FACIAL_ANALYSIS_AVAILABLE:
+        facial_analyzer = get_facial_analyzer()
+        if facial_analyzer is None:
             return jsonify({
                 "session_id": session_id,
                 "message": "Facial analysis module not available",
                 "status": "simulation"
             })
         
-        if FACIAL_ANALYSIS_AVAILABLE and facial_analyzer:
+        if facial_analyzer:
             success = facial_analyzer.start_analysis(session_id)
             if not success:
                 return jsonify({"error": "Failed to start facial analysis"}), 500
@@ -819,8 +1192,9 @@ def stop_facial_analysis(session_id):
         if not fac:
             return jsonify({ 'error': 'Session not found' }), 404
         fac['is_active'] = False
-        # If module is available, stop it
-        if FACIAL_ANALYSIS_AVAILABLE and facial_analyzer:
+        # If module is available, stop it (without loading it just to stop it)
+        facial_analyzer = get_facial_analyzer() if components['facial_analysis'].is_ready else None
+        if facial_analyzer:
             try:
                 facial_analyzer.stop_analysis()
             except Exception as e:
@@ -836,6 +1210,20 @@ def stop_facial_analysis(session_id):
     except Exception as e:
         return jsonify({ 'error': str(e) }), 500
 
+# ==================== STARTUP ====================
+if STARTUP_MODE == 'eager':
+    interview_system.components.warm_up(background=False)
+    components.warm_up(background=False)
+elif STARTUP_MODE != 'lazy':
+    # Scoring components first: they gate /api/ready
+    def _warm_up_all():
+        interview_system.components.load_all()
+        components.load_all()
+    threading.Thread(target=_warm_up_all, name='warm-up', daemon=True).start()
+
+if BANK_RELOAD_S > 0:
+    interview_system.start_bank_watcher(BANK_RELOAD_S)
+
 if __name__ == '__main__':
     app.run(debug=True, port=8000, host='0.0.0.0')
 
@@ -859,7 +1247,14 @@ def send_results_email():
         # Generate PDF bytes by calling the same logic used in the HTTP handler
         # Reuse code from download_pdf_report with minimal duplication
         # We'll call the function indirectly by building the PDF in-memory
+        import smtplib
+        from email.mime.base import MIMEBase
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+        from email import encoders
         from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
         buffer = io.BytesIO()
         # Create a short summary PDF to attach using existing function
         # For simplicity, call the endpoint logic by constructing a mini report
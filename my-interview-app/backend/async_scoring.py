@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+class AsyncScorer:
+    """
+    Runs scoring calls on a small background thread pool.
+
+    `submit()` returns a Future straight away, so request threads never wait
+    on the encoder. Queue depth (submitted but not started), answers in
+    flight, and the lag from submit to result are tracked for
+    /api/scoring-stats.
+    """
+
+    def __init__(self, score_fn, workers=2, lag_samples=1000):
+        self.score_fn = score_fn
+        self.workers = max(int(workers), 1)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='async-scoring')
+        self._lock = threading.Lock()
+        self._queued = {}
+        self._running = 0
+        self._lags = deque(maxlen=lag_samples)
+        self._next_id = 0
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0}
+
+    def submit(self, *args, on_done=None, **kwargs):
+        """
+        Queue `score_fn(*args, **kwargs)`; the Future resolves to its result.
+
+        `on_done(result, error)` runs on the worker thread before the Future
+        resolves, so whoever waits on the Future also sees its side effects.
+        """
+        with self._lock:
+            task_id = self._next_id
+            self._next_id += 1
+            self._queued[task_id] = time.monotonic()
+            self.stats['submitted'] += 1
+        return self._executor.submit(self._run, task_id, args, kwargs, on_done)
+
+    def _run(self, task_id, args, kwargs, on_done=None):
+        with self._lock:
+            queued_at = self._queued.pop(task_id)
+            self._running += 1
+        ok = False
+        try:
+            try:
+                result = self.score_fn(*args, **kwargs)
+            except Exception as e:
+                if on_done is not None:
+                    on_done(None, e)
+                raise
+            ok = True
+            if on_done is not None:
+                on_done(result, None)
+            return result
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._lags.append(time.monotonic() - queued_at)
+                self.stats['completed' if ok else 'failed'] += 1
+
+    @staticmethod
+    def wait(futures, timeout):
+        """Wait up to `timeout` seconds; returns the futures still not done"""
+        futures = list(futures)
+        if not futures:
+            return []
+        _, not_done = wait(futures, timeout=timeout)
+        return list(not_done)
+
+    def get_stats(self):
+        with self._lock:
+            now = time.monotonic()
+            lags_ms = sorted(lag * 1000 for lag in self._lags)
+            oldest = min(self._queued.values(), default=None)
+            stats = dict(self.stats)
+            stats.update({
+                'workers': self.workers,
+                'queue_depth': len(self._queued),
+                'in_flight': self._running,
+                'oldest_queued_ms': round((now - oldest) * 1000, 1) if oldest is not None else 0.0,
+            })
+        if lags_ms:
+            stats['lag_p50_ms'] = round(lags_ms[len(lags_ms) // 2], 1)
+            stats['lag_p95_ms'] = round(lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.95))], 1)
+            stats['lag_max_ms'] = round(lags_ms[-1], 1)
+        return stats
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,308 @@
+"""
+Compiled, memory-mappable question-bank format.
+
+`compile_bank()` turns questions.csv into one binary file:
+
+    b'QBNK' | u32 version | u32 header length | JSON header | padding | sections
+
+The JSON header holds the column names, the category/difficulty string tables,
+the CSV hash, and the (offset, dtype, count) of every section:
+
+    question_numbers    int64[n]
+    category_codes      uint16[n]     (uint32 past 65536 distinct values)
+    difficulty_codes    uint16[n]     (likewise)
+    order               int32[n]      rows sorted by (category, difficulty)
+    <text column>.off   uint64[n + 1] offsets into the string table
+    strings             uint8[...]    UTF-8 text of every text column
+
+Loading maps the file read-only and builds no per-row Python objects, so it
+takes milliseconds and every worker process shares the same page-cache pages.
+
+    python bank_compiler.py "../../Interview Questions and Grading/questions.csv" -o questions.qbank
+"""
+import argparse
+import csv
+import json
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+from question_bank import QUESTION_COLUMNS, QuestionBank
+from reference_index import file_sha256
+
+MAGIC = b'QBNK'
+FORMAT_VERSION = 1
+ALIGN = 64
+TEXT_COLUMNS = ('Question', 'Answer1', 'Answer2', 'Answer3', 'Answer4')
+
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _code_dtype(distinct):
+    """Smallest unsigned dtype for codes 0..distinct-1; loaders read it from the header"""
+    for dtype in (np.uint16, np.uint32):
+        if distinct <= np.iinfo(dtype).max + 1:
+            return dtype
+    raise ValueError(f"Too many distinct values to encode: {distinct}")
+
+
+def _read_csv_columns(csv_path):
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        missing = [c for c in QUESTION_COLUMNS if c not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"{csv_path} is missing columns: {', '.join(missing)}")
+        columns = {name: [] for name in QUESTION_COLUMNS}
+        for row in reader:
+            for name in QUESTION_COLUMNS:
+                columns[name].append(row[name] or '')
+    return columns
+
+
+def compile_bank(csv_path, out_path):
+    """Compile `csv_path` into `out_path` (written atomically); returns the header"""
+    columns = _read_csv_columns(csv_path)
+    n = len(columns['Question Number'])
+
+    categories = sorted(set(columns['Category']))
+    difficulties = sorted(set(columns['Difficulty']))
+    cat_code = {c: i for i, c in enumerate(categories)}
+    diff_code = {d: i for i, d in enumerate(difficulties)}
+
+    arrays = {
+        'question_numbers': np.array([int(float(v)) for v in columns['Question Number']], dtype=np.int64),
+        'category_codes': np.array([cat_code[c] for c in columns['Category']], dtype=_code_dtype(len(categories))),
+        'difficulty_codes': np.array([diff_code[d] for d in columns['Difficulty']],
+                                     dtype=_code_dtype(len(difficulties))),
+    }
+    # Stable sort keeps CSV order within each (category, difficulty) group
+    arrays['order'] = np.lexsort((arrays['difficulty_codes'], arrays['category_codes'])).astype(np.int32)
+
+    strings = bytearray()
+    for name in TEXT_COLUMNS:
+        offsets = np.empty(n + 1, dtype=np.uint64)
+        offsets[0] = len(strings)
+        for i, text in enumerate(columns[name]):
+            strings += text.encode('utf-8')
+            offsets[i + 1] = len(strings)
+        arrays[f'{name}.off'] = offsets
+    arrays['strings'] = np.frombuffer(bytes(strings), dtype=np.uint8)
+
+    # Group boundaries inside `order`, so loading needs no scan at all
+    sorted_cats = arrays['category_codes'][arrays['order']]
+    sorted_diffs = arrays['difficulty_codes'][arrays['order']]
+    groups = []
+    for c in range(len(categories)):
+        lo, hi = np.searchsorted(sorted_cats, [c, c + 1])
+        for d in range(len(difficulties)):
+            dlo = lo + np.searchsorted(sorted_diffs[lo:hi], d, side='left')
+            dhi = lo + np.searchsorted(sorted_diffs[lo:hi], d, side='right')
+            if dhi > dlo:
+                groups.append([c, d, int(dlo), int(dhi)])
+
+    header = {
+        'version': FORMAT_VERSION,
+        'rows': n,
+        'columns': list(QUESTION_COLUMNS),
+        'text_columns': list(TEXT_COLUMNS),
+        'categories': categories,
+        'difficulties': difficulties,
+        'groups': groups,
+        'csv_sha256': file_sha256(csv_path),
+        'sections': {},
+    }
+
+    # Section offsets depend on the header size, and the header contains the
+    # offsets: lay out with a generous placeholder size, then fix it up
+    def layout(header_len):
+        offset = _align(12 + header_len)
+        sections = {}
+        for name, array in arrays.items():
+            sections[name] = [offset, array.dtype.str, int(array.size)]
+            offset = _align(offset + array.nbytes)
+        return sections
+
+    header_len = len(json.dumps(header).encode('utf-8')) + 4096
+    header['sections'] = layout(header_len)
+    header_bytes = json.dumps(header).encode('utf-8').ljust(header_len)
+
+    tmp_path = f"{out_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC + struct.pack('<II', FORMAT_VERSION, header_len) + header_bytes)
+        for name, array in arrays.items():
+            offset = header['sections'][name][0]
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(array.tobytes())
+    os.replace(tmp_path, out_path)
+    return header
+
+
+def read_header(path):
+    with open(path, 'rb') as f:
+        prefix = f.read(12)
+        if len(prefix) < 12 or prefix[:4] != MAGIC:
+            raise ValueError(f"{path} is not a compiled question bank")
+        version, header_len = struct.unpack('<II', prefix[4:])
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path} has format version {version}, expected {FORMAT_VERSION}")
+        return json.loads(f.read(header_len).decode('utf-8'))
+
+
+class CompiledQuestionBank(QuestionBank):
+    """QuestionBank served straight from a memory-mapped compiled file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.header = read_header(path)
+        self._mm = np.memmap(path, dtype=np.uint8, mode='r')
+        self.columns = tuple(self.header['columns'])
+        self.csv_sha256 = self.header['csv_sha256']
+        self._n = self.header['rows']
+
+        self._sections = {
+            name: np.frombuffer(self._mm, dtype=np.dtype(dtype), count=count, offset=offset)
+            for name, (offset, dtype, count) in self.header['sections'].items()
+        }
+        self.question_numbers = self._sections['question_numbers']
+        self._category_codes = self._sections['category_codes']
+        self._difficulty_codes = self._sections['difficulty_codes']
+        self._strings = self._sections['strings']
+        self._text_offsets = {name: self._sections[f'{name}.off'] for name in self.header['text_columns']}
+        self.by_category, self.by_category_difficulty = self._build_index()
+
+    def _build_index(self):
+        order = self._sections['order']
+        categories = self.header['categories']
+        difficulties = self.header['difficulties']
+        by_category = {}
+        by_category_difficulty = {}
+        for c, d, lo, hi in self.header['groups']:
+            by_category_difficulty[(categories[c], difficulties[d])] = order[lo:hi]
+            cat_lo, cat_hi = by_category.get(categories[c], (lo, hi))
+            by_category[categories[c]] = (min(cat_lo, lo), max(cat_hi, hi))
+        return {cat: order[lo:hi] for cat, (lo, hi) in by_category.items()}, by_category_difficulty
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def nbytes(self):
+        return self._mm.nbytes
+
+    def _text(self, name, pos):
+        offsets = self._text_offsets[name]
+        return self._strings[int(offsets[pos]):int(offsets[pos + 1])].tobytes().decode('utf-8')
+
+    def value(self, name, pos):
+        if name == 'Question Number':
+            return int(self.question_numbers[pos])
+        if name == 'Category':
+            return self.header['categories'][self._category_codes[pos]]
+        if name == 'Difficulty':
+            return self.header['difficulties'][self._difficulty_codes[pos]]
+        return self._text(name, pos)
+
+    def record(self, pos):
+        return {name: self.value(name, pos) for name in self.columns}
+
+    def column(self, name):
+        if name == 'Question Number':
+            return self.question_numbers.tolist()
+        return [self.value(name, pos) for pos in range(self._n)]
+
+
+def load_or_compile(csv_path, cache_dir):
+    """Map the compiled bank for `csv_path`, recompiling it if the CSV changed"""
+    out_path = os.path.join(cache_dir, 'question_bank.qbank')
+    csv_sha256 = file_sha256(csv_path)
+    try:
+        if read_header(out_path)['csv_sha256'] == csv_sha256:
+            return CompiledQuestionBank(out_path)
+    except (OSError, ValueError):
+        pass
+
+    os.makedirs(cache_dir, exist_ok=True)
+    start = time.perf_counter()
+    compile_bank(csv_path, out_path)
+    print(f"✓ Compiled question bank in {(time.perf_counter() - start) * 1000:.0f} ms -> {out_path}")
+    return CompiledQuestionBank(out_path)
+
+
+class BankWatcher:
+    """
+    Polls a CSV's size and mtime and calls `on_change()` when they move.
+
+    Polling (rather than inotify) keeps this dependency-free and works on
+    network filesystems; a stat() every few seconds costs nothing. Changes are
+    debounced until the file has been stable for one interval, so a reload
+    never runs against a half-written CSV.
+    """
+
+    def __init__(self, path, on_change, interval_s=5.0):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval_s
+        self._stop = threading.Event()
+        self._thread = None
+        self._seen = self._signature()
+        self.reloads = 0
+
+    def _signature(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_size, st.st_mtime_ns
+        except OSError:
+            return None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='bank-watcher', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        pending = None
+        while not self._stop.wait(self.interval):
+            current = self._signature()
+            if current is None or current == self._seen:
+                pending = None
+                continue
+            if current != pending:
+                pending = current  # wait one more interval for writes to settle
+                continue
+            try:
+                self.on_change()
+                self._seen = current
+                self.reloads += 1
+            except Exception as e:
+                print(f"❌ Question bank reload failed, keeping the current bank: {e}")
+                self._seen = current
+            pending = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('csv_path')
+    parser.add_argument('-o', '--output', required=True)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    header = compile_bank(args.csv_path, args.output)
+    compile_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    bank = CompiledQuestionBank(args.output)
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"Compiled {header['rows']} questions in {compile_ms:.0f} ms "
+          f"({os.path.getsize(args.output) / 1024:.0f} KiB, loads in {load_ms:.1f} ms, "
+          f"{len(bank.categories)} categories)")
+
+
+if __name__ == '__main__':
+    main()
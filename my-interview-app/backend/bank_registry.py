@@ -0,0 +1,246 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from bank_compiler import BankWatcher, load_or_compile
+from lazy_loader import ComponentRegistry
+from question_graph import QuestionGraph
+from question_retrieval import QuestionIndex
+from question_search import QuestionSearchIndex
+from reference_index import ReferenceIndex
+
+DEFAULT_BANK = 'default'
+
+
+class LoadedBank:
+    """
+    One named question bank and its lazily built indexes.
+
+    The bank itself, its reference-answer index, question retrieval index,
+    similarity graph and keyword search index are LazyComponents cached under
+    `cache_dir`. The encoder is
+    not part of the bank: it comes from `system`, so every bank shares one model.
+    """
+
+    def __init__(self, name, csv_path, cache_dir, system):
+        self.name = name
+        self.csv_path = csv_path
+        self.cache_dir = cache_dir
+        self.system = system
+        self.watcher = None
+
+        local_model = system.scoring_client is None
+        self.components = ComponentRegistry()
+        self.components.add('question_bank', self._load_question_bank)
+        self.components.add('reference_index', self._load_reference_index, required=local_model, warm=local_model)
+        self.components.add('question_index', self._load_question_index, required=False, warm=local_model)
+        self.components.add('question_graph', self._load_question_graph, required=False, warm=local_model)
+        self.components.add('question_search', self._load_question_search, required=False)
+
+    # ---------- lazily loaded components ----------
+    def _load_question_bank(self):
+        return load_or_compile(self.csv_path, self.cache_dir)
+
+    def _load_reference_index(self):
+        bank = self.question_bank
+        return ReferenceIndex.load_or_build(
+            self.csv_path, bank, self.system.model, self.system.encoder_id, self.cache_dir,
+            csv_sha256=bank.csv_sha256,
+        )
+
+    def _load_question_index(self):
+        return QuestionIndex.load_or_build(
+            self.question_bank, self.system._encode_uncached, self.system.encoder_id, self.cache_dir
+        )
+
+    def _load_question_graph(self):
+        if self.system.scoring_client is not None:
+            # No local model to build with: use a graph built offline
+            # (`python question_graph.py`) if there is one, else select randomly
+            return QuestionGraph.load(self.cache_dir, self.system.encoder_id, self.question_bank.csv_sha256)
+        return QuestionGraph.load_or_build(self.question_index, self.cache_dir)
+
+    def _load_question_search(self):
+        return QuestionSearchIndex.load_or_build(self.question_bank, self.cache_dir)
+
+    @property
+    def question_bank(self):
+        return self.components['question_bank'].get()
+
+    @property
+    def reference_index(self):
+        return self.components['reference_index'].get()
+
+    @property
+    def question_index(self):
+        return self.components['question_index'].get()
+
+    @property
+    def question_graph(self):
+        """The similarity graph, or None if it cannot be loaded"""
+        return self.components['question_graph'].get_or_none()
+
+    @property
+    def question_search(self):
+        return self.components['question_search'].get()
+
+    def question_vectors(self):
+        """Question embeddings lookup if the index is already loaded (never loads it)"""
+        component = self.components['question_index']
+        return component.get().vectors if component.is_ready else None
+
+    def nbytes(self):
+        """Bytes held by the loaded components (memory-mapped arrays included)"""
+        total = 0
+        for name in ('question_bank', 'reference_index', 'question_index', 'question_graph'):
+            component = self.components[name]
+            if component.is_ready:
+                total += getattr(component.get(), 'nbytes', 0)
+        return total
+
+    # ---------- hot reload ----------
+    def reload(self):
+        """
+        Recompile the CSV and swap the new bank (and its reference index)
+        in atomically. Sessions keep the question dicts they were given, so
+        interviews in progress are unaffected; new interviews see the new bank.
+        """
+        start = time.perf_counter()
+        bank = load_or_compile(self.csv_path, self.cache_dir)
+        index = None
+        if self.system.components['encoder'].is_ready:
+            # Build before swapping so scoring never sees a half-updated state
+            index = ReferenceIndex.load_or_build(
+                self.csv_path, bank, self.system.model, self.system.encoder_id, self.cache_dir,
+                csv_sha256=bank.csv_sha256,
+            )
+        search = self.components['question_search']
+        if search.is_ready:
+            # Incremental, and readers see the old rows until it commits
+            search.get().sync(bank, bank.csv_sha256)
+        # Index first: a question from the new bank must never be scored
+        # against the previous bank's reference answers
+        if index is not None:
+            self.components['reference_index'].replace(index)
+        else:
+            self.components['reference_index'].reset()
+        # Rebuilt from the new bank on their next use
+        self.components['question_index'].reset()
+        self.components['question_graph'].reset()
+        self.components['question_bank'].replace(bank)
+        print(f"🔄 Question bank '{self.name}' reloaded: {len(bank)} questions "
+              f"in {time.perf_counter() - start:.2f}s")
+        return bank
+
+    def start_watcher(self, interval_s):
+        """Poll the CSV every `interval_s` seconds and hot-reload on change"""
+        if self.watcher is None:
+            self.watcher = BankWatcher(self.csv_path, self.reload, interval_s)
+            self.watcher.start()
+        return self.watcher
+
+    def close(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+        search = self.components['question_search']
+        if search.is_ready:
+            search.get().close()
+
+    def status(self):
+        status = {'csv_path': self.csv_path, 'bytes': self.nbytes()}
+        status.update({name: c['state'] for name, c in self.components.status().items()})
+        return status
+
+
+class BankRegistry:
+    """
+    Named question banks, loaded on first use and evicted least-recently-used
+    first once the loaded banks hold more than `memory_budget_bytes`.
+
+    The default bank (questions.csv) is pinned. Other banks are the `*.csv`
+    files in `banks_dir`, named after the file; the directory is rescanned when
+    an unknown name is requested, so a new bank needs no restart. An evicted
+    bank simply loads again (from its on-disk caches) the next time it is used.
+    """
+
+    def __init__(self, system, default_csv, cache_dir, banks_dir=None, memory_budget_bytes=0, reload_s=0):
+        self.system = system
+        self.cache_dir = cache_dir
+        self.banks_dir = banks_dir
+        self.memory_budget = memory_budget_bytes
+        self.reload_s = reload_s
+        self._paths = {DEFAULT_BANK: default_csv}
+        self._lock = threading.Lock()
+        self.default = LoadedBank(DEFAULT_BANK, default_csv, cache_dir, system)
+        self._loaded = OrderedDict([(DEFAULT_BANK, self.default)])
+        self.stats = {'loads': 0, 'evictions': 0}
+        self.discover()
+
+    def discover(self):
+        """Rescan `banks_dir` for bank CSVs"""
+        if self.banks_dir and os.path.isdir(self.banks_dir):
+            for filename in sorted(os.listdir(self.banks_dir)):
+                name, ext = os.path.splitext(filename)
+                if ext.lower() == '.csv' and name != DEFAULT_BANK:
+                    self._paths[name] = os.path.join(self.banks_dir, filename)
+        return list(self._paths)
+
+    def names(self):
+        return list(self._paths)
+
+    def get(self, name=None):
+        """The LoadedBank for `name` (default bank if None); KeyError if unknown"""
+        name = name or DEFAULT_BANK
+        with self._lock:
+            bank = self._loaded.get(name)
+            if bank is None:
+                if name not in self._paths:
+                    self.discover()
+                if name not in self._paths:
+                    raise KeyError(f"Unknown question bank {name!r}")
+                bank = LoadedBank(name, self._paths[name], os.path.join(self.cache_dir, 'banks', name), self.system)
+                if self.reload_s > 0:
+                    bank.start_watcher(self.reload_s)
+                self._loaded[name] = bank
+                self.stats['loads'] += 1
+            self._loaded.move_to_end(name)
+            self._enforce_budget(keep=name)
+        return bank
+
+    def _enforce_budget(self, keep):
+        # Components load after get() returns, so the budget is checked on the
+        # next request; one bank can overshoot it briefly
+        if self.memory_budget <= 0:
+            return
+        total = sum(bank.nbytes() for bank in self._loaded.values())
+        for name in list(self._loaded):
+            if total <= self.memory_budget:
+                break
+            if name in (DEFAULT_BANK, keep):
+                continue
+            bank = self._loaded.pop(name)
+            freed = bank.nbytes()
+            bank.close()
+            total -= freed
+            self.stats['evictions'] += 1
+            print(f"♻️ Evicted question bank '{name}' ({freed / (1024 * 1024):.1f} MB)")
+
+    def set_reload_interval(self, interval_s):
+        """Hot-reload every loaded bank (and any loaded later) on CSV changes"""
+        self.reload_s = interval_s
+        with self._lock:
+            banks = list(self._loaded.values())
+        for bank in banks:
+            bank.start_watcher(interval_s)
+
+    def status(self):
+        with self._lock:
+            loaded = {name: bank.status() for name, bank in self._loaded.items()}
+        return {
+            'available': self.names(),
+            'loaded': loaded,
+            'memory_budget_bytes': self.memory_budget,
+            **self.stats,
+        }
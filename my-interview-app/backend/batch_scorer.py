@@ -0,0 +1,163 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class _PendingAnswer:
+    __slots__ = ('answer', 'ref_answers', 'question_id', 'reference_index', 'future')
+
+    def __init__(self, answer, ref_answers, question_id, reference_index):
+        self.answer = answer
+        self.ref_answers = ref_answers
+        self.question_id = question_id
+        self.reference_index = reference_index
+        self.future = Future()
+
+
+class BatchScorer:
+    """
+    Coalesces concurrent score requests into one encoder call.
+
+    Callers get a Future from `submit()`. A single background thread takes the
+    first queued answer, keeps collecting for up to `window_ms` or until
+    `max_batch` answers are queued, then encodes the whole batch in one forward
+    pass and resolves every Future with its own (similarity, is_correct).
+    With an AnswerChunker, long answers go in as several windows and their
+    similarities are combined per answer. With a CascadeGrader, the batch's
+    borderline answers are then re-graded together by its heavier model.
+    """
+
+    def __init__(self, model, reference_index=None, window_ms=10, max_batch=32, threshold=0.5,
+                 encode_fn=None, chunker=None, cascade=None):
+        self.model = model
+        self.encode_fn = encode_fn or self._encode_with_model
+        self.chunker = chunker
+        self.cascade = cascade
+        self.reference_index = reference_index
+        self.window = max(window_ms, 0) / 1000.0
+        self.max_batch = max(int(max_batch), 1)
+        self.threshold = threshold
+
+        self.stats = {'batches': 0, 'answers': 0, 'max_batch_seen': 0}
+
+        self._queue = queue.Queue()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='batch-scorer', daemon=True)
+        self._thread.start()
+
+    def submit(self, answer, ref_answers=None, question_id=None, reference_index=None):
+        """
+        Queue one answer; the returned Future resolves to (similarity, is_correct).
+        `reference_index` overrides the scorer's own for this answer, so one
+        scorer can serve several question banks.
+        """
+        if self._stopped.is_set():
+            raise RuntimeError("BatchScorer has been stopped")
+        pending = _PendingAnswer(answer, ref_answers or [], question_id, reference_index or self.reference_index)
+        self._queue.put(pending)
+        return pending.future
+
+    def score(self, answer, ref_answers=None, question_id=None, timeout=None, reference_index=None):
+        return self.submit(answer, ref_answers, question_id, reference_index).result(timeout=timeout)
+
+    def stop(self, timeout=5):
+        self._stopped.set()
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+
+    # ---------- background loop ----------
+    def _collect_batch(self):
+        first = self._queue.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._stopped.set()
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while not self._stopped.is_set():
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            try:
+                results = self.score_batch(batch)
+            except Exception as e:
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+                continue
+            for pending, result in zip(batch, results):
+                pending.future.set_result(result)
+
+            self.stats['batches'] += 1
+            self.stats['answers'] += len(batch)
+            self.stats['max_batch_seen'] = max(self.stats['max_batch_seen'], len(batch))
+
+        # Fail anything still queued so no caller waits forever
+        while True:
+            try:
+                pending = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if pending is not None:
+                pending.future.set_exception(RuntimeError("BatchScorer has been stopped"))
+
+    def _encode_with_model(self, texts):
+        return self.model.encode(
+            texts,
+            batch_size=max(len(texts), 1),
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+
+    def score_batch(self, batch):
+        """Score a list of pending answers with a single encode call"""
+        answers = [pending.answer for pending in batch]
+        if self.chunker is not None:
+            texts, offsets = self.chunker.windows(answers)
+        else:
+            texts, offsets = answers, np.arange(len(answers) + 1)
+        # Answers whose question is not indexed bring their reference texts along
+        ref_slices = []
+        for pending in batch:
+            ref_embs = None
+            if pending.reference_index is not None and pending.question_id is not None:
+                ref_embs = pending.reference_index.get(pending.question_id)
+            if ref_embs is not None:
+                ref_slices.append(ref_embs)
+            else:
+                start = len(texts)
+                texts.extend(pending.ref_answers)
+                ref_slices.append(slice(start, len(texts)))
+
+        embeddings = self.encode_fn(texts)
+
+        results = []
+        for i, refs in enumerate(ref_slices):
+            if isinstance(refs, slice):
+                refs = embeddings[refs]
+            if len(refs) == 0:
+                results.append((0.0, False))
+                continue
+            # Best reference per window, then one score per answer
+            window_sims = np.max(refs @ embeddings[offsets[i]:offsets[i + 1]].T, axis=0)
+            max_sim = self.chunker.combine(window_sims) if self.chunker is not None else float(window_sims[0])
+            results.append((max_sim, max_sim > self.threshold))
+        if self.cascade is not None:
+            items = [(pending.answer, pending.ref_answers) for pending in batch]
+            results = self.cascade.grade(items, [similarity for similarity, _ in results])
+        return results
@@ -0,0 +1,157 @@
+"""
+Concurrent-load benchmark for the micro-batching scorer.
+
+Runs the same set of (question, answer) requests from N client threads twice:
+once calling the encoder per request (today's path) and once through
+BatchScorer. Reports throughput per core and p50/p99 latency for each.
+
+    python benchmarks/bench_batch_scorer.py --clients 32 --requests 20 --window-ms 10
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from batch_scorer import BatchScorer  # noqa: E402
+from reference_index import ANSWER_COLUMNS, ReferenceIndex  # noqa: E402
+
+DEFAULT_QUESTIONS = os.path.join(
+    os.path.dirname(os.path.dirname(BACKEND_DIR)), "Interview Questions and Grading", "questions.csv"
+)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[rank]
+
+
+def build_workload(questions_df, total, seed=0):
+    """Answers are reference answers borrowed from random other questions"""
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(questions_df), size=total)
+    donors = rng.integers(0, len(questions_df), size=total)
+    columns = rng.integers(0, len(ANSWER_COLUMNS), size=total)
+    workload = []
+    for row, donor, col in zip(rows, donors, columns):
+        question = questions_df.iloc[int(row)]
+        answer = questions_df.iloc[int(donor)][ANSWER_COLUMNS[int(col)]]
+        workload.append((int(question['Question Number']), str(answer)))
+    return workload
+
+
+def run_clients(score_fn, workload, clients):
+    latencies = []
+    lock = threading.Lock()
+    per_client = [workload[i::clients] for i in range(clients)]
+    barrier = threading.Barrier(clients + 1)
+
+    def client(items):
+        local = []
+        barrier.wait()
+        for question_id, answer in items:
+            start = time.perf_counter()
+            score_fn(question_id, answer)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(items,)) for items in per_client]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return elapsed, latencies
+
+
+def summarize(name, elapsed, latencies, cores):
+    throughput = len(latencies) / elapsed if elapsed else 0.0
+    return {
+        "mode": name,
+        "requests": len(latencies),
+        "seconds": round(elapsed, 4),
+        "throughput_rps": round(throughput, 2),
+        "throughput_rps_per_core": round(throughput / cores, 2),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2", help="model name or local model path")
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--window-ms", type=float, default=10)
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=0, help="torch intra-op threads (0 = torch default)")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    cores = torch.get_num_threads()
+
+    questions_df = pd.read_csv(args.questions)
+    model = SentenceTransformer(args.model)
+    index = ReferenceIndex.build(questions_df, model, args.model, csv_sha256="benchmark")
+    workload = build_workload(questions_df, args.clients * args.requests)
+
+    # Warm up both paths so one-off allocations are not measured
+    model.encode(["warm up"], normalize_embeddings=True)
+
+    def score_unbatched(question_id, answer):
+        emb = model.encode([answer], normalize_embeddings=True, show_progress_bar=False)[0]
+        return float(np.max(index.get(question_id) @ emb))
+
+    scorer = BatchScorer(model, index, window_ms=args.window_ms, max_batch=args.max_batch)
+
+    def score_batched(question_id, answer):
+        return scorer.score(answer, question_id=question_id)
+
+    results = []
+    elapsed, latencies = run_clients(score_unbatched, workload, args.clients)
+    results.append(summarize("per-request", elapsed, latencies, cores))
+    elapsed, latencies = run_clients(score_batched, workload, args.clients)
+    batched = summarize("batched", elapsed, latencies, cores)
+    batched["avg_batch_size"] = round(scorer.stats["answers"] / max(scorer.stats["batches"], 1), 2)
+    results.append(batched)
+    scorer.stop()
+
+    report = {
+        "model": args.model,
+        "clients": args.clients,
+        "window_ms": args.window_ms,
+        "max_batch": args.max_batch,
+        "torch_threads": cores,
+        "results": results,
+    }
+    for row in results:
+        print(f"{row['mode']:>12}: {row['throughput_rps']:8.1f} req/s "
+              f"({row['throughput_rps_per_core']:.1f}/core)  "
+              f"p50 {row['p50_ms']:.1f} ms  p99 {row['p99_ms']:.1f} ms")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Resume-to-question retrieval benchmark: exact search vs the IVF index.
+
+Synthetic question embeddings are drawn around random topic centres (real
+question banks cluster by topic the same way), and each "resume" is a set of
+chunk vectors near questions of a few topics. For every bank size it reports
+index build time, search latency per resume (all chunks in one call) and
+recall@k of the approximate index against exact search. Exits non-zero when
+the p95 latency at any size exceeds the budget, so it can gate CI.
+
+    python benchmarks/bench_question_retrieval.py --sizes 10000 1000000 --budget-ms 50
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from question_retrieval import EXACT_MAX_QUESTIONS, QuestionIndex  # noqa: E402
+
+
+def normalize(vectors):
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def make_embeddings(size, dim, topics, rng, spread=0.6, block=100000):
+    centres = normalize(rng.standard_normal((topics, dim), dtype=np.float32))
+    embeddings = np.empty((size, dim), dtype=np.float32)
+    for start in range(0, size, block):
+        n = min(block, size - start)
+        noise = rng.standard_normal((n, dim), dtype=np.float32) * (spread / np.sqrt(dim))
+        embeddings[start:start + n] = normalize(centres[rng.integers(0, topics, n)] + noise)
+    return embeddings
+
+
+def make_resumes(embeddings, count, chunks, rng, spread=0.6):
+    dim = embeddings.shape[1]
+    resumes = []
+    for _ in range(count):
+        anchors = embeddings[rng.integers(0, len(embeddings), chunks)]
+        noise = rng.standard_normal((chunks, dim), dtype=np.float32) * (spread / np.sqrt(dim))
+        resumes.append(normalize(anchors + noise))
+    return resumes
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 1000000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--topics", type=int, default=2000)
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--chunks", type=int, default=16, help="chunks per resume")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--exact-max", type=int, default=EXACT_MAX_QUESTIONS)
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="max p95 search time per resume")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    results = []
+    for size in args.sizes:
+        embeddings = make_embeddings(size, args.dim, min(args.topics, size), rng)
+        resumes = make_resumes(embeddings, args.resumes, args.chunks, rng)
+
+        start = time.perf_counter()
+        index = QuestionIndex.from_embeddings(embeddings, "benchmark", "benchmark", exact_max=args.exact_max)
+        build_s = time.perf_counter() - start
+
+        timings = []
+        found = []
+        for chunk_vectors in resumes:
+            start = time.perf_counter()
+            _, positions = index.search(chunk_vectors, k=args.k, nprobe=args.nprobe)
+            timings.append((time.perf_counter() - start) * 1000)
+            found.append(positions)
+
+        row = {
+            "questions": size,
+            "kind": index.kind,
+            "build_s": round(build_s, 3),
+            "search_p50_ms": round(statistics.median(timings), 3),
+            "search_p95_ms": round(percentile(timings, 95), 3),
+        }
+        if index.kind != "exact":
+            row["nlist"] = index.meta["nlist"]
+            # Recall against brute force on the same vectors
+            hits = 0
+            for chunk_vectors, positions in zip(resumes, found):
+                # Blockwise: one (n, chunks) product would need BLAS scratch the size of the bank
+                scores = np.concatenate(
+                    [embeddings[lo:lo + 65536] @ chunk_vectors.T for lo in range(0, size, 65536)]
+                ).T
+                truth = np.argpartition(-scores, args.k - 1, axis=1)[:, :args.k]
+                hits += sum(len(set(t) & set(p)) for t, p in zip(truth, positions))
+            row[f"recall_at_{args.k}"] = round(hits / (len(resumes) * args.chunks * args.k), 4)
+        row["within_budget"] = row["search_p95_ms"] <= args.budget_ms
+        results.append(row)
+        print(json.dumps(row))
+        del index, embeddings
+
+    report = {
+        "dim": args.dim,
+        "chunks_per_resume": args.chunks,
+        "k": args.k,
+        "nprobe": args.nprobe,
+        "budget_ms": args.budget_ms,
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    over = [r["questions"] for r in results if not r["within_budget"]]
+    if over:
+        print(f"❌ p95 search time exceeds {args.budget_ms} ms at sizes: {over}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
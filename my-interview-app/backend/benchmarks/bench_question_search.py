@@ -0,0 +1,135 @@
+"""
+Question search benchmark: FTS5 index build, incremental sync and query latency.
+
+Synthetic banks are made by tiling questions.csv up to each target size with
+fresh question numbers, so term frequencies grow with the bank like they do
+in a real one. Queries are 1-3 content words taken from real questions (the
+search drops stop words anyway), run with and without category/difficulty
+filters, plus filter-only listings and a deep page. After the queries, 1% of the rows are replaced and the index is synced
+again to time the incremental path. Exits non-zero when the p95 query time
+at any size exceeds the budget.
+
+    python benchmarks/bench_question_search.py --sizes 10000 1000000 --budget-ms 50
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from question_bank import QuestionBank  # noqa: E402
+from question_search import STOP_WORDS, QuestionSearchIndex, _TOKEN  # noqa: E402
+
+DEFAULT_QUESTIONS = os.path.join(
+    os.path.dirname(os.path.dirname(BACKEND_DIR)), "Interview Questions and Grading", "questions.csv"
+)
+
+
+def make_bank(base_df, size):
+    reps = -(-size // len(base_df))
+    df = pd.concat([base_df] * reps, ignore_index=True).head(size).copy()
+    df['Question Number'] = range(1, len(df) + 1)
+    return QuestionBank.from_dataframe(df)
+
+
+def make_queries(base_df, count, rng):
+    questions = base_df['Question'].dropna().tolist()
+    categories = base_df['Category'].dropna().unique().tolist()
+    difficulties = base_df['Difficulty'].dropna().unique().tolist()
+    queries = []
+    for i in range(count):
+        words = [w for w in _TOKEN.findall(rng.choice(questions)) if w.lower() not in STOP_WORDS] or ['question']
+        start = rng.randrange(len(words))
+        query = {'text': ' '.join(words[start:start + rng.randint(1, 3)])}
+        if i % 3 == 1:
+            query['category'] = rng.choice(categories)
+        elif i % 3 == 2:
+            query['category'] = rng.choice(categories)
+            query['difficulty'] = rng.choice(difficulties)
+        queries.append(query)
+    for category in categories[:5]:
+        queries.append({'category': category})
+        queries.append({'category': category, 'page': 50})
+    return queries
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 1000000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="max p95 time per query")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    base_df = pd.read_csv(args.questions)
+    rng = random.Random(args.seed)
+    queries = make_queries(base_df, args.queries, rng)
+    results = []
+    for size in args.sizes:
+        bank = make_bank(base_df, size)
+        workdir = tempfile.mkdtemp(prefix="bench_question_search_")
+        try:
+            index = QuestionSearchIndex(QuestionSearchIndex.path(workdir))
+            build = index.sync(bank)
+
+            timings = []
+            for query in queries:
+                start = time.perf_counter()
+                index.search(query.get('text'), query.get('category'), query.get('difficulty'),
+                             page=query.get('page', 1), per_page=args.per_page)
+                timings.append((time.perf_counter() - start) * 1000)
+
+            # Replace 1% of the rows with fresh question numbers
+            df = pd.DataFrame([bank.record(pos) for pos in range(len(bank))])
+            changed = rng.sample(range(size), max(1, size // 100))
+            df.loc[changed, 'Question Number'] = range(size + 1, size + 1 + len(changed))
+            update = index.sync(QuestionBank.from_dataframe(df))
+            index.close()
+
+            row = {
+                "questions": size,
+                "build_s": build["seconds"],
+                "db_mb": round(os.path.getsize(QuestionSearchIndex.path(workdir)) / (1024 * 1024), 1),
+                "query_p50_ms": round(statistics.median(timings), 3),
+                "query_p95_ms": round(percentile(timings, 95), 3),
+                "query_max_ms": round(max(timings), 3),
+                "sync_1pct_s": update["seconds"],
+                "sync_added": update["added"],
+                "sync_removed": update["removed"],
+            }
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        row["within_budget"] = row["query_p95_ms"] <= args.budget_ms
+        results.append(row)
+        print(json.dumps(row))
+        del bank
+
+    report = {"queries": len(queries), "per_page": args.per_page, "budget_ms": args.budget_ms, "results": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    over = [r["questions"] for r in results if not r["within_budget"]]
+    if over:
+        print(f"❌ p95 query time exceeds {args.budget_ms} ms at sizes: {over}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
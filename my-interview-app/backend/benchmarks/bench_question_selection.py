@@ -0,0 +1,100 @@
+"""
+Microbenchmark: pandas-filter question selection vs the QuestionBank index.
+
+Synthetic banks are made by tiling questions.csv up to each target size with
+fresh question numbers. For each size it times the old per-category boolean
+filter + pd.concat + sample(frac=1) path against QuestionBank.select, both
+returning plain dicts.
+
+    python benchmarks/bench_question_selection.py --sizes 1000 100000 1000000
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from question_bank import QuestionBank  # noqa: E402
+
+DEFAULT_QUESTIONS = os.path.join(
+    os.path.dirname(os.path.dirname(BACKEND_DIR)), "Interview Questions and Grading", "questions.csv"
+)
+
+
+def make_bank(base_df, size):
+    reps = -(-size // len(base_df))
+    df = pd.concat([base_df] * reps, ignore_index=True).head(size).copy()
+    df['Question Number'] = range(1, len(df) + 1)
+    return df
+
+
+def pandas_select(questions_df, categories, per_category):
+    """The selection loop InterviewSystem.generate_questions used before the index"""
+    interview_questions = pd.DataFrame()
+    for cat in categories:
+        cat_questions = questions_df[questions_df['Category'] == cat]
+        num_to_pick = min(per_category, len(cat_questions))
+        if num_to_pick > 0:
+            selected = cat_questions.sample(num_to_pick, random_state=42)
+            interview_questions = pd.concat([interview_questions, selected])
+    if not interview_questions.empty:
+        interview_questions = interview_questions.sample(frac=1, random_state=42).reset_index(drop=True)
+    return interview_questions.to_dict('records')
+
+
+def time_calls(fn, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--categories", type=int, default=5, help="categories requested per interview")
+    parser.add_argument("--per-category", type=int, default=3)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    base_df = pd.read_csv(args.questions)
+    categories = base_df['Category'].value_counts().index[:args.categories].tolist()
+
+    results = []
+    for size in args.sizes:
+        df = make_bank(base_df, size)
+
+        start = time.perf_counter()
+        bank = QuestionBank.from_dataframe(df)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        pandas_ms = time_calls(lambda: pandas_select(df, categories, args.per_category), args.runs)
+        index_ms = time_calls(lambda: bank.select(categories, args.per_category), args.runs)
+        row = {
+            "questions": size,
+            "index_build_ms": round(build_ms, 2),
+            "pandas_select_ms": round(pandas_ms, 4),
+            "index_select_ms": round(index_ms, 4),
+            "speedup": round(pandas_ms / index_ms, 1) if index_ms else None,
+        }
+        results.append(row)
+        print(f"{size:>9} questions: pandas {pandas_ms:9.3f} ms | index {index_ms:7.4f} ms | "
+              f"{row['speedup']}x faster (index built once in {build_ms:.0f} ms)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"categories": categories, "per_category": args.per_category, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
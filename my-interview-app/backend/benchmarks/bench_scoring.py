@@ -0,0 +1,268 @@
+"""
+Scoring benchmark suite for InterviewSystem.
+
+Builds synthetic answer corpora from questions.csv and measures:
+
+  * model load time and reference-index build time
+  * single-call score_answer latency per corpus (p50/p95/p99)
+  * score_answers_batch throughput
+  * generate_questions latency
+  * memory high-water mark (process RSS, and Python allocations during the batch run)
+
+Everything runs offline against a local model directory. Results are written as
+JSON; pass --compare with a previous run to print relative changes.
+
+    python benchmarks/bench_scoring.py --model-path /models/all-MiniLM-L6-v2 --json results.json
+    python benchmarks/bench_scoring.py --model-path /models/all-MiniLM-L6-v2 --compare results.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ANSWER_COLUMNS = ['Answer1', 'Answer2', 'Answer3', 'Answer4']
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[rank]
+
+
+def latency_summary(seconds):
+    ms = [s * 1000 for s in seconds]
+    return {
+        "calls": len(ms),
+        "p50_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+    }
+
+
+def build_corpora(questions, per_corpus, seed):
+    """
+    Synthetic (question, answer) sets:
+
+      exact          a reference answer of the question itself
+      same_category  another question's reference answer from the same
+                     category: on topic, but answering a different question
+      off_topic      a reference answer from a different category
+      short          the first five words of a reference answer
+      long           ~8 reference answers of the category concatenated
+      transcript     ~80 reference answers of the category, one of them the
+                     question's own, like a rambling dictated answer
+    """
+    rng = random.Random(seed)
+    by_category = {}
+    for q in questions:
+        by_category.setdefault(q['Category'], []).append(q)
+    categories = list(by_category)
+
+    def pick():
+        return rng.choice(questions)
+
+    def ref(q):
+        return str(q[rng.choice(ANSWER_COLUMNS)])
+
+    corpora = {name: [] for name in ('exact', 'same_category', 'off_topic', 'short', 'long', 'transcript')}
+    for _ in range(per_corpus):
+        q = pick()
+        corpora['exact'].append((q, ref(q)))
+
+        q = pick()
+        peers = [p for p in by_category[q['Category']] if p is not q] or [q]
+        corpora['same_category'].append((q, ref(rng.choice(peers))))
+
+        q = pick()
+        others = [c for c in categories if c != q['Category']] or categories
+        corpora['off_topic'].append((q, ref(rng.choice(by_category[rng.choice(others)]))))
+
+        q = pick()
+        corpora['short'].append((q, " ".join(ref(q).split()[:5])))
+
+        q = pick()
+        peers = by_category[q['Category']]
+        corpora['long'].append((q, " ".join(ref(rng.choice(peers)) for _ in range(8))))
+
+        q = pick()
+        parts = [ref(rng.choice(by_category[q['Category']])) for _ in range(80)]
+        parts[rng.randrange(len(parts))] = ref(q)
+        corpora['transcript'].append((q, ". ".join(parts)))
+    return corpora
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(current, previous):
+    """Print relative change of every numeric leaf present in both runs"""
+    def leaves(node, prefix=""):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                yield from leaves(value, f"{prefix}.{key}" if prefix else key)
+        elif isinstance(node, (int, float)) and not isinstance(node, bool):
+            yield prefix, node
+
+    old = dict(leaves(previous.get("results", {})))
+    print(f"\nComparison against {previous.get('commit')} ({previous.get('timestamp')}):")
+    for key, value in leaves(current["results"]):
+        if key in old and old[key]:
+            change = (value - old[key]) / abs(old[key]) * 100
+            print(f"  {key:<45} {old[key]:>12.3f} -> {value:>12.3f}  ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-path", default=os.environ.get("INTERVIEW_MODEL_NAME"),
+                        help="local sentence-transformer directory (required, no downloads are attempted)")
+    parser.add_argument("--backend", default="torch", help="encoder backend, see encoders.BACKENDS")
+    parser.add_argument("--answer-chunking", default="max", help="max, mean or off (INTERVIEW_ANSWER_CHUNKING)")
+    parser.add_argument("--per-corpus", type=int, default=50, help="answers per synthetic corpus")
+    parser.add_argument("--batch-size", type=int, default=2000, help="answers in the batch-throughput run")
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--generate-runs", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    args = parser.parse_args()
+
+    if not args.model_path or not os.path.isdir(args.model_path):
+        parser.error("--model-path must point to a local model directory")
+
+    # Everything is configured before interview_system is imported, because it
+    # reads its settings at import time. The embedding cache is disabled so the
+    # encoder itself is measured, and a fresh cache dir forces an index build.
+    cache_dir = tempfile.mkdtemp(prefix="bench-scoring-")
+    os.environ.update({
+        "HF_HUB_OFFLINE": "1",
+        "TRANSFORMERS_OFFLINE": "1",
+        "INTERVIEW_MODEL_NAME": args.model_path,
+        "INTERVIEW_ENCODER_BACKEND": args.backend,
+        "INTERVIEW_ANSWER_CHUNKING": args.answer_chunking,
+        "INTERVIEW_CACHE_DIR": cache_dir,
+        "INTERVIEW_EMBED_CACHE_ENTRIES": "0",
+        "INTERVIEW_EMBED_CACHE_DB": "",
+        "INTERVIEW_BATCH_WINDOW_MS": "0",
+        "INTERVIEW_SCORING_SOCKET": "",
+    })
+    sys.path.insert(0, BACKEND_DIR)
+
+    quiet = contextlib.redirect_stdout(open(os.devnull, "w"))
+    with quiet:
+        from interview_system import InterviewSystem
+        system = InterviewSystem()
+    components = system.components
+
+    results = {}
+    with quiet:
+        bank = system.question_bank
+        questions = [bank.record(pos) for pos in range(len(bank))]
+        start = time.perf_counter()
+        system.model
+        results["model_load_s"] = round(time.perf_counter() - start, 4)
+        start = time.perf_counter()
+        system.reference_index
+        results["index_build_s"] = round(time.perf_counter() - start, 4)
+    results["questions"] = len(questions)
+
+    corpora = build_corpora(questions, args.per_corpus, args.seed)
+    with quiet:
+        system.score_answer("warm up", ["warm up"], question_id=questions[0]['Question Number'])
+
+    single = {}
+    for name, items in corpora.items():
+        timings, similarities = [], []
+        for question, answer in items:
+            refs = [question[col] for col in ANSWER_COLUMNS]
+            with quiet:
+                start = time.perf_counter()
+                similarity, _ = system.score_answer(answer, refs, question_id=question['Question Number'])
+                timings.append(time.perf_counter() - start)
+            similarities.append(similarity)
+        single[name] = latency_summary(timings)
+        single[name]["mean_similarity"] = round(statistics.fmean(similarities), 4)
+    results["score_answer"] = single
+
+    rng = random.Random(args.seed)
+    pool = [pair for items in corpora.values() for pair in items]
+    pairs = [(q['Question Number'], a) for q, a in (rng.choice(pool) for _ in range(args.batch_size))]
+    # tracemalloc only around this run: it slows everything it observes
+    tracemalloc.start()
+    start = time.perf_counter()
+    scored = sum(1 for _ in system.score_answers_batch(pairs, chunk_size=args.chunk_size))
+    elapsed = time.perf_counter() - start
+    _, batch_alloc_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results["score_answers_batch"] = {
+        "answers": scored,
+        "chunk_size": args.chunk_size,
+        "seconds": round(elapsed, 4),
+        "answers_per_s": round(scored / elapsed, 2),
+    }
+
+    # The first call builds the question index and graph; report it on its own
+    # so the percentiles describe the steady state
+    with quiet:
+        start = time.perf_counter()
+        system.generate_questions(questions_per_category=3)
+        first_call = time.perf_counter() - start
+    timings = []
+    for _ in range(args.generate_runs):
+        with quiet:
+            start = time.perf_counter()
+            system.generate_questions(questions_per_category=3)
+            timings.append(time.perf_counter() - start)
+    results["generate_questions"] = latency_summary(timings)
+    results["generate_questions"]["first_call_ms"] = round(first_call * 1000, 3)
+
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        max_rss_kb //= 1024
+    results["memory"] = {
+        "max_rss_mb": round(max_rss_kb / 1024, 1),
+        "batch_python_alloc_peak_mb": round(batch_alloc_peak / (1024 * 1024), 1),
+    }
+    results["component_load_s"] = {
+        name: status.get("load_seconds") for name, status in components.status().items()
+    }
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "model_path": args.model_path,
+        "backend": args.backend,
+        "answer_chunking": args.answer_chunking,
+        "per_corpus": args.per_corpus,
+        "seed": args.seed,
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
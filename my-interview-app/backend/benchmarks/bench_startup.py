@@ -0,0 +1,96 @@
+"""
+Cold-start benchmark for the Flask backend.
+
+Each run starts a fresh interpreter, imports `app` and serves one /api/health
+request through the test client, so module-level work is measured exactly as a
+restarted or autoscaled worker pays it. Exits non-zero when the median import
+time exceeds the budget, so it can gate CI.
+
+    python benchmarks/bench_startup.py --runs 5 --budget-ms 1000
+    python benchmarks/bench_startup.py --mode background --wait-ready 120
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+client.get('/api/health')
+healthy = time.perf_counter()
+result = {"import_ms": (imported - start) * 1000, "first_health_ms": (healthy - start) * 1000}
+wait_ready = float(sys.argv[1])
+if wait_ready > 0:
+    deadline = start + wait_ready
+    while time.perf_counter() < deadline:
+        if client.get('/api/ready').status_code == 200:
+            result["ready_ms"] = (time.perf_counter() - start) * 1000
+            break
+        time.sleep(0.05)
+    result["components"] = client.get('/api/ready').get_json()["components"]
+print("BENCH_RESULT " + json.dumps(result))
+"""
+
+
+def run_once(mode, wait_ready):
+    env = dict(os.environ, INTERVIEW_STARTUP_MODE=mode, PYTHONDONTWRITEBYTECODE='1')
+    proc = subprocess.run(
+        [sys.executable, "-c", PROBE, str(wait_ready)],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith("BENCH_RESULT "):
+            return json.loads(line[len("BENCH_RESULT "):])
+    raise RuntimeError(f"startup probe failed:\n{proc.stderr[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", default="lazy", choices=["lazy", "background", "eager"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="max median import time")
+    parser.add_argument("--wait-ready", type=float, default=0.0,
+                        help="also wait up to this many seconds for /api/ready")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    runs = [run_once(args.mode, args.wait_ready) for _ in range(args.runs)]
+    import_ms = [r["import_ms"] for r in runs]
+    health_ms = [r["first_health_ms"] for r in runs]
+    report = {
+        "mode": args.mode,
+        "runs": args.runs,
+        "budget_ms": args.budget_ms,
+        "import_ms_median": round(statistics.median(import_ms), 1),
+        "import_ms_max": round(max(import_ms), 1),
+        "first_health_ms_median": round(statistics.median(health_ms), 1),
+    }
+    ready_ms = [r["ready_ms"] for r in runs if "ready_ms" in r]
+    if ready_ms:
+        report["ready_ms_median"] = round(statistics.median(ready_ms), 1)
+    if args.wait_ready:
+        report["components"] = runs[-1].get("components")
+    report["within_budget"] = report["import_ms_median"] <= args.budget_ms
+
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if not report["within_budget"]:
+        print(f"❌ Median import time {report['import_ms_median']} ms exceeds budget {args.budget_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Accuracy check for a non-default encoder backend against fp32.
+
+Both encoders embed every reference answer in questions.csv. Two synthetic
+candidate answers are then scored per reference answer, exactly as
+score_answer would score them:
+
+  * on-topic:  the reference itself, scored against the question's other references
+  * off-topic: a reference borrowed from the next question
+
+The check reports similarity drift and how many is_correct decisions flip at
+the threshold. It exits non-zero when either exceeds its tolerance.
+
+    python benchmarks/check_encoder_accuracy.py --backend torch-int8
+    python benchmarks/check_encoder_accuracy.py --backend onnx-int8 --model /models/all-MiniLM-L6-v2
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from encoders import BACKENDS, load_encoder  # noqa: E402
+from reference_index import ReferenceIndex  # noqa: E402
+
+DEFAULT_QUESTIONS = os.path.join(
+    os.path.dirname(os.path.dirname(BACKEND_DIR)), "Interview Questions and Grading", "questions.csv"
+)
+
+
+def synthetic_scores(embeddings):
+    """Max similarities for on-topic (leave-one-out) and off-topic answers"""
+    num_questions, num_answers, _ = embeddings.shape
+    # sims[q, i, j]: reference i of question q against reference j of question q
+    sims = np.einsum('qid,qjd->qij', embeddings, embeddings)
+    diagonal = np.eye(num_answers, dtype=bool)
+    on_topic = np.where(diagonal, -np.inf, sims).max(axis=2).reshape(-1)
+
+    donors = np.roll(embeddings, -1, axis=0)
+    off_topic = np.einsum('qid,qjd->qij', donors, embeddings).max(axis=2).reshape(-1)
+    return np.concatenate([on_topic, off_topic])
+
+
+def build_index(model_name, backend, questions_df):
+    start = time.perf_counter()
+    model = load_encoder(model_name, backend)
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = ReferenceIndex.build(questions_df, model, f"{model_name}@{backend}", csv_sha256="accuracy-check")
+    encode_seconds = time.perf_counter() - start
+    return index.embeddings, load_seconds, encode_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="torch-int8", choices=[b for b in BACKENDS if b != "torch"])
+    parser.add_argument("--model", default="all-MiniLM-L6-v2", help="model name or local model path")
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS)
+    parser.add_argument("--limit", type=int, default=0, help="only use the first N questions")
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--max-abs-diff", type=float, default=0.05, help="tolerated max similarity drift")
+    parser.add_argument("--max-flip-rate", type=float, default=0.01, help="tolerated share of flipped decisions")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    questions_df = pd.read_csv(args.questions)
+    if args.limit:
+        questions_df = questions_df.head(args.limit)
+
+    base, base_load, base_encode = build_index(args.model, "torch", questions_df)
+    cand, cand_load, cand_encode = build_index(args.model, args.backend, questions_df)
+
+    base_scores = synthetic_scores(base)
+    cand_scores = synthetic_scores(cand)
+    diff = np.abs(base_scores - cand_scores)
+    flips = (base_scores > args.threshold) != (cand_scores > args.threshold)
+
+    report = {
+        "model": args.model,
+        "backend": args.backend,
+        "questions": len(questions_df),
+        "scored_answers": int(base_scores.size),
+        "threshold": args.threshold,
+        "mean_abs_diff": round(float(diff.mean()), 5),
+        "p99_abs_diff": round(float(np.percentile(diff, 99)), 5),
+        "max_abs_diff": round(float(diff.max()), 5),
+        "decision_flips": int(flips.sum()),
+        "flip_rate": round(float(flips.mean()), 5),
+        "fp32_load_s": round(base_load, 3),
+        "fp32_encode_s": round(base_encode, 3),
+        f"{args.backend}_load_s": round(cand_load, 3),
+        f"{args.backend}_encode_s": round(cand_encode, 3),
+    }
+    report["passed"] = report["max_abs_diff"] <= args.max_abs_diff and report["flip_rate"] <= args.max_flip_rate
+
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if not report["passed"]:
+        print(f"❌ {args.backend} drifts beyond tolerance "
+              f"(max diff {args.max_abs_diff}, flip rate {args.max_flip_rate})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
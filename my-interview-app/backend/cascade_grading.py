@@ -0,0 +1,140 @@
+"""
+Two-stage answer grading.
+
+The bi-encoder similarity settles clear passes and clear fails. Only answers
+whose similarity falls within `band` of the correctness threshold are graded
+again by a heavier cross-encoder, which reads the answer and each reference
+answer together. Escalated answers from one scoring call (or one batch) go to
+the cross-encoder in a single predict() call.
+"""
+import re
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+STUB_MODEL = 'stub'
+_WORD = re.compile(r'\w+')
+
+
+class StubCrossEncoder:
+    """
+    Dependency-free stand-in for a CrossEncoder: the F1 overlap of the two
+    texts' word sets. Deterministic and instant, for tests and local runs.
+    """
+
+    max_length = None
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False, **kwargs):
+        scores = np.zeros(len(pairs), dtype=np.float32)
+        for i, (a, b) in enumerate(pairs):
+            words_a = set(_WORD.findall(str(a).lower()))
+            words_b = set(_WORD.findall(str(b).lower()))
+            common = len(words_a & words_b)
+            if common:
+                scores[i] = 2.0 * common / (len(words_a) + len(words_b))
+        return scores
+
+
+def load_cross_encoder(model_name):
+    """CrossEncoder for `model_name`, or the stub for 'stub'"""
+    if model_name == STUB_MODEL:
+        return StubCrossEncoder()
+    from sentence_transformers import CrossEncoder
+    return CrossEncoder(model_name)
+
+
+class CascadeGrader:
+    """
+    Re-grades borderline similarities with a cross-encoder.
+
+    The cross-encoder's score (max over the reference answers) replaces the
+    similarity of escalated answers, and is compared against the same
+    threshold, so it must be on a 0..1 scale. For models with a raw logit
+    head pass `logits=True` and scores go through a sigmoid first. Without
+    it, a batch with scores outside 0..1 keeps its first-stage grades and is
+    counted as `out_of_range` rather than being misread. Stats count how many
+    answers were escalated and how much time the second stage added.
+    """
+
+    def __init__(self, model, threshold=0.5, band=0.1, batch_size=32, logits=False, latency_samples=1000):
+        self.model = model
+        self.threshold = threshold
+        self.band = band
+        self.batch_size = batch_size
+        self.logits = logits
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_samples)
+        self.stats = {'answers': 0, 'escalated': 0, 'flipped': 0, 'out_of_range': 0, 'batches': 0, 'added_s': 0.0}
+
+    def needs_review(self, similarity):
+        return abs(similarity - self.threshold) <= self.band
+
+    def grade(self, items, similarities):
+        """
+        Final (similarity, is_correct) for each (answer, ref_answers) item,
+        given its bi-encoder similarity. Answers without reference texts
+        cannot be escalated and keep their first-stage score.
+        """
+        results = [(float(sim), float(sim) > self.threshold) for sim in similarities]
+        escalated = [
+            i for i, sim in enumerate(similarities)
+            if self.needs_review(sim) and items[i][1]
+        ]
+        with self._lock:
+            self.stats['answers'] += len(results)
+        if not escalated:
+            return results
+
+        pairs, owners = [], []
+        for i in escalated:
+            answer, ref_answers = items[i]
+            for ref in ref_answers:
+                pairs.append(("" if answer is None else str(answer), str(ref)))
+                owners.append(i)
+        start = time.perf_counter()
+        scores = np.asarray(
+            self.model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False), dtype=np.float32
+        )
+        elapsed = time.perf_counter() - start
+        if self.logits:
+            scores = 1.0 / (1.0 + np.exp(-scores))
+        elif scores.size and (scores.min() < -1e-6 or scores.max() > 1 + 1e-6):
+            print(f"⚠️ Cascade scores outside 0..1 ({scores.min():.2f}..{scores.max():.2f}); "
+                  f"set INTERVIEW_CASCADE_LOGITS=1 for logit models. Keeping first-stage grades")
+            with self._lock:
+                self.stats['out_of_range'] += len(escalated)
+                self.stats['batches'] += 1
+                self.stats['added_s'] += elapsed
+                self._latencies.append(elapsed)
+            return results
+
+        best = {}
+        for i, score in zip(owners, scores):
+            best[i] = max(best.get(i, -np.inf), float(score))
+        flipped = 0
+        for i, score in best.items():
+            is_correct = score > self.threshold
+            flipped += is_correct != results[i][1]
+            results[i] = (score, is_correct)
+
+        with self._lock:
+            self.stats['escalated'] += len(best)
+            self.stats['flipped'] += flipped
+            self.stats['batches'] += 1
+            self.stats['added_s'] += elapsed
+            self._latencies.append(elapsed)
+        return results
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            latencies_ms = sorted(t * 1000 for t in self._latencies)
+        stats['added_s'] = round(stats['added_s'], 3)
+        stats['band'] = self.band
+        stats['escalated_pct'] = round(100.0 * stats['escalated'] / stats['answers'], 2) if stats['answers'] else 0.0
+        if latencies_ms:
+            stats['batch_p50_ms'] = round(latencies_ms[len(latencies_ms) // 2], 2)
+            stats['batch_p95_ms'] = round(latencies_ms[min(len(latencies_ms) - 1, int(len(latencies_ms) * 0.95))], 2)
+        return stats
@@ -0,0 +1,177 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+
+def normalize_text(text):
+    """Canonical form used for cache keys: NFC, collapsed whitespace"""
+    text = unicodedata.normalize('NFC', "" if text is None else str(text))
+    return " ".join(text.split())
+
+
+def cache_key(model_name, text):
+    payload = f"{model_name}\0{normalize_text(text)}".encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-tier, content-addressed cache of normalized answer embeddings.
+
+    Tier one is an in-process LRU bounded by entry count and by bytes. Tier two
+    is an optional SQLite file that survives restarts; memory evictions are not
+    written back because every miss is already persisted when it is encoded.
+    Keys hash the model name together with the normalized text, so switching
+    models never returns stale vectors.
+    """
+
+    def __init__(self, model_name, max_entries=10000, max_bytes=64 * 1024 * 1024, db_path=None):
+        self.model_name = model_name
+        self.max_entries = max(int(max_entries), 0)
+        self.max_bytes = max(int(max_bytes), 0)
+        self.db_path = db_path
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+        self._db = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS embeddings '
+                '(key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL)'
+            )
+            self._db.commit()
+
+    def __len__(self):
+        return len(self._entries)
+
+    # ---------- memory tier ----------
+    def _remember(self, key, vector):
+        if self.max_entries == 0 or vector.nbytes > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.nbytes
+        self._entries[key] = vector
+        self._bytes += vector.nbytes
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.stats['evictions'] += 1
+
+    # ---------- disk tier ----------
+    def _load_from_disk(self, keys):
+        if self._db is None or not keys:
+            return {}
+        found = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._db.execute(
+                f'SELECT key, dim, vector FROM embeddings WHERE key IN ({placeholders})', batch
+            ).fetchall()
+            for key, dim, blob in rows:
+                vector = np.frombuffer(blob, dtype=np.float32)
+                if vector.shape[0] == dim:
+                    found[key] = vector
+        return found
+
+    def _store_on_disk(self, items):
+        if self._db is None or not items:
+            return
+        self._db.executemany(
+            'INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)',
+            [(key, int(vector.shape[0]), vector.tobytes()) for key, vector in items],
+        )
+        self._db.commit()
+
+    # ---------- public API ----------
+    def encode(self, texts, encode_fn):
+        """
+        Return a (len(texts), dim) float32 matrix, calling `encode_fn` only for
+        texts missing from both tiers. `encode_fn` must take a list of strings
+        and return normalized embeddings.
+        """
+        keys = [cache_key(self.model_name, text) for text in texts]
+        vectors = [None] * len(texts)
+        missing = []
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    vectors[i] = vector
+                    self.stats['hits'] += 1
+                else:
+                    missing.append(i)
+
+            if missing:
+                on_disk = self._load_from_disk(list({keys[i] for i in missing}))
+                still_missing = []
+                for i in missing:
+                    vector = on_disk.get(keys[i])
+                    if vector is not None:
+                        vectors[i] = vector
+                        self._remember(keys[i], vector)
+                        self.stats['disk_hits'] += 1
+                    else:
+                        still_missing.append(i)
+                missing = still_missing
+
+        if missing:
+            # Encode each distinct missing text once, outside the lock
+            unique = OrderedDict()
+            for i in missing:
+                unique.setdefault(keys[i], texts[i])
+            encoded = np.asarray(encode_fn(list(unique.values())), dtype=np.float32)
+            fresh = {key: np.ascontiguousarray(row) for key, row in zip(unique.keys(), encoded)}
+
+            with self._lock:
+                self.stats['misses'] += len(missing)
+                for key, vector in fresh.items():
+                    self._remember(key, vector)
+                self._store_on_disk(list(fresh.items()))
+            for i in missing:
+                vectors[i] = fresh[keys[i]]
+
+        if not vectors:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(vectors)
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['disk_hits'] + self.stats['misses']
+            stats = dict(self.stats)
+            stats.update({
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hit_rate': round((self.stats['hits'] + self.stats['disk_hits']) / lookups, 4) if lookups else 0.0,
+                'disk_enabled': self._db is not None,
+            })
+            if self._db is not None:
+                stats['disk_entries'] = self._db.execute('SELECT COUNT(*) FROM embeddings').fetchone()[0]
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
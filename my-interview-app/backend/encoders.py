@@ -0,0 +1,54 @@
+"""
+Pluggable encoder backends for answer scoring.
+
+    torch       fp32 PyTorch SentenceTransformer (the original behaviour)
+    torch-int8  same model with every nn.Linear dynamically quantized to int8
+    onnx        ONNX Runtime export of the model (needs sentence-transformers[onnx])
+    onnx-int8   ONNX Runtime with the int8-quantized ONNX weights
+
+All backends return objects with SentenceTransformer's `encode()` signature,
+so the rest of the scoring code does not care which one is loaded.
+"""
+import os
+
+BACKENDS = ('torch', 'torch-int8', 'onnx', 'onnx-int8')
+DEFAULT_BACKEND = 'torch'
+
+# Quantized ONNX file shipped in the sentence-transformers model repos; override
+# for CPUs without AVX512-VNNI (e.g. onnx/model_qint8_avx2.onnx)
+ONNX_INT8_FILE = os.environ.get('INTERVIEW_ONNX_INT8_FILE', 'onnx/model_qint8_avx512_vnni.onnx')
+
+
+def encoder_id(model_name, backend):
+    """Tag used for caches so vectors from different backends never mix"""
+    return model_name if backend == DEFAULT_BACKEND else f"{model_name}@{backend}"
+
+
+def load_encoder(model_name, backend=DEFAULT_BACKEND, num_threads=None):
+    """Load `model_name` with the requested backend"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown encoder backend '{backend}' (expected one of {', '.join(BACKENDS)})")
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+    if backend == 'torch':
+        return SentenceTransformer(model_name)
+
+    if backend == 'torch-int8':
+        model = SentenceTransformer(model_name, device='cpu')
+        model.eval()
+        # Dynamic quantization: int8 weights, activations quantized per batch
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    model_kwargs = {'file_name': ONNX_INT8_FILE} if backend == 'onnx-int8' else None
+    try:
+        return SentenceTransformer(model_name, device='cpu', backend='onnx', model_kwargs=model_kwargs)
+    except (ImportError, TypeError) as e:
+        raise ImportError(
+            f"Encoder backend '{backend}' needs sentence-transformers>=3.2 with ONNX support "
+            f"(pip install 'sentence-transformers[onnx]'): {e}"
+        ) from e
@@ -0,0 +1,61 @@
+"""
+Bring the cached embedding indexes up to date with questions.csv.
+
+Rows are matched to the cached indexes by a content hash of the question text
+and its four reference answers, so after adding or editing a few questions
+only those rows are encoded. Prints what was re-encoded and how long each
+step took, and waits for the on-disk compaction to finish. The keyword search
+index is synced the same way.
+
+    python index_update.py
+    python index_update.py --json update_report.json
+"""
+import argparse
+import json
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--json', help='write the report to this file')
+    args = parser.parse_args()
+
+    from interview_system import InterviewSystem
+    system = InterviewSystem(scoring_socket=None)
+
+    report = {}
+    start = time.perf_counter()
+    bank = system.question_bank
+    report['questions'] = len(bank)
+    report['bank_load_s'] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    system.model
+    report['model_load_s'] = round(time.perf_counter() - start, 3)
+
+    for name in ('reference_index', 'question_index', 'question_search'):
+        start = time.perf_counter()
+        index = system.components[name].get()
+        entry = {'load_s': round(time.perf_counter() - start, 3)}
+        if index.update_stats is not None:
+            entry.update(index.update_stats)
+        else:
+            entry['up_to_date'] = True
+        if index.compaction is not None:
+            start = time.perf_counter()
+            index.compaction.join()
+            entry['compaction_s'] = round(time.perf_counter() - start, 3)
+        report[name] = entry
+
+    start = time.perf_counter()
+    system.components['question_graph'].get_or_none()
+    report['question_graph_s'] = round(time.perf_counter() - start, 3)
+
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
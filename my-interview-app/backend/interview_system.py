@@ -1,11 +1,74 @@
-import pandas as pd
 import random
-from sentence_transformers import SentenceTransformer, util
 import os
+import time
 import csv
+import numpy as np
+from answer_chunking import AnswerChunker
+from question_retrieval import chunk_text, retrieve
+from question_graph import select_diverse
+from bank_registry import BankRegistry
+from batch_scorer import BatchScorer
+from cascade_grading import CascadeGrader, load_cross_encoder
+from embedding_cache import EmbeddingCache
+from lazy_loader import ComponentRegistry
+from reference_index import ANSWER_COLUMNS
+from encoders import encoder_id, load_encoder
+from scoring_worker import ScoringClient, ScoringUnavailable
+
+MODEL_NAME = os.environ.get('INTERVIEW_MODEL_NAME', 'all-MiniLM-L6-v2')
+# One of encoders.BACKENDS: torch, torch-int8, onnx, onnx-int8
+ENCODER_BACKEND = os.environ.get('INTERVIEW_ENCODER_BACKEND', 'torch')
+CORRECT_THRESHOLD = 0.5
+CACHE_DIR = os.environ.get(
+    'INTERVIEW_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+)
+# Micro-batching of concurrent score requests (0 disables it)
+BATCH_WINDOW_MS = float(os.environ.get('INTERVIEW_BATCH_WINDOW_MS', '0'))
+BATCH_MAX_SIZE = int(os.environ.get('INTERVIEW_BATCH_MAX_SIZE', '32'))
+BATCH_TIMEOUT_S = float(os.environ.get('INTERVIEW_BATCH_TIMEOUT_S', '30'))
+# Candidate-answer embedding cache (0 entries disables the memory tier,
+# an empty DB path disables the SQLite tier)
+EMBED_CACHE_ENTRIES = int(os.environ.get('INTERVIEW_EMBED_CACHE_ENTRIES', '10000'))
+EMBED_CACHE_MB = float(os.environ.get('INTERVIEW_EMBED_CACHE_MB', '64'))
+EMBED_CACHE_DB = os.environ.get('INTERVIEW_EMBED_CACHE_DB', '')
+# Out-of-process scoring worker (see scoring_worker.py); empty scores in-process
+SCORING_SOCKET = os.environ.get('INTERVIEW_SCORING_SOCKET', '')
+SCORING_TIMEOUT_S = float(os.environ.get('INTERVIEW_SCORING_TIMEOUT_S', '10'))
+# Long answers are scored as sentence-aligned windows: 'max' or 'mean' of the
+# window scores, or 'off' to let the encoder truncate. Windows default to the
+# model's max sequence length; the token cap bounds the windows per answer
+ANSWER_CHUNKING = os.environ.get('INTERVIEW_ANSWER_CHUNKING', 'max').lower()
+ANSWER_WINDOW_TOKENS = int(os.environ.get('INTERVIEW_ANSWER_WINDOW_TOKENS', '0'))
+ANSWER_MAX_TOKENS = int(os.environ.get('INTERVIEW_ANSWER_MAX_TOKENS', '2048'))
+# Cascade grading: answers whose similarity is within the band of
+# CORRECT_THRESHOLD are re-graded by this cross-encoder ('stub' for a
+# dependency-free test model; empty disables the second stage)
+CASCADE_MODEL = os.environ.get('INTERVIEW_CASCADE_MODEL', '')
+CASCADE_BAND = float(os.environ.get('INTERVIEW_CASCADE_BAND', '0.1'))
+CASCADE_BATCH_SIZE = int(os.environ.get('INTERVIEW_CASCADE_BATCH_SIZE', '32'))
+# Scores are compared to CORRECT_THRESHOLD, so they must be 0..1; set this
+# for models with a raw logit head to put their scores through a sigmoid
+CASCADE_LOGITS = os.environ.get('INTERVIEW_CASCADE_LOGITS', '0').lower() in ('1', 'true', 'yes')
+# Seconds between checks of questions.csv for hot reload (0 disables watching)
+BANK_RELOAD_S = float(os.environ.get('INTERVIEW_BANK_RELOAD_S', '5'))
+# Resume-driven question retrieval
+RETRIEVAL_QUESTIONS = int(os.environ.get('INTERVIEW_RETRIEVAL_QUESTIONS', '15'))
+RETRIEVAL_PER_CHUNK = int(os.environ.get('INTERVIEW_RETRIEVAL_PER_CHUNK', '10'))
+RETRIEVAL_NPROBE = int(os.environ.get('INTERVIEW_RETRIEVAL_NPROBE', '16'))
+# Skip questions this similar to one already picked (uses the cached kNN graph;
+# 0 turns diversity-aware selection off)
+DIVERSITY_THRESHOLD = float(os.environ.get('INTERVIEW_DIVERSITY_THRESHOLD', '0.85'))
+# Extra question banks (one <name>.csv per job family) and the memory budget
+# for the banks loaded at once; 0 never evicts
+BANKS_DIR = os.environ.get('INTERVIEW_BANKS_DIR', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "Interview Questions and Grading", "banks",
+))
+BANK_MEMORY_MB = float(os.environ.get('INTERVIEW_BANK_MEMORY_MB', '1024'))
 
 class InterviewSystem:
-    def __init__(self):
+    def __init__(self, scoring_socket=SCORING_SOCKET):
         # CORRECT path for questions.csv - same as your app.py logic
         BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # backend folder
         PROJECT_ROOT = os.path.dirname(BASE_DIR)  # my-interview-app folder
@@ -16,9 +79,181 @@ class InterviewSystem:
         print(f"Looking for questions at: {questions_path}")
         print(f"Questions file exists: {os.path.exists(questions_path)}")
         
-        self.questions_df = pd.read_csv(questions_path)
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.questions_path = questions_path
+        self.model_name = MODEL_NAME
+        self.encoder_backend = ENCODER_BACKEND
+        # Caches are tagged with the backend too, so int8 vectors never mix with fp32 ones
+        self.encoder_id = encoder_id(self.model_name, self.encoder_backend)
+        self.embedding_cache = EmbeddingCache(
+            self.encoder_id,
+            max_entries=EMBED_CACHE_ENTRIES,
+            max_bytes=int(EMBED_CACHE_MB * 1024 * 1024),
+            db_path=EMBED_CACHE_DB or None,
+        )
+
+        # With a scoring worker the model lives in that process; the local copy
+        # is only loaded if the worker is unreachable and we have to fall back
+        self.scoring_client = None
+        if scoring_socket:
+            self.scoring_client = ScoringClient(scoring_socket, timeout=SCORING_TIMEOUT_S)
+            print(f"✓ Scoring delegated to worker at {scoring_socket}")
+        local_model = self.scoring_client is None
+
+        # Heavy pieces load on first use (or from a warm-up thread) so that
+        # importing this module stays cheap
+        self.components = ComponentRegistry()
+        self.components.add('encoder', self._load_model, required=local_model, warm=local_model)
+        self.components.add('answer_chunker', self._load_answer_chunker, required=False, warm=local_model)
+        self.components.add('cascade_grader', self._load_cascade_grader, required=False,
+                            warm=local_model and bool(CASCADE_MODEL))
+        # Every bank shares the encoder above; questions.csv is the default bank
+        self.banks = BankRegistry(
+            self, questions_path, CACHE_DIR,
+            banks_dir=BANKS_DIR,
+            memory_budget_bytes=int(BANK_MEMORY_MB * 1024 * 1024),
+        )
+        # The default bank's components gate readiness and are warmed up with the encoder
+        for name in ('question_bank', 'reference_index', 'question_index', 'question_graph', 'question_search'):
+            self.components.register(self.banks.default.components[name])
+        if BATCH_WINDOW_MS > 0:
+            self.components.add('batch_scorer', self._load_batch_scorer, required=False)
         print("✓ Interview system initialized successfully!")
+
+    # ---------- lazily loaded components ----------
+    def _load_model(self):
+        print(f"⏳ Loading sentence-transformer '{self.model_name}' ({self.encoder_backend} backend)...")
+        return load_encoder(self.model_name, self.encoder_backend)
+
+    def _load_answer_chunker(self):
+        if ANSWER_CHUNKING == 'off':
+            return None
+        return AnswerChunker.for_model(
+            self.model, window_tokens=ANSWER_WINDOW_TOKENS, max_tokens=ANSWER_MAX_TOKENS, aggregate=ANSWER_CHUNKING
+        )
+
+    def _load_cascade_grader(self):
+        if not CASCADE_MODEL:
+            return None
+        print(f"⏳ Loading cascade grading model '{CASCADE_MODEL}'...")
+        grader = CascadeGrader(
+            load_cross_encoder(CASCADE_MODEL),
+            threshold=CORRECT_THRESHOLD,
+            band=CASCADE_BAND,
+            batch_size=CASCADE_BATCH_SIZE,
+            logits=CASCADE_LOGITS,
+        )
+        print(f"✓ Cascade grading enabled (band ±{CASCADE_BAND:g} around {CORRECT_THRESHOLD:g})")
+        return grader
+
+    def _load_batch_scorer(self):
+        # Reference indexes are passed per request, since they depend on the bank
+        scorer = BatchScorer(
+            self.model,
+            window_ms=BATCH_WINDOW_MS,
+            max_batch=BATCH_MAX_SIZE,
+            threshold=CORRECT_THRESHOLD,
+            encode_fn=self.encode_texts,
+            chunker=self.answer_chunker,
+            cascade=self.cascade_grader,
+        )
+        print(f"✓ Batch scoring enabled ({BATCH_WINDOW_MS:g} ms window, max {BATCH_MAX_SIZE})")
+        return scorer
+
+    # The default bank's pieces, for callers that predate multiple banks
+    @property
+    def question_bank(self):
+        return self.banks.default.question_bank
+
+    @property
+    def model(self):
+        return self.components['encoder'].get()
+
+    @property
+    def reference_index(self):
+        return self.banks.default.reference_index
+
+    @property
+    def question_index(self):
+        return self.banks.default.question_index
+
+    @property
+    def question_graph(self):
+        return self._question_graph(self.banks.default)
+
+    def _question_graph(self, bank):
+        """The bank's similarity graph, or None when diversity is off or it cannot be built"""
+        if DIVERSITY_THRESHOLD <= 0:
+            return None
+        return bank.question_graph
+
+    @property
+    def answer_chunker(self):
+        """AnswerChunker for long answers, or None when chunked scoring is off"""
+        return self.components['answer_chunker'].get()
+
+    @property
+    def cascade_grader(self):
+        """CascadeGrader for borderline answers, or None when the cascade is off or its model fails to load"""
+        if not CASCADE_MODEL:
+            return None
+        return self.components['cascade_grader'].get_or_none()
+
+    @property
+    def batch_scorer(self):
+        if BATCH_WINDOW_MS <= 0:
+            return None
+        return self.components['batch_scorer'].get()
+
+    # ---------- question bank hot reload ----------
+    def reload_question_bank(self, bank=None):
+        """Recompile a bank's CSV and swap it in (see LoadedBank.reload)"""
+        return self.banks.get(bank).reload()
+
+    def start_bank_watcher(self, interval_s):
+        """Poll every loaded bank's CSV every `interval_s` seconds and hot-reload on change"""
+        self.banks.set_reload_interval(interval_s)
+        self.bank_watcher = self.banks.default.watcher
+        return self.bank_watcher
+
+    def get_stats(self):
+        """Scoring counters; never forces a component to load"""
+        stats = {"embedding_cache": self.embedding_cache.get_stats()}
+        if BATCH_WINDOW_MS > 0 and self.components['batch_scorer'].is_ready:
+            stats["batch_scorer"] = dict(self.batch_scorer.stats)
+        if self.components['answer_chunker'].is_ready and self.answer_chunker is not None:
+            stats["answer_chunking"] = self.answer_chunker.get_stats()
+        if CASCADE_MODEL and self.components['cascade_grader'].is_ready and self.cascade_grader is not None:
+            stats["cascade"] = self.cascade_grader.get_stats()
+        if self.scoring_client is not None:
+            stats["scoring_client"] = self.scoring_client.get_stats()
+        stats["question_banks"] = self.banks.status()
+        return stats
+
+    def _encode_uncached(self, texts):
+        return self.model.encode(
+            texts,
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+
+    def encode_texts(self, texts):
+        """Normalized float32 embeddings for `texts`, served from the embedding cache when possible"""
+        return self.embedding_cache.encode(list(texts), self._encode_uncached)
+
+    def _answer_windows(self, answers):
+        """(windows, offsets) of `answers`; one window per answer when chunking is off"""
+        chunker = self.answer_chunker
+        if chunker is None:
+            return list(answers), np.arange(len(answers) + 1)
+        return chunker.windows(answers)
+
+    def _reduce_windows(self, window_scores, offsets):
+        chunker = self.answer_chunker
+        if chunker is None:
+            return np.asarray(window_scores, dtype=np.float32)
+        return chunker.reduce(window_scores, offsets)
         
     def get_categories_from_resume(self):
         """Read categories from categories_output.csv generated by resume scanner"""
@@ -55,31 +290,71 @@ class InterviewSystem:
             print(f"❌ Error reading categories: {e}")
             return ["Python (Programming Language)", "Data Structures and Algorithms (DSA)"]
     
-    def generate_questions(self, questions_per_category=3):
-        """Generate personalized questions based on resume skills"""
+    def generate_questions(self, questions_per_category=3, difficulty=None, resume_text=None, num_questions=None,
+                           bank=None, categories=None):
+        """
+        Generate personalized questions based on resume skills, from the named
+        question `bank` (the default bank if None).
+
+        With `resume_text` the questions are retrieved semantically from the
+        resume itself (see retrieve_questions); otherwise they are sampled from
+        `categories` (the candidate's extracted skills), or, if None, from the
+        categories the resume scanner wrote to categories_output.csv. Either
+        way near-duplicate questions are skipped when the similarity graph is
+        available.
+        """
         print("=== GENERATING QUESTIONS ===")
-        chosen_categories = self.get_categories_from_resume()
-        interview_questions = pd.DataFrame()
+        if resume_text:
+            interview_questions = self.retrieve_questions(
+                resume_text, num_questions or RETRIEVAL_QUESTIONS, difficulty=difficulty, bank=bank
+            )
+            if interview_questions:
+                print(f"✓ Retrieved {len(interview_questions)} questions from resume text")
+                return interview_questions
+            print("⚠️ No questions retrieved from resume text, falling back to categories")
 
-        for cat in chosen_categories:
-            cat_questions = self.questions_df[self.questions_df['Category'] == cat]
-            num_to_pick = min(questions_per_category, len(cat_questions))
-            
-            if num_to_pick > 0:
-                selected = cat_questions.sample(num_to_pick, random_state=42)
-                interview_questions = pd.concat([interview_questions, selected])
-                print(f"✓ Selected {num_to_pick} questions for category: {cat}")
-
-        # Shuffle questions and reset index
-        if not interview_questions.empty:
-            interview_questions = interview_questions.sample(frac=1, random_state=42).reset_index(drop=True)
+        loaded = self.banks.get(bank)
+        chosen_categories = categories if categories is not None else self.get_categories_from_resume()
+        graph = self._question_graph(loaded)
+        if graph is not None:
+            interview_questions = select_diverse(
+                loaded.question_bank, graph, chosen_categories, questions_per_category,
+                DIVERSITY_THRESHOLD, difficulty=difficulty, vectors=loaded.question_vectors(),
+            )
+        else:
+            interview_questions = loaded.question_bank.select(
+                chosen_categories, questions_per_category, difficulty=difficulty
+            )
+
+        if interview_questions:
             print(f"✓ Total questions selected: {len(interview_questions)}")
         else:
             print("❌ No questions selected!")
             
-        return interview_questions.to_dict('records')
+        return interview_questions
     
-    def score_answer(self, user_answer, ref_answers, question=None, category=None):
+    def retrieve_questions(self, resume_text, num_questions, difficulty=None, bank=None):
+        """
+        Questions most relevant to the resume: the text is split into
+        overlapping chunks, encoded in one batch, and each chunk pulls its
+        top matches from the question index.
+        """
+        chunks = chunk_text(resume_text)
+        if not chunks:
+            return []
+        loaded = self.banks.get(bank)
+        questions = loaded.question_bank
+        # Resume chunks are one-off texts; keep them out of the answer embedding cache
+        embeddings = np.asarray(self._encode_uncached(chunks), dtype=np.float32)
+        positions = retrieve(
+            loaded.question_index, questions, embeddings, num_questions,
+            per_chunk=RETRIEVAL_PER_CHUNK, difficulty=difficulty, nprobe=RETRIEVAL_NPROBE,
+            graph=self._question_graph(loaded), threshold=DIVERSITY_THRESHOLD,
+        )
+        return [questions.record(pos) for pos in positions]
+
+    def score_answer(self, user_answer, ref_answers, question=None, category=None, question_id=None, bank=None,
+                     raise_errors=False):
         """
         Score user answer against reference answers.
         
@@ -88,6 +363,11 @@ class InterviewSystem:
             ref_answers: List of reference answers
             question: The question text (optional, for AI grading)
             category: Question category (optional, for AI grading)
+            question_id: `Question Number` of the question (optional); when it is
+                in the reference index only the user answer is encoded
+            bank: Name of the question bank the question came from (default bank if None)
+            raise_errors: Re-raise scoring errors instead of returning (0.0, False),
+                for callers that must not mistake a failure for a score
         
         Returns:
             If AI grading available: (similarity_score, is_correct, ai_feedback)
@@ -98,18 +378,53 @@ class InterviewSystem:
             print(f"User answer length: {len(user_answer)} characters")
             print(f"Reference answers: {len(ref_answers)}")
             
+            if self.scoring_client is not None:
+                try:
+                    max_sim, is_correct = self.scoring_client.score(user_answer, ref_answers, question_id, bank=bank)
+                    print(f"✓ Worker similarity grading: {max_sim:.3f} | Correct: {is_correct}")
+                    return max_sim, is_correct
+                except ScoringUnavailable as e:
+                    print(f"⚠️ Scoring worker unavailable ({e}), scoring in-process")
+
+            if self.batch_scorer is not None:
+                max_sim, is_correct = self.batch_scorer.score(
+                    user_answer, ref_answers, question_id, timeout=BATCH_TIMEOUT_S,
+                    reference_index=self.banks.get(bank).reference_index,
+                )
+                print(f"✓ Batched similarity grading: {max_sim:.3f} | Correct: {is_correct}")
+                return max_sim, is_correct
+
             # Calculate similarity score
-            embeddings = self.model.encode(ref_answers + [user_answer])
-            user_emb = embeddings[-1]
-            ref_embs = embeddings[:-1]
-            
-            sim_scores = [util.cos_sim(user_emb, ref_emb)[0][0].item() for ref_emb in ref_embs]
-            max_sim = max(sim_scores)
+            ref_embs = None
+            if question_id is not None:
+                ref_embs = self.banks.get(bank).reference_index.get(question_id)
+
+            windows, offsets = self._answer_windows([user_answer])
+            if ref_embs is not None:
+                # Reference embeddings are precomputed and normalized
+                window_embs = self.encode_texts(windows)
+            else:
+                embeddings = self.encode_texts(list(ref_answers) + windows)
+                window_embs = embeddings[len(ref_answers):]
+                ref_embs = embeddings[:len(ref_answers)]
+            if len(windows) > 1:
+                print(f"✓ Long answer scored as {len(windows)} windows")
+
+            # Embeddings are normalized, so the dot product is the cosine similarity;
+            # best reference per window, then one score for the answer
+            max_sim = float(self._reduce_windows(np.max(ref_embs @ window_embs.T, axis=0), offsets)[0])
             
             print(f"✓ Similarity score: {max_sim:.3f}")
             
-            # Determine correctness based on similarity threshold
-            is_correct = max_sim > 0.5
+            # Determine correctness based on similarity threshold; borderline
+            # answers go to the cascade model when there is one
+            is_correct = max_sim > CORRECT_THRESHOLD
+            cascade = self.cascade_grader
+            if cascade is not None:
+                escalated = cascade.needs_review(max_sim)
+                (max_sim, is_correct), = cascade.grade([(user_answer, ref_answers)], [max_sim])
+                if escalated:
+                    print(f"✓ Cascade grading: {max_sim:.3f} | Correct: {is_correct}")
             print(f"✓ Similarity grading: {max_sim:.3f} | Correct: {is_correct}")
             
             return max_sim, is_correct
@@ -118,9 +433,106 @@ class InterviewSystem:
             print(f"❌ Error scoring answer: {e}")
             import traceback
             traceback.print_exc()
+            if raise_errors:
+                raise
             return 0.0, False
 
-# Initialize the interview system
-print("🚀 INITIALIZING INTERVIEW SYSTEM...")
-interview_system = InterviewSystem()
-print("🎉 INTERVIEW SYSTEM READY!")
\ No newline at end of file
+    def score_answers_batch(self, pairs, chunk_size=256, threshold=CORRECT_THRESHOLD, bank=None):
+        """
+        Score many (question_id, answer) pairs against the reference index of
+        question `bank` (the default bank if None).
+
+        Pairs are consumed lazily and encoded `chunk_size` at a time; each chunk's
+        similarities come from one matrix operation over the gathered reference
+        embeddings. Yields one result dict per pair, in input order, so callers
+        can stream results without holding the whole batch in memory. A pair may
+        instead be an exception describing a malformed input item; it gets an
+        error row in its place and the rest are still scored.
+        """
+        chunk = []
+        for pair in pairs:
+            chunk.append(pair)
+            if len(chunk) >= chunk_size:
+                yield from self._score_chunk(chunk, threshold, bank)
+                chunk = []
+        if chunk:
+            yield from self._score_chunk(chunk, threshold, bank)
+
+    def _score_chunk(self, chunk, threshold, bank=None):
+        invalid = {i: pair for i, pair in enumerate(chunk) if isinstance(pair, Exception)}
+        if invalid:
+            chunk = [(None, None) if i in invalid else pair for i, pair in enumerate(chunk)]
+        reference_index = self.banks.get(bank).reference_index
+        question_ids = [question_id for question_id, _ in chunk]
+        rows = reference_index.rows_for(question_ids)
+        known = np.flatnonzero(rows >= 0)
+
+        max_sims = np.zeros(len(chunk), dtype=np.float32)
+        if known.size:
+            answers = ["" if chunk[i][1] is None else str(chunk[i][1]) for i in known]
+            windows, offsets = self._answer_windows(answers)
+            window_embs = self.encode_texts(windows)
+            # Reference rows repeated for every window of their answer
+            owners = np.repeat(rows[known], np.diff(offsets))
+            ref_embs = reference_index.embeddings[owners]  # (windows, answers, dim)
+            window_sims = np.einsum('wad,wd->wa', ref_embs, window_embs).max(axis=1)
+            max_sims[known] = self._reduce_windows(window_sims, offsets)
+
+        is_correct = max_sims > threshold
+        cascade = self.cascade_grader
+        if cascade is not None and threshold == cascade.threshold:
+            # All borderline answers of the chunk go to the cascade model
+            # together; only they need their reference texts
+            question_bank = self.banks.get(bank).question_bank
+            items = [
+                (chunk[i][1], self._reference_texts(question_bank, reference_index, rows[i])
+                 if cascade.needs_review(max_sims[i]) else [])
+                for i in known
+            ]
+            graded = cascade.grade(items, [float(max_sims[i]) for i in known])
+            for i, (similarity, correct) in zip(known, graded):
+                max_sims[i], is_correct[i] = similarity, correct
+
+        known_mask = rows >= 0
+        for i, question_id in enumerate(question_ids):
+            if i in invalid:
+                yield {"question_id": None, "error": str(invalid[i])}
+                continue
+            if not known_mask[i]:
+                yield {"question_id": question_id, "error": "Unknown question"}
+                continue
+            similarity = float(max_sims[i])
+            yield {
+                "question_id": question_id,
+                "similarity": similarity,
+                "is_correct": bool(is_correct[i]),
+            }
+
+    @staticmethod
+    def _reference_texts(question_bank, reference_index, row):
+        """
+        Reference answers of reference-index row `row`. Index rows follow the
+        bank's row order; if a hot reload left the two out of step, returns
+        no texts, so the answer keeps its similarity score.
+        """
+        row = int(row)
+        if row >= len(question_bank) or question_bank.value('Question Number', row) != reference_index.question_ids[row]:
+            return []
+        texts = (question_bank.value(name, row) for name in ANSWER_COLUMNS)
+        return [str(text) for text in texts if text is not None and str(text).strip() and str(text) != 'nan']
+
+_shared_system = None
+
+
+def __getattr__(name):
+    # The shared instance is built on first access (`from interview_system
+    # import interview_system`), so CLIs that only need the class or the
+    # settings do not set up a second system on import
+    global _shared_system
+    if name != 'interview_system':
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if _shared_system is None:
+        print("🚀 INITIALIZING INTERVIEW SYSTEM...")
+        _shared_system = InterviewSystem()
+        print("🎉 INTERVIEW SYSTEM READY!")
+    return _shared_system
\ No newline at end of file
@@ -0,0 +1,123 @@
+import threading
+import time
+
+PENDING = 'pending'
+LOADING = 'loading'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class LazyComponent:
+    """
+    A heavy dependency that is loaded on first use, at most once.
+
+    `get()` blocks until the loader has run (in this thread or another) and
+    returns its value, re-raising the loader's exception if it failed. State
+    and load time are kept so a readiness endpoint can report them.
+    """
+
+    def __init__(self, name, loader, required=True, warm=True):
+        self.name = name
+        self.required = required
+        # warm=False components are skipped by the warm-up thread and load on demand only
+        self.warm = warm
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._value = None
+        self._error = None
+        self.state = PENDING
+        self.load_seconds = None
+
+    @property
+    def is_ready(self):
+        return self.state == READY
+
+    def get(self):
+        if self.state == READY:
+            return self._value
+        with self._lock:
+            if self.state == PENDING:
+                self.state = LOADING
+                start = time.perf_counter()
+                try:
+                    self._value = self._loader()
+                    self.state = READY
+                except Exception as e:
+                    self._error = e
+                    self.state = FAILED
+                    print(f"❌ Failed to load {self.name}: {e}")
+                finally:
+                    self.load_seconds = round(time.perf_counter() - start, 3)
+        if self.state == FAILED:
+            raise self._error
+        return self._value
+
+    def replace(self, value):
+        """Atomically swap in a new value (e.g. a hot-reloaded resource)"""
+        with self._lock:
+            self._value = value
+            self._error = None
+            self.state = READY
+
+    def reset(self):
+        """Drop the loaded value so the next get() runs the loader again"""
+        with self._lock:
+            self._value = None
+            self._error = None
+            self.state = PENDING
+            self.load_seconds = None
+
+    def get_or_none(self):
+        """Like get(), but returns None instead of raising when loading failed"""
+        try:
+            return self.get()
+        except Exception:
+            return None
+
+    def status(self):
+        status = {'state': self.state, 'required': self.required}
+        if self.load_seconds is not None:
+            status['load_seconds'] = self.load_seconds
+        if self._error is not None:
+            status['error'] = str(self._error)
+        return status
+
+
+class ComponentRegistry:
+    """Named LazyComponents plus an optional background warm-up thread"""
+
+    def __init__(self):
+        self._components = {}
+        self._warmup_thread = None
+
+    def register(self, component):
+        self._components[component.name] = component
+        return component
+
+    def add(self, name, loader, required=True, warm=True):
+        return self.register(LazyComponent(name, loader, required=required, warm=warm))
+
+    def __getitem__(self, name):
+        return self._components[name]
+
+    def load_all(self):
+        for component in list(self._components.values()):
+            if component.warm:
+                component.get_or_none()
+
+    def warm_up(self, background=True):
+        """Load every component, in a daemon thread unless `background` is False"""
+        if not background:
+            self.load_all()
+            return None
+        if self._warmup_thread is None:
+            self._warmup_thread = threading.Thread(target=self.load_all, name='warm-up', daemon=True)
+            self._warmup_thread.start()
+        return self._warmup_thread
+
+    @property
+    def is_ready(self):
+        return all(c.is_ready for c in self._components.values() if c.required)
+
+    def status(self):
+        return {name: component.status() for name, component in self._components.items()}
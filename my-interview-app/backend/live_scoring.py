@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import OrderedDict
+
+from embedding_cache import normalize_text
+
+
+class _LiveAnswer:
+    __slots__ = ('text', 'scored_text', 'result', 'scored_at', 'scored_tokens')
+
+    def __init__(self):
+        self.text = ''
+        self.scored_text = None
+        self.result = None
+        self.scored_at = 0.0
+        self.scored_tokens = 0
+
+
+class LiveScorer:
+    """
+    Provisional scoring of answers while they are still being dictated.
+
+    Transcript deltas for each (session_id, question_index) are accumulated and
+    re-scored at most every `min_tokens` new words or `min_interval_ms`,
+    whichever comes first. The last provisional result is remembered together
+    with the exact text it was computed for, so a final submit of unchanged
+    text can reuse it instead of encoding again. `score_fn` should raise when
+    scoring fails: a failed score is never remembered, so the submit scores
+    the answer afresh.
+    """
+
+    def __init__(self, score_fn, min_tokens=8, min_interval_ms=750, max_entries=10000):
+        self.score_fn = score_fn
+        self.min_tokens = max(int(min_tokens), 1)
+        self.min_interval = max(min_interval_ms, 0) / 1000.0
+        self.max_entries = max_entries
+        self._answers = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'updates': 0, 'rescored': 0, 'throttled': 0, 'failed': 0, 'submit_hits': 0, 'submit_misses': 0}
+
+    def _entry(self, key):
+        entry = self._answers.get(key)
+        if entry is None:
+            entry = self._answers[key] = _LiveAnswer()
+            while len(self._answers) > self.max_entries:
+                self._answers.popitem(last=False)
+        else:
+            self._answers.move_to_end(key)
+        return entry
+
+    def update(self, session_id, question_index, ref_answers, question_id=None, delta=None, text=None,
+               **score_kwargs):
+        """
+        Apply a transcript update and return the current provisional score.
+
+        Pass either `delta` (appended to what has been received so far) or
+        `text` (the full transcript, replacing it). Extra keyword arguments are
+        passed on to `score_fn`.
+        """
+        key = (session_id, question_index)
+        now = time.monotonic()
+        with self._lock:
+            self.stats['updates'] += 1
+            entry = self._entry(key)
+            if text is not None:
+                entry.text = text
+            elif delta:
+                entry.text += delta
+            current = normalize_text(entry.text)
+            tokens = len(current.split())
+
+            due = current and current != entry.scored_text and (
+                entry.result is None
+                or abs(tokens - entry.scored_tokens) >= self.min_tokens
+                or now - entry.scored_at >= self.min_interval
+            )
+            if not due:
+                if current != entry.scored_text:
+                    self.stats['throttled'] += 1
+                return self._response(entry, tokens, rescored=False)
+
+        # Score outside the lock so other candidates are not serialized behind the encoder
+        try:
+            result = self.score_fn(current, ref_answers, question_id, **score_kwargs)
+        except Exception as e:
+            with self._lock:
+                self.stats['failed'] += 1
+                response = self._response(self._entry(key), tokens, rescored=False)
+            response['error'] = str(e)
+            return response
+
+        with self._lock:
+            self.stats['rescored'] += 1
+            entry = self._entry(key)
+            # Another update may have been scored concurrently; keep whichever started last
+            if now >= entry.scored_at:
+                entry.scored_text = current
+                entry.result = result
+                entry.scored_at = now
+                entry.scored_tokens = tokens
+            return self._response(entry, tokens, rescored=True)
+
+    def _response(self, entry, tokens, rescored):
+        similarity, is_correct = entry.result if entry.result is not None else (None, None)
+        return {
+            'similarity': similarity,
+            'is_correct': is_correct,
+            'provisional': True,
+            'rescored': rescored,
+            'up_to_date': entry.scored_text == normalize_text(entry.text),
+            'tokens': tokens,
+        }
+
+    def take(self, session_id, question_index, final_text):
+        """
+        Forget the live state for a question and return its last score if it was
+        computed for exactly `final_text`, else None.
+        """
+        with self._lock:
+            entry = self._answers.pop((session_id, question_index), None)
+            if entry is not None and entry.result is not None and entry.scored_text == normalize_text(final_text):
+                self.stats['submit_hits'] += 1
+                return entry.result
+            self.stats['submit_misses'] += 1
+            return None
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['active_answers'] = len(self._answers)
+            return stats
@@ -0,0 +1,87 @@
+import random
+
+import numpy as np
+
+QUESTION_COLUMNS = (
+    'Question Number', 'Question', 'Answer1', 'Answer2', 'Answer3', 'Answer4', 'Category', 'Difficulty'
+)
+
+
+class QuestionBank:
+    """
+    In-memory question bank indexed for selection.
+
+    Rows are kept as tuples (far smaller than one dict per row) and turned into
+    plain dicts only for the questions actually picked. Category and
+    (category, difficulty) map to int32 arrays of row positions, built once, so
+    picking k questions costs O(k) no matter how large the bank is.
+    """
+
+    def __init__(self, rows, columns=QUESTION_COLUMNS):
+        self.columns = tuple(columns)
+        self.rows = rows
+        self._category_col = self.columns.index('Category')
+        self._difficulty_col = self.columns.index('Difficulty')
+        self.by_category, self.by_category_difficulty = self._build_index()
+
+    @classmethod
+    def from_dataframe(cls, df):
+        columns = [c for c in QUESTION_COLUMNS if c in df.columns]
+        columns += [c for c in df.columns if c not in columns]
+        # tolist() converts numpy scalars to plain Python values, like to_dict('records')
+        rows = [tuple(row) for row in df[columns].to_numpy(dtype=object).tolist()]
+        return cls(rows, columns)
+
+    def _build_index(self):
+        by_category = {}
+        by_category_difficulty = {}
+        for pos, row in enumerate(self.rows):
+            category = row[self._category_col]
+            difficulty = row[self._difficulty_col]
+            by_category.setdefault(category, []).append(pos)
+            by_category_difficulty.setdefault((category, difficulty), []).append(pos)
+        as_array = lambda positions: np.asarray(positions, dtype=np.int32)  # noqa: E731
+        return (
+            {key: as_array(value) for key, value in by_category.items()},
+            {key: as_array(value) for key, value in by_category_difficulty.items()},
+        )
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def categories(self):
+        return list(self.by_category)
+
+    def record(self, pos):
+        return dict(zip(self.columns, self.rows[pos]))
+
+    def value(self, name, pos):
+        return self.rows[pos][self.columns.index(name)]
+
+    def column(self, name):
+        idx = self.columns.index(name)
+        return [row[idx] for row in self.rows]
+
+    def positions(self, category, difficulty=None):
+        if difficulty is None:
+            return self.by_category.get(category)
+        return self.by_category_difficulty.get((category, difficulty))
+
+    def select(self, categories, per_category, difficulty=None, seed=42):
+        """
+        Pick up to `per_category` random questions from each category and return
+        them shuffled, as plain dicts. A fixed `seed` makes the pick repeatable
+        (as the old `random_state=42` did); pass None for a fresh pick each time.
+        """
+        rng = random.Random(seed)
+        picked = []
+        for category in categories:
+            positions = self.positions(category, difficulty)
+            if positions is None or len(positions) == 0:
+                continue
+            k = min(per_category, len(positions))
+            # random.sample over a range is O(k), independent of the category size
+            picked.extend(int(positions[i]) for i in rng.sample(range(len(positions)), k))
+        rng.shuffle(picked)
+        return [self.record(pos) for pos in picked]
@@ -0,0 +1,245 @@
+"""
+Sparse nearest-neighbour graph over question embeddings, for picking
+interviews without near-duplicate questions.
+
+The graph stores, for every question, its `k` most similar questions and the
+cosine similarities, as two dense (n, k) arrays. It is built offline from the
+question retrieval index and cached next to it:
+
+    python question_graph.py            # build (or verify) the cached graph
+"""
+import argparse
+import json
+import os
+import random
+import time
+
+import numpy as np
+
+from reference_index import _atomic_save_npy, _atomic_write_json
+
+GRAPH_VERSION = 1
+DEFAULT_NEIGHBOURS = 16
+
+
+def _knn_block(queries, query_pos, candidates, candidate_pos, k):
+    """Top-k candidates of each query by dot product, excluding the query itself"""
+    scores = queries @ candidates.T
+    scores[query_pos[:, None] == candidate_pos[None, :]] = -np.inf
+    k = min(k, scores.shape[1])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind='stable')
+    top = np.take_along_axis(top, order, axis=1)
+    return np.take_along_axis(top_scores, order, axis=1), candidate_pos[top]
+
+
+class QuestionGraph:
+    """
+    k-nearest-neighbour lists of every question (by QuestionBank position).
+
+    `neighbours[i]` holds bank positions sorted by decreasing similarity and
+    `similarities[i]` their cosine similarities; unused slots are -1 / -inf.
+    The threshold is applied at selection time, so it can be tuned without
+    rebuilding the graph.
+    """
+
+    def __init__(self, neighbours, similarities, meta):
+        self.neighbours = neighbours
+        self.similarities = similarities
+        self.meta = meta
+
+    def __len__(self):
+        return len(self.neighbours)
+
+    @property
+    def nbytes(self):
+        return self.neighbours.nbytes + self.similarities.nbytes
+
+    def near_duplicates(self, pos, threshold):
+        """Bank positions whose similarity to `pos` is at least `threshold`"""
+        sims = self.similarities[pos]
+        # Rows are sorted, so the qualifying neighbours are a prefix
+        count = int(np.searchsorted(-sims, -threshold, side='right'))
+        return self.neighbours[pos, :count]
+
+    def saturated(self, pos, threshold):
+        """True when all k neighbours of `pos` pass `threshold`, so there may be more"""
+        return bool(self.similarities[pos, -1] >= threshold)
+
+    @classmethod
+    def build(cls, index, k=DEFAULT_NEIGHBOURS, nprobe=8, block=512):
+        """
+        Build from a QuestionIndex. Exact indexes compare every question with
+        every other one, block by block. IVF indexes compare each cluster's
+        members with the members of the `nprobe` clusters nearest to that
+        cluster's centroid, which keeps every product a large BLAS call.
+        """
+        n = len(index)
+        neighbours = np.full((n, k), -1, dtype=np.int32)
+        similarities = np.full((n, k), -np.inf, dtype=np.float32)
+
+        def store(query_pos, sims, pos):
+            width = sims.shape[1]
+            neighbours[query_pos, :width] = pos
+            similarities[query_pos, :width] = sims
+
+        if index.kind == 'exact':
+            embeddings = np.asarray(index.embeddings, dtype=np.float32)
+            all_pos = np.arange(n)
+            for start in range(0, n, block):
+                query_pos = all_pos[start:start + block]
+                store(query_pos, *_knn_block(embeddings[query_pos], query_pos, embeddings, all_pos, k))
+        else:
+            offsets = index.offsets
+            positions = np.asarray(index.positions)
+            nprobe = min(nprobe, len(index.centroids))
+            probes = np.argpartition(-(index.centroids @ index.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+            for c in range(len(index.centroids)):
+                lo, hi = int(offsets[c]), int(offsets[c + 1])
+                if hi == lo:
+                    continue
+                ranges = [(int(offsets[p]), int(offsets[p + 1])) for p in probes[c]]
+                candidates = np.concatenate([index.embeddings[a:b] for a, b in ranges])
+                candidate_pos = np.concatenate([positions[a:b] for a, b in ranges])
+                for start in range(lo, hi, block):
+                    end = min(start + block, hi)
+                    query_pos = positions[start:end]
+                    store(query_pos, *_knn_block(index.embeddings[start:end], query_pos, candidates, candidate_pos, k))
+
+        meta = dict(
+            version=GRAPH_VERSION,
+            model_name=index.meta['model_name'],
+            csv_sha256=index.meta['csv_sha256'],
+            questions=n,
+            k=k,
+            kind=index.kind,
+        )
+        return cls(neighbours, similarities.astype(np.float16), meta)
+
+    # ---------- persistence ----------
+    @staticmethod
+    def paths(cache_dir):
+        return (
+            os.path.join(cache_dir, 'question_graph.neighbours.npy'),
+            os.path.join(cache_dir, 'question_graph.similarities.npy'),
+            os.path.join(cache_dir, 'question_graph.json'),
+        )
+
+    def save(self, cache_dir):
+        os.makedirs(cache_dir, exist_ok=True)
+        neighbours_path, similarities_path, meta_path = self.paths(cache_dir)
+        _atomic_save_npy(neighbours_path, self.neighbours)
+        _atomic_save_npy(similarities_path, self.similarities)
+        _atomic_write_json(meta_path, self.meta)
+
+    @classmethod
+    def load(cls, cache_dir, model_name, csv_sha256):
+        """Memory-map a persisted graph, or return None if it is missing or stale"""
+        neighbours_path, similarities_path, meta_path = cls.paths(cache_dir)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (meta.get('version') != GRAPH_VERSION
+                or meta.get('model_name') != model_name
+                or meta.get('csv_sha256') != csv_sha256):
+            return None
+        try:
+            neighbours = np.load(neighbours_path, mmap_mode='r')
+            similarities = np.load(similarities_path, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        if len(neighbours) != meta.get('questions'):
+            return None
+        return cls(neighbours, similarities, meta)
+
+    @classmethod
+    def load_or_build(cls, index, cache_dir, k=DEFAULT_NEIGHBOURS):
+        graph = cls.load(cache_dir, index.meta['model_name'], index.meta['csv_sha256'])
+        if graph is not None:
+            print(f"✓ Loaded question similarity graph ({len(graph)} questions)")
+            return graph
+
+        print("⏳ Building question similarity graph...")
+        start = time.perf_counter()
+        graph = cls.build(index, k=k)
+        try:
+            graph.save(cache_dir)
+            graph = cls.load(cache_dir, index.meta['model_name'], index.meta['csv_sha256']) or graph
+        except OSError as e:
+            print(f"⚠️ Could not persist question similarity graph: {e}")
+        print(f"✓ Built question similarity graph ({len(graph)} questions) in {time.perf_counter() - start:.1f}s")
+        return graph
+
+
+def select_diverse(bank, graph, categories, per_category, threshold, difficulty=None, seed=42, max_tries=8,
+                   vectors=None):
+    """
+    Like QuestionBank.select, but never picks two questions whose similarity
+    is `threshold` or more. Candidates are drawn at random; every pick blocks
+    its near-duplicates (read from the graph) for the rest of the interview,
+    so the cost is O(picks * k) regardless of the bank size.
+
+    A question whose whole neighbour list passes the threshold may have more
+    near-duplicates than the graph holds; `vectors(positions)`, when given,
+    settles those cases with a direct comparison against the picks so far.
+    """
+    rng = random.Random(seed)
+    blocked = set()
+    chosen = set()
+    picked = []
+    for category in categories:
+        positions = bank.positions(category, difficulty)
+        if positions is None or len(positions) == 0:
+            continue
+        want = min(per_category, len(positions))
+        taken = 0
+        tried = set()
+        # Bounded random probing instead of shuffling the whole category
+        for _ in range(want * max_tries):
+            if taken >= want or len(tried) >= len(positions):
+                break
+            i = rng.randrange(len(positions))
+            if i in tried:
+                continue
+            tried.add(i)
+            pos = int(positions[i])
+            if pos in blocked:
+                continue
+            near = graph.near_duplicates(pos, threshold)
+            # Also check the candidate's own list: a picked question with more
+            # than k near-duplicates cannot have blocked all of them
+            if any(int(p) in chosen for p in near):
+                continue
+            if vectors is not None and picked and graph.saturated(pos, threshold):
+                if np.max(vectors(picked) @ vectors([pos])[0]) >= threshold:
+                    continue
+            picked.append(pos)
+            chosen.add(pos)
+            blocked.add(pos)
+            blocked.update(int(p) for p in near)
+            taken += 1
+    rng.shuffle(picked)
+    return [bank.record(pos) for pos in picked]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threshold', type=float, default=None,
+                        help='also report how many questions have a neighbour at or above this similarity')
+    args = parser.parse_args()
+
+    from interview_system import InterviewSystem
+    system = InterviewSystem(scoring_socket=None)
+    start = time.perf_counter()
+    graph = system.components['question_graph'].get()
+    print(f"Graph ready: {len(graph)} questions, k={graph.meta['k']} in {time.perf_counter() - start:.1f}s")
+    if args.threshold is not None:
+        has_duplicate = np.asarray(graph.similarities[:, 0], dtype=np.float32) >= args.threshold
+        print(f"{int(has_duplicate.sum())} questions have a near-duplicate at >= {args.threshold}")
+
+
+if __name__ == '__main__':
+    main()
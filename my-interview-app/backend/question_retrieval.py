@@ -0,0 +1,347 @@
+import json
+import os
+import time
+
+import numpy as np
+
+from reference_index import (
+    _atomic_save_npy, _atomic_write_json, _save_lock, compact_in_background, delta_plan, row_hashes,
+)
+
+INDEX_VERSION = 1
+# Banks up to this size are searched exactly; larger ones get an IVF index
+EXACT_MAX_QUESTIONS = 50000
+ARRAY_NAMES = ('embeddings', 'positions', 'centroids', 'offsets')
+
+
+def chunk_text(text, words=48, overlap=12, max_chunks=32):
+    """
+    Split free text (a resume) into overlapping word windows. Each window is
+    short enough for the encoder to keep its meaning specific, and the overlap
+    keeps phrases that straddle a boundary intact in one of the two windows.
+    """
+    tokens = (text or '').split()
+    if not tokens:
+        return []
+    step = max(words - overlap, 1)
+    chunks = []
+    for start in range(0, len(tokens), step):
+        chunks.append(' '.join(tokens[start:start + words]))
+        if start + words >= len(tokens) or len(chunks) >= max_chunks:
+            break
+    return chunks
+
+
+def _spherical_kmeans(vectors, nlist, iterations=10, seed=0, batch=4096):
+    """Cluster normalized vectors by cosine similarity; returns (nlist, dim) centroids"""
+    rng = np.random.default_rng(seed)
+    # Training on a sample is enough for list boundaries and keeps builds fast
+    sample_size = min(len(vectors), nlist * 64)
+    sample = np.asarray(vectors[rng.choice(len(vectors), sample_size, replace=False)], dtype=np.float32)
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assign = _nearest_centroid(sample, centroids, batch)
+        order = np.argsort(assign, kind='stable')
+        counts = np.bincount(assign, minlength=nlist)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        nonempty = counts > 0
+        sums = np.add.reduceat(sample[order], starts[nonempty], axis=0)
+        # Empty lists keep their previous centroid
+        centroids[nonempty] = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+    return centroids
+
+
+def _nearest_centroid(vectors, centroids, batch=4096):
+    assign = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), batch):
+        block = np.asarray(vectors[start:start + batch], dtype=np.float32)
+        assign[start:start + batch] = np.argmax(block @ centroids.T, axis=1)
+    return assign
+
+
+def _top_k(scores, k):
+    """Indices of the k largest scores, best first"""
+    k = min(k, scores.shape[-1])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+class QuestionIndex:
+    """
+    Normalized embeddings of every question's text, for retrieving questions
+    that match free text such as a resume.
+
+    Small banks are searched exactly with one matrix product. Banks larger than
+    EXACT_MAX_QUESTIONS get an inverted-file (IVF) index: questions are grouped
+    into ~2*sqrt(n) clusters stored contiguously, and a query only scores the
+    `nprobe` clusters whose centroids are closest to it. Arrays are persisted
+    as .npy files and memory-mapped on load, like the reference index.
+    """
+
+    def __init__(self, arrays, meta):
+        self.embeddings = arrays['embeddings']
+        # Bank position of each embedding row (rows are grouped by cluster for IVF)
+        self.positions = arrays.get('positions')
+        self.centroids = arrays.get('centroids')
+        self.offsets = arrays.get('offsets')
+        self.meta = meta
+        self._row_of = None
+        self.update_stats = None
+        self.compaction = None
+
+    def __len__(self):
+        return len(self.embeddings)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in ARRAY_NAMES if getattr(self, name) is not None)
+
+    @property
+    def kind(self):
+        return self.meta['kind']
+
+    def vectors(self, positions):
+        """Embeddings of the given QuestionBank positions, as float32"""
+        positions = np.asarray(positions, dtype=np.int64)
+        if self.kind == 'exact':
+            return np.asarray(self.embeddings[positions], dtype=np.float32)
+        if self._row_of is None:
+            row_of = np.empty(len(self.positions), dtype=np.int64)
+            row_of[self.positions] = np.arange(len(self.positions))
+            self._row_of = row_of
+        return np.asarray(self.embeddings[self._row_of[positions]], dtype=np.float32)
+
+    @classmethod
+    def from_embeddings(cls, embeddings, model_name, csv_sha256, exact_max=EXACT_MAX_QUESTIONS, seed=0,
+                        centroids=None):
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        n = len(embeddings)
+        meta = {
+            'version': INDEX_VERSION,
+            'model_name': model_name,
+            'csv_sha256': csv_sha256,
+            'questions': n,
+            'dim': int(embeddings.shape[1]) if n else 0,
+            'kind': 'exact',
+        }
+        if n <= exact_max:
+            return cls({'embeddings': embeddings}, meta)
+
+        if centroids is None:
+            nlist = int(min(max(2 * np.sqrt(n), 16), 65535))
+            centroids = _spherical_kmeans(embeddings, nlist, seed=seed)
+        # Reused centroids (delta updates) skip k-means; lists are reassigned below
+        nlist = len(centroids)
+        assign = _nearest_centroid(embeddings, centroids)
+        order = np.argsort(assign, kind='stable')
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(assign, minlength=nlist)))).astype(np.int64)
+        meta.update(kind='ivf', nlist=nlist)
+        # Filled in blocks so the build never holds a second temporary copy
+        stored = np.empty(embeddings.shape, dtype=np.float32)
+        for start in range(0, n, 65536):
+            stored[start:start + 65536] = embeddings[order[start:start + 65536]]
+        arrays = {
+            'embeddings': stored,
+            'positions': order.astype(np.int64),
+            'centroids': centroids,
+            'offsets': offsets,
+        }
+        return cls(arrays, meta)
+
+    @classmethod
+    def build(cls, bank, encode_fn, model_name, csv_sha256, exact_max=EXACT_MAX_QUESTIONS, previous=None):
+        """
+        Encode every question's text. With a `previous` index, rows whose
+        content hash is unchanged reuse their old vectors (and an IVF index
+        keeps its centroids), so only new and edited questions are encoded.
+        """
+        start = time.perf_counter()
+        question_ids = [int(qid) for qid in bank.column('Question Number')]
+        hashes = row_hashes(bank)
+        source_rows, stats = delta_plan(previous.meta if previous else None, question_ids, hashes)
+        todo = np.flatnonzero(source_rows < 0)
+        reused = np.flatnonzero(source_rows >= 0)
+
+        texts = bank.column('Question')
+        encoded = encode_fn(["" if texts[i] is None else str(texts[i]) for i in todo]) if todo.size else None
+        dim = encoded.shape[1] if encoded is not None else (previous.meta['dim'] if previous else 0)
+        embeddings = np.empty((len(question_ids), dim), dtype=np.float32)
+        if encoded is not None:
+            embeddings[todo] = encoded
+        if reused.size:
+            # Old rows are addressed by old bank position, which vectors() resolves
+            embeddings[reused] = previous.vectors(source_rows[reused])
+
+        centroids = None
+        if previous is not None and previous.kind == 'ivf' and len(question_ids) > exact_max:
+            centroids = np.asarray(previous.centroids, dtype=np.float32)
+        index = cls.from_embeddings(embeddings, model_name, csv_sha256, exact_max, centroids=centroids)
+        index.meta['question_ids'] = question_ids
+        index.meta['row_hashes'] = hashes
+        stats['seconds'] = round(time.perf_counter() - start, 3)
+        index.update_stats = stats
+        return index
+
+    # ---------- search ----------
+    def search(self, queries, k=10, nprobe=16):
+        """
+        Top-k questions for each query vector.
+
+        Returns (scores, positions), both shaped (num_queries, k), best first;
+        positions are QuestionBank row positions. Rows are padded with -1 when
+        fewer than k candidates were scored.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        positions = np.full((len(queries), k), -1, dtype=np.int64)
+        if len(self) == 0:
+            return scores, positions
+
+        if self.kind == 'exact':
+            all_scores = queries @ self.embeddings.T
+            for i, row in enumerate(all_scores):
+                top = _top_k(row, k)
+                scores[i, :len(top)] = row[top]
+                positions[i, :len(top)] = top
+            return scores, positions
+
+        nprobe = min(nprobe, len(self.centroids))
+        probes = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        for i, query in enumerate(queries):
+            # Clusters are contiguous row ranges, so each is scored without copying
+            ranges = [(int(self.offsets[c]), int(self.offsets[c + 1])) for c in probes[i]]
+            cand_scores = np.concatenate([self.embeddings[lo:hi] @ query for lo, hi in ranges])
+            cand_rows = np.concatenate([np.arange(lo, hi) for lo, hi in ranges])
+            top = _top_k(cand_scores, k)
+            scores[i, :len(top)] = cand_scores[top]
+            positions[i, :len(top)] = self.positions[cand_rows[top]]
+        return scores, positions
+
+    # ---------- persistence ----------
+    @staticmethod
+    def paths(cache_dir):
+        arrays = {name: os.path.join(cache_dir, f'question_index.{name}.npy') for name in ARRAY_NAMES}
+        return arrays, os.path.join(cache_dir, 'question_index.json')
+
+    def save(self, cache_dir):
+        os.makedirs(cache_dir, exist_ok=True)
+        array_paths, meta_path = self.paths(cache_dir)
+        for name, path in array_paths.items():
+            array = getattr(self, name)
+            if array is not None:
+                _atomic_save_npy(path, array)
+        # Metadata last, as for the reference index
+        _atomic_write_json(meta_path, self.meta)
+
+    @classmethod
+    def load(cls, cache_dir, model_name, csv_sha256):
+        """
+        Memory-map a persisted index, or return None if it is missing or stale.
+        `csv_sha256=None` accepts an index built from any CSV (for delta updates).
+        """
+        array_paths, meta_path = cls.paths(cache_dir)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (meta.get('version') != INDEX_VERSION
+                or meta.get('model_name') != model_name
+                or (csv_sha256 is not None and meta.get('csv_sha256') != csv_sha256)):
+            return None
+
+        names = ('embeddings',) if meta.get('kind') == 'exact' else ARRAY_NAMES
+        try:
+            arrays = {name: np.load(array_paths[name], mmap_mode='r') for name in names}
+        except (OSError, ValueError):
+            return None
+        if arrays['embeddings'].shape[0] != meta.get('questions'):
+            return None
+        return cls(arrays, meta)
+
+    @classmethod
+    def load_or_build(cls, bank, encode_fn, model_name, cache_dir):
+        index = cls.load(cache_dir, model_name, bank.csv_sha256)
+        if index is not None:
+            print(f"✓ Loaded question retrieval index ({len(index)} questions, {index.kind})")
+            return index
+
+        previous = cls.load(cache_dir, model_name, None)
+        if previous is not None and previous.meta.get('row_hashes'):
+            index = cls.build(bank, encode_fn, model_name, bank.csv_sha256, previous=previous)
+            stats = index.update_stats
+            print(f"✓ Updated question retrieval index: {stats['encoded']} rows re-encoded "
+                  f"({stats['added']} added, {stats['changed']} changed, {stats['removed']} removed), "
+                  f"{stats['reused']} reused in {stats['seconds']:.2f}s")
+            index.compaction = compact_in_background(index, cache_dir, 'question retrieval index')
+            return index
+
+        print("⏳ Building question retrieval index...")
+        index = cls.build(bank, encode_fn, model_name, bank.csv_sha256)
+        try:
+            with _save_lock:
+                index.save(cache_dir)
+            stats = index.update_stats
+            index = cls.load(cache_dir, model_name, bank.csv_sha256) or index
+            index.update_stats = stats
+        except OSError as e:
+            print(f"⚠️ Could not persist question retrieval index: {e}")
+        print(f"✓ Built question retrieval index ({len(index)} questions, {index.kind})")
+        return index
+
+
+def retrieve(index, bank, chunk_embeddings, num_questions, per_chunk=10, difficulty=None, nprobe=16,
+             graph=None, threshold=None):
+    """
+    Pick up to `num_questions` bank positions relevant to a resume.
+
+    Every chunk contributes its top `per_chunk` questions; a question found by
+    several chunks keeps its best score. Chunks are then drained round-robin
+    by rank, so one dominant section of the resume cannot crowd out the rest.
+    With a QuestionGraph, near-duplicates of questions already picked are skipped.
+    """
+    if len(chunk_embeddings) == 0 or num_questions <= 0:
+        return []
+    # A short resume (few chunks) still has to fill the interview
+    per_chunk = max(per_chunk, -(-num_questions // len(chunk_embeddings)))
+    # Difficulty and near-duplicates are filtered after the search, so over-fetch to compensate
+    k = per_chunk * (3 if difficulty else 1)
+    if graph is not None:
+        per_chunk *= 2
+        k *= 2
+    scores, positions = index.search(chunk_embeddings, k=k, nprobe=nprobe)
+
+    best = {}
+    ranked = []
+    for row_scores, row_positions in zip(scores, positions):
+        kept = []
+        for score, pos in zip(row_scores, row_positions):
+            pos = int(pos)
+            if pos < 0:
+                continue
+            if difficulty and bank.value('Difficulty', pos) != difficulty:
+                continue
+            best[pos] = max(best.get(pos, -np.inf), float(score))
+            kept.append(pos)
+        ranked.append(kept[:per_chunk])
+
+    picked, seen = [], set()
+    for rank in range(per_chunk):
+        # Within one round, stronger matches go first
+        round_positions = sorted(
+            {r[rank] for r in ranked if rank < len(r)} - seen, key=lambda p: -best[p]
+        )
+        for pos in round_positions:
+            if pos in seen:
+                continue
+            picked.append(pos)
+            seen.add(pos)
+            if graph is not None:
+                seen.update(int(p) for p in graph.near_duplicates(pos, threshold))
+            if len(picked) >= num_questions:
+                return picked
+    return picked
@@ -0,0 +1,394 @@
+"""
+Keyword search over a question bank, for curating banks.
+
+The bank is mirrored into a SQLite database with an FTS5 inverted index over
+the question and answer text; results are ranked with BM25 (question text
+weighs most) and can be filtered by category and difficulty. The filters are
+indexed as tokens too, so FTS5 intersects them with the text match instead of
+SQLite checking every match. Rows are keyed by a content hash, so when the CSV
+changes only added and removed rows are written to the index.
+
+    python question_search.py "docker volumes" --category DevOps --difficulty Easy
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import weakref
+from collections import defaultdict
+from contextlib import contextmanager
+
+SEARCH_VERSION = 1
+MAX_PER_PAGE = 100
+# BM25 scores every match (about 1 µs each), so queries matching more rows
+# than this are listed in bank order instead, flagged as unranked
+RANK_LIMIT = 20000
+# bm25() weights, in FTS column order: question, answer1-4, facets
+RANK_WEIGHTS = (10.0, 1.0, 1.0, 1.0, 1.0, 0.0)
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+# Words nearly every question contains: they cost a walk over almost the whole
+# index and add nothing to BM25, so they are dropped unless nothing else is left
+STOP_WORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does', 'for', 'from', 'how', 'in',
+    'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'what', 'when', 'where', 'which',
+    'who', 'why', 'with', 'you', 'your',
+))
+
+FIELDS = (
+    ('question_number', 'Question Number'),
+    ('question', 'Question'),
+    ('answer1', 'Answer1'),
+    ('answer2', 'Answer2'),
+    ('answer3', 'Answer3'),
+    ('answer4', 'Answer4'),
+    ('category', 'Category'),
+    ('difficulty', 'Difficulty'),
+)
+# Indexed columns; `facets` holds one token per filterable value
+FTS_COLUMNS = ('question', 'answer1', 'answer2', 'answer3', 'answer4', 'facets')
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    row_hash TEXT NOT NULL,
+    {', '.join(f'{name} TEXT' if name != 'question_number' else f'{name} INTEGER' for name, _ in FIELDS)},
+    facets TEXT
+);
+CREATE INDEX IF NOT EXISTS questions_filter ON questions (category, difficulty, question_number);
+CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+    {', '.join(FTS_COLUMNS)},
+    content='questions', content_rowid='id',
+    tokenize='porter unicode61 remove_diacritics 2'
+);
+"""
+
+
+def _row_hash(values):
+    return hashlib.blake2b(
+        '\x1f'.join('' if v is None else str(v) for v in values).encode('utf-8'), digest_size=8
+    ).hexdigest()
+
+
+def facet_token(category=None, difficulty=None):
+    """
+    Single alphanumeric token standing for a category and/or difficulty
+    filter. Each row carries the category, difficulty and combined tokens, so
+    any filter is one phrase in the FTS5 query.
+    """
+    key = f'{category!r}\x1f{difficulty!r}'.encode('utf-8')
+    return 'f' + hashlib.blake2b(key, digest_size=6).hexdigest()
+
+
+def match_expression(text):
+    """
+    Turn free text into an FTS5 query: every word must match, the last one as
+    a prefix (so partially typed words still find results). Words are quoted,
+    so FTS5 operators in the input are searched for literally.
+    """
+    tokens = _TOKEN.findall(text or '')
+    tokens = [token for token in tokens if token.lower() not in STOP_WORDS] or tokens
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+class _Reader:
+    # sqlite3 connections cannot be weakly referenced; this holder can, so the
+    # index can close every thread's connection without keeping dead threads' alive.
+    # `lock` is held for the whole of each query, so close() never pulls the
+    # connection out from under a search running on another thread
+    __slots__ = ('db', 'generation', 'lock', '__weakref__')
+
+    def __init__(self, db, generation):
+        self.db = db
+        self.generation = generation
+        self.lock = threading.Lock()
+
+    def close(self):
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+
+
+class QuestionSearchIndex:
+    """
+    SQLite FTS5 index of one question bank.
+
+    Searches run on per-thread read connections; `sync()` writes through a
+    single connection in one transaction, and the database is in WAL mode, so
+    searches keep answering from the previous version while a sync runs.
+    After a sync each thread reopens its read connection on its next search;
+    `close()` closes all of them once their running queries finish (the index
+    reopens them if used again).
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.update_stats = None
+        self.compaction = None
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._readers_lock = threading.Lock()
+        self._readers = weakref.WeakSet()
+        self._generation = 0
+        db = sqlite3.connect(db_path)
+        try:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.executescript(SCHEMA)
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def path(cache_dir):
+        return os.path.join(cache_dir, 'question_search.sqlite')
+
+    def _open_reader(self):
+        # Closed from close() on another thread, never used by two at once
+        db = sqlite3.connect(f'file:{self.db_path}?mode=ro', uri=True, check_same_thread=False)
+        with self._readers_lock:
+            reader = _Reader(db, self._generation)
+            self._readers.add(reader)
+        self._local.reader = reader
+        return reader
+
+    @contextmanager
+    def _reading(self):
+        """This thread's read connection, held for the duration of the block"""
+        while True:
+            reader = getattr(self._local, 'reader', None)
+            if reader is None or reader.generation != self._generation:
+                if reader is not None:
+                    reader.close()
+                reader = self._open_reader()
+            with reader.lock:
+                # close() may have got the lock first; then open a new one
+                if reader.db is not None:
+                    yield reader.db
+                    return
+
+    def meta(self):
+        with self._reading() as db:
+            return dict(db.execute('SELECT key, value FROM meta'))
+
+    def __len__(self):
+        with self._reading() as db:
+            return db.execute('SELECT count(*) FROM questions').fetchone()[0]
+
+    # ---------- building ----------
+    def sync(self, bank, csv_sha256=None):
+        """
+        Make the index hold exactly the rows of `bank`. Rows whose content is
+        unchanged are kept; only added rows are inserted and removed rows
+        deleted. Returns stats like ReferenceIndex.update_stats.
+        """
+        start = time.perf_counter()
+        columns = [bank.column(column) for _, column in FIELDS]
+        rows = [tuple(values) for values in zip(*columns)]
+        hashes = [_row_hash(row) for row in rows]
+
+        with self._write_lock:
+            db = sqlite3.connect(self.db_path)
+            try:
+                existing = defaultdict(list)
+                for row_id, row_hash in db.execute('SELECT id, row_hash FROM questions'):
+                    existing[row_hash].append(row_id)
+                # Multiset difference: identical rows may appear more than once
+                added = []
+                for row, row_hash in zip(rows, hashes):
+                    ids = existing.get(row_hash)
+                    if ids:
+                        ids.pop()
+                    else:
+                        category, difficulty = row[-2], row[-1]
+                        facets = ' '.join((
+                            facet_token(category), facet_token(difficulty=difficulty),
+                            facet_token(category, difficulty),
+                        ))
+                        added.append((row_hash,) + row + (facets,))
+                removed = [(row_id,) for ids in existing.values() for row_id in ids]
+
+                with db:
+                    # External-content FTS5 deletes need the old values, so
+                    # drop the FTS entries before the rows they came from
+                    db.executemany(
+                        f"INSERT INTO questions_fts (questions_fts, rowid, {', '.join(FTS_COLUMNS)}) "
+                        f"SELECT 'delete', id, {', '.join(FTS_COLUMNS)} FROM questions WHERE id = ?",
+                        removed,
+                    )
+                    db.executemany('DELETE FROM questions WHERE id = ?', removed)
+                    # New rows get ids above every existing one, so the FTS
+                    # entries can be added with one INSERT ... SELECT
+                    first_new = db.execute('SELECT coalesce(max(id), 0) + 1 FROM questions').fetchone()[0]
+                    names = ['row_hash'] + [name for name, _ in FIELDS] + ['facets']
+                    db.executemany(
+                        f"INSERT INTO questions ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})", added
+                    )
+                    db.execute(
+                        f"INSERT INTO questions_fts (rowid, {', '.join(FTS_COLUMNS)}) "
+                        f"SELECT id, {', '.join(FTS_COLUMNS)} FROM questions WHERE id >= ?",
+                        (first_new,),
+                    )
+                    if len(added) > len(rows) // 2:
+                        # Mostly rebuilt: merge the FTS segments for faster queries
+                        db.execute("INSERT INTO questions_fts (questions_fts) VALUES ('optimize')")
+                    db.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', [
+                        ('version', str(SEARCH_VERSION)),
+                        ('csv_sha256', csv_sha256 or ''),
+                        ('rows', str(len(rows))),
+                    ])
+            finally:
+                db.close()
+        with self._readers_lock:
+            # Readers switch to a fresh connection on their next search
+            self._generation += 1
+
+        self.update_stats = {
+            'rows': len(rows),
+            'reused': len(rows) - len(added),
+            'added': len(added),
+            'removed': len(removed),
+            'seconds': round(time.perf_counter() - start, 3),
+        }
+        return self.update_stats
+
+    @classmethod
+    def load_or_build(cls, bank, cache_dir):
+        """Open the bank's search index, bringing it up to date with the bank first"""
+        os.makedirs(cache_dir, exist_ok=True)
+        index = cls(cls.path(cache_dir))
+        csv_sha256 = getattr(bank, 'csv_sha256', None)
+        meta = index.meta()
+        # The loading thread's connection is not needed for searches
+        index.close()
+        if (csv_sha256 and meta.get('csv_sha256') == csv_sha256
+                and meta.get('version') == str(SEARCH_VERSION)):
+            print(f"✓ Loaded question search index ({meta.get('rows')} questions)")
+            return index
+
+        print("⏳ Updating question search index...")
+        stats = index.sync(bank, csv_sha256)
+        print(f"✓ Question search index ready ({stats['rows']} questions, {stats['added']} added, "
+              f"{stats['removed']} removed) in {stats['seconds']:.1f}s")
+        return index
+
+    # ---------- querying ----------
+    def search(self, text=None, category=None, difficulty=None, page=1, per_page=20, rank_limit=RANK_LIMIT):
+        """
+        Questions matching every word of `text`, filtered by exact category and
+        difficulty. Returns (results, total, ranked): results are ordered best
+        BM25 match first when `ranked`, and in bank order when there is no text
+        or the text matches more than `rank_limit` questions.
+        """
+        page = max(1, int(page))
+        per_page = max(1, min(int(per_page), MAX_PER_PAGE))
+        offset = (page - 1) * per_page
+        with self._reading() as db:
+            return self._search(db, text, category, difficulty, offset, per_page, rank_limit)
+
+    def _search(self, db, text, category, difficulty, offset, per_page, rank_limit):
+        if not (text and text.strip()):
+            where, params = [], []
+            if category:
+                where.append('category = ?')
+                params.append(category)
+            if difficulty:
+                where.append('difficulty = ?')
+                params.append(difficulty)
+            condition = f"WHERE {' AND '.join(where)}" if where else ''
+            total = db.execute(f'SELECT count(*) FROM questions {condition}', params).fetchone()[0]
+            ids = db.execute(
+                f'SELECT id, NULL FROM questions {condition} ORDER BY question_number LIMIT ? OFFSET ?',
+                params + [per_page, offset],
+            ).fetchall()
+            return self._fetch(db, ids), total, False
+
+        expression = match_expression(text)
+        if expression is None:
+            return [], 0, False
+        if category or difficulty:
+            expression += f' AND facets : {facet_token(category or None, difficulty or None)}'
+
+        # Counting walks the posting lists only, which is cheap next to BM25
+        total = db.execute('SELECT count(*) FROM questions_fts WHERE questions_fts MATCH ?',
+                           (expression,)).fetchone()[0]
+        ranked = total <= rank_limit
+        if ranked:
+            ids = db.execute(
+                f"SELECT rowid, bm25(questions_fts, {', '.join(map(str, RANK_WEIGHTS))}) AS score "
+                f"FROM questions_fts WHERE questions_fts MATCH ? ORDER BY score LIMIT ? OFFSET ?",
+                (expression, per_page, offset),
+            ).fetchall()
+        else:
+            # Rowid order streams straight from the index and stops at the page
+            ids = db.execute(
+                'SELECT rowid, NULL FROM questions_fts WHERE questions_fts MATCH ? ORDER BY rowid LIMIT ? OFFSET ?',
+                (expression, per_page, offset),
+            ).fetchall()
+        return self._fetch(db, ids), total, ranked
+
+    @staticmethod
+    def _fetch(db, ids):
+        """Rows for the (id, bm25 score or None) pairs of one page, in order"""
+        if not ids:
+            return []
+        columns = ', '.join(name for name, _ in FIELDS)
+        rows = {
+            row[0]: row[1:]
+            for row in db.execute(
+                f"SELECT id, {columns} FROM questions WHERE id IN ({', '.join('?' * len(ids))})",
+                [row_id for row_id, _ in ids],
+            )
+        }
+        results = []
+        for row_id, score in ids:
+            result = {column: value for (_, column), value in zip(FIELDS, rows[row_id])}
+            if score is not None:
+                # bm25() is lower-is-better; flip it so higher scores rank first
+                result['score'] = round(-score, 4)
+            results.append(result)
+        return results
+
+    def close(self):
+        """Close every thread's read connection, waiting for queries running on them"""
+        with self._readers_lock:
+            self._generation += 1
+            readers = list(self._readers)
+            self._readers.clear()
+        for reader in readers:
+            reader.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('query', nargs='?', default='')
+    parser.add_argument('--category')
+    parser.add_argument('--difficulty')
+    parser.add_argument('--bank', help='question bank name (default bank if omitted)')
+    parser.add_argument('--page', type=int, default=1)
+    parser.add_argument('--per-page', type=int, default=10)
+    args = parser.parse_args()
+
+    from interview_system import InterviewSystem
+    system = InterviewSystem(scoring_socket=None)
+    index = system.banks.get(args.bank).question_search
+    start = time.perf_counter()
+    results, total, ranked = index.search(args.query, args.category, args.difficulty, args.page, args.per_page)
+    print(json.dumps({
+        'total': total,
+        'ranked': ranked,
+        'took_ms': round((time.perf_counter() - start) * 1000, 2),
+        'results': results,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
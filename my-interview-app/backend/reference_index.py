@@ -0,0 +1,285 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+ANSWER_COLUMNS = ['Answer1', 'Answer2', 'Answer3', 'Answer4']
+INDEX_VERSION = 1
+# Serializes background writes of the on-disk indexes
+_save_lock = threading.Lock()
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Return the hex SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _atomic_write_json(path, payload):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+def _atomic_save_npy(path, array):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def _column(questions, name):
+    if hasattr(questions, 'column'):
+        return questions.column(name)
+    return questions[name].fillna('').tolist() if name != 'Question Number' else questions[name].tolist()
+
+
+def row_hashes(questions):
+    """Short content hash of each row's question text and reference answers"""
+    columns = [_column(questions, name) for name in ['Question'] + ANSWER_COLUMNS]
+    return [
+        hashlib.blake2b(
+            '\x1f'.join('' if v is None else str(v) for v in values).encode('utf-8'), digest_size=8
+        ).hexdigest()
+        for values in zip(*columns)
+    ]
+
+
+def delta_plan(previous_meta, question_ids, hashes):
+    """
+    Match rows of a new bank against a persisted index by content hash.
+
+    Returns (source_rows, stats): `source_rows[i]` is the previous index row
+    whose content is identical to new row i, or -1 if row i must be encoded.
+    Stats count added, changed, removed and reused rows.
+    """
+    old_hashes = (previous_meta or {}).get('row_hashes') or []
+    old_ids = (previous_meta or {}).get('question_ids') or []
+    row_of_hash = {h: row for row, h in enumerate(old_hashes)}
+    source_rows = np.fromiter((row_of_hash.get(h, -1) for h in hashes), dtype=np.int64, count=len(hashes))
+
+    old_id_set = set(old_ids)
+    new_id_set = set(question_ids)
+    encoded = [qid for qid, row in zip(question_ids, source_rows) if row < 0]
+    stats = {
+        'rows': len(hashes),
+        'reused': int((source_rows >= 0).sum()),
+        'encoded': len(encoded),
+        'added': sum(1 for qid in encoded if qid not in old_id_set),
+        'changed': sum(1 for qid in encoded if qid in old_id_set),
+        'removed': len(old_id_set - new_id_set),
+    }
+    return source_rows, stats
+
+
+def compact_in_background(index, cache_dir, name):
+    """
+    Write a delta-updated index to disk from a background thread, so the new
+    index serves from memory right away. The thread is non-daemon: a process
+    that exits early still finishes the write.
+    """
+    def run():
+        start = time.perf_counter()
+        try:
+            with _save_lock:
+                index.save(cache_dir)
+            print(f"✓ Compacted {name} on disk in {time.perf_counter() - start:.2f}s")
+        except OSError as e:
+            print(f"⚠️ Could not persist {name}: {e}")
+
+    thread = threading.Thread(target=run, name=f'compact-{name}')
+    thread.start()
+    return thread
+
+
+class ReferenceIndex:
+    """
+    Normalized float32 embeddings of every question's reference answers.
+
+    The matrix has shape (num_questions, len(ANSWER_COLUMNS), dim) and is keyed
+    by `Question Number`. It is persisted next to a small JSON file holding the
+    CSV content hash and model name, and is memory-mapped on load so that every
+    worker process shares the same pages.
+    """
+
+    def __init__(self, question_ids, embeddings, meta):
+        self.question_ids = [int(qid) for qid in question_ids]
+        self.embeddings = embeddings
+        self.meta = meta
+        self._row_of = {qid: row for row, qid in enumerate(self.question_ids)}
+        # Set when the index was delta-updated rather than loaded
+        self.update_stats = None
+        self.compaction = None
+
+    def __len__(self):
+        return len(self.question_ids)
+
+    @property
+    def nbytes(self):
+        return self.embeddings.nbytes
+
+    def __contains__(self, question_id):
+        return self._key(question_id) in self._row_of
+
+    @staticmethod
+    def _key(question_id):
+        try:
+            return int(question_id)
+        except (TypeError, ValueError):
+            return None
+
+    def get(self, question_id):
+        """Return the (num_answers, dim) reference matrix for a question, or None"""
+        row = self._row_of.get(self._key(question_id))
+        if row is None:
+            return None
+        return self.embeddings[row]
+
+    def rows_for(self, question_ids):
+        """Map question ids to matrix rows; unknown ids map to -1"""
+        return np.fromiter(
+            (self._row_of.get(self._key(qid), -1) for qid in question_ids),
+            dtype=np.int64,
+            count=len(question_ids),
+        )
+
+    # ---------- persistence ----------
+    @staticmethod
+    def paths(cache_dir):
+        return (
+            os.path.join(cache_dir, 'reference_index.npy'),
+            os.path.join(cache_dir, 'reference_index.json'),
+        )
+
+    @classmethod
+    def build(cls, questions, model, model_name, csv_sha256, previous=None):
+        """
+        Encode all reference answers in one batched pass. `questions` is a
+        DataFrame or a QuestionBank (anything with a `column(name)` method).
+
+        With a `previous` index (same model, older CSV), rows whose content
+        hash is unchanged are copied over and only the rest are encoded.
+        """
+        start = time.perf_counter()
+        question_ids = [int(qid) for qid in _column(questions, 'Question Number')]
+        hashes = row_hashes(questions)
+        source_rows, stats = delta_plan(previous.meta if previous else None, question_ids, hashes)
+        todo = np.flatnonzero(source_rows < 0)
+
+        answers = np.array(
+            [["" if v is None else str(v) for v in _column(questions, col)] for col in ANSWER_COLUMNS],
+            dtype=object,
+        ).T
+        num_questions, num_answers = answers.shape
+
+        encoded = None
+        if todo.size:
+            flat = model.encode(
+                answers[todo].reshape(-1).tolist(),
+                batch_size=64,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+            encoded = flat.reshape(todo.size, num_answers, -1)
+        dim = encoded.shape[-1] if encoded is not None else (previous.meta['dim'] if previous else 0)
+
+        embeddings = np.empty((num_questions, num_answers, dim), dtype=np.float32)
+        if encoded is not None:
+            embeddings[todo] = encoded
+        reused = np.flatnonzero(source_rows >= 0)
+        if reused.size:
+            embeddings[reused] = previous.embeddings[source_rows[reused]]
+
+        meta = {
+            'version': INDEX_VERSION,
+            'model_name': model_name,
+            'csv_sha256': csv_sha256,
+            'dim': int(dim),
+            'question_ids': question_ids,
+            'row_hashes': hashes,
+        }
+        index = cls(question_ids, embeddings, meta)
+        stats['seconds'] = round(time.perf_counter() - start, 3)
+        index.update_stats = stats
+        return index
+
+    def save(self, cache_dir):
+        os.makedirs(cache_dir, exist_ok=True)
+        npy_path, meta_path = self.paths(cache_dir)
+        # Matrix first, metadata last: a crash in between leaves stale metadata
+        # that fails the hash check instead of a half-written index that passes it
+        _atomic_save_npy(npy_path, self.embeddings)
+        _atomic_write_json(meta_path, self.meta)
+
+    @classmethod
+    def load(cls, cache_dir, model_name, csv_sha256):
+        """
+        Memory-map a persisted index, or return None if it is missing or stale.
+        `csv_sha256=None` accepts an index built from any CSV (for delta updates).
+        """
+        npy_path, meta_path = cls.paths(cache_dir)
+        if not (os.path.exists(npy_path) and os.path.exists(meta_path)):
+            return None
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (meta.get('version') != INDEX_VERSION
+                or meta.get('model_name') != model_name
+                or (csv_sha256 is not None and meta.get('csv_sha256') != csv_sha256)):
+            return None
+
+        try:
+            embeddings = np.load(npy_path, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+
+        if embeddings.shape[0] != len(meta.get('question_ids', [])):
+            return None
+
+        return cls(meta['question_ids'], embeddings, meta)
+
+    @classmethod
+    def load_or_build(cls, csv_path, questions, model, model_name, cache_dir, csv_sha256=None):
+        """Reuse the on-disk index when the CSV and model match, rebuild otherwise"""
+        csv_sha256 = csv_sha256 or file_sha256(csv_path)
+
+        index = cls.load(cache_dir, model_name, csv_sha256)
+        if index is not None:
+            print(f"✓ Loaded reference index ({len(index)} questions) from {cache_dir}")
+            return index
+
+        previous = cls.load(cache_dir, model_name, None)
+        if previous is not None and previous.meta.get('row_hashes'):
+            index = cls.build(questions, model, model_name, csv_sha256, previous=previous)
+            stats = index.update_stats
+            print(f"✓ Updated reference index: {stats['encoded']} rows re-encoded "
+                  f"({stats['added']} added, {stats['changed']} changed, {stats['removed']} removed), "
+                  f"{stats['reused']} reused in {stats['seconds']:.2f}s")
+            index.compaction = compact_in_background(index, cache_dir, 'reference index')
+            return index
+
+        print("⏳ Building reference answer index...")
+        index = cls.build(questions, model, model_name, csv_sha256)
+        try:
+            with _save_lock:
+                index.save(cache_dir)
+            # Reopen memory-mapped so the in-process copy is the shared one
+            stats = index.update_stats
+            index = cls.load(cache_dir, model_name, csv_sha256) or index
+            index.update_stats = stats
+        except OSError as e:
+            print(f"⚠️ Could not persist reference index: {e}")
+        print(f"✓ Built reference index ({len(index)} questions)")
+        return index
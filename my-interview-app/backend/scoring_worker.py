@@ -0,0 +1,276 @@
+"""
+Out-of-process scoring worker.
+
+One server process holds the encoder, reference index and embedding cache, and
+every API process talks to it over a local socket instead of loading its own
+copy of the model. Inside the server a small pool of BatchScorers shares that
+single model; `--threads` caps torch's intra-op threads so the pool does not
+oversubscribe the cores it runs on.
+
+    python scoring_worker.py --workers 2 --threads 2
+
+API processes opt in with INTERVIEW_SCORING_SOCKET set to the socket path the
+worker prints. Messages are pickled, so only the worker's own user may
+connect. By default the socket lives in a private (0700) directory and is
+itself 0600. Connections must also present a shared key: either
+INTERVIEW_SCORING_AUTHKEY, set for the worker and every API process, or the
+random key the worker writes to `<socket>.key` (mode 0600) at startup.
+"""
+import argparse
+import itertools
+import os
+import queue
+import secrets
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+DEFAULT_SOCKET = os.environ.get('INTERVIEW_SCORING_SOCKET') or os.path.join(
+    tempfile.gettempdir(), f'interview-scoring-{os.getuid()}', 'scoring.sock'
+)
+
+
+def key_path(address):
+    return address + '.key'
+
+
+def load_authkey(address):
+    """INTERVIEW_SCORING_AUTHKEY, else the key the worker wrote next to its socket, else None"""
+    key = os.environ.get('INTERVIEW_SCORING_AUTHKEY')
+    if key:
+        return key.encode('utf-8')
+    try:
+        with open(key_path(address), 'rb') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def create_authkey(address):
+    """INTERVIEW_SCORING_AUTHKEY, or a fresh random key written to `<socket>.key` readable only by us"""
+    key = os.environ.get('INTERVIEW_SCORING_AUTHKEY')
+    if key:
+        return key.encode('utf-8')
+    key = secrets.token_hex(32).encode('utf-8')
+    tmp_path = f"{key_path(address)}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    os.replace(tmp_path, key_path(address))
+    return key
+
+
+class ScoringUnavailable(Exception):
+    """The scoring worker could not be reached or did not answer in time"""
+
+
+class ScoringClient:
+    """
+    Thin, thread-safe client for the scoring worker.
+
+    Connections are pooled and reused. A request that times out or hits a
+    broken connection discards that connection and raises ScoringUnavailable;
+    after a failure the client stays "open-circuit" for `retry_after` seconds so
+    callers fall back immediately instead of each waiting out the timeout. An
+    error reported by the worker itself (unknown bank, scorer exception) also
+    raises ScoringUnavailable so the caller falls back, but keeps the circuit
+    closed since the worker is still answering.
+    """
+
+    def __init__(self, address, timeout=10.0, retry_after=5.0, authkey=None):
+        self.address = address
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.authkey = authkey
+        self._idle = queue.LifoQueue()
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'failures': 0, 'worker_errors': 0, 'skipped': 0}
+
+    def _connect(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        if not os.path.exists(self.address):
+            raise ScoringUnavailable(f"no scoring worker socket at {self.address}")
+        # Re-read per new connection: a restarted worker writes a new key
+        authkey = self.authkey or load_authkey(self.address)
+        if not authkey:
+            raise ScoringUnavailable(f"no scoring worker key (INTERVIEW_SCORING_AUTHKEY or {key_path(self.address)})")
+        return Client(self.address, family='AF_UNIX', authkey=authkey)
+
+    def request(self, payload, timeout=None):
+        with self._lock:
+            if time.monotonic() < self._down_until:
+                self.stats['skipped'] += 1
+                raise ScoringUnavailable("scoring worker marked unavailable")
+            self.stats['requests'] += 1
+
+        conn = None
+        try:
+            conn = self._connect()
+            conn.send(payload)
+            if not conn.poll(self.timeout if timeout is None else timeout):
+                raise TimeoutError("scoring worker timed out")
+            response = conn.recv()
+        except Exception as e:
+            with self._lock:
+                self.stats['failures'] += 1
+                self._down_until = time.monotonic() + self.retry_after
+            if conn is not None:
+                conn.close()
+            if isinstance(e, ScoringUnavailable):
+                raise
+            raise ScoringUnavailable(str(e)) from e
+
+        self._idle.put(conn)
+        if not response.get('ok'):
+            with self._lock:
+                self.stats['worker_errors'] += 1
+            raise ScoringUnavailable(f"scoring worker error: {response.get('error', 'unknown')}")
+        return response
+
+    def score(self, answer, ref_answers=None, question_id=None, bank=None):
+        response = self.request({
+            'op': 'score',
+            'answer': answer,
+            'ref_answers': list(ref_answers or []),
+            'question_id': question_id,
+            'bank': bank,
+        })
+        return response['similarity'], response['is_correct']
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+    def ping(self, timeout=1.0):
+        return self.request({'op': 'ping'}, timeout=timeout)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class ScoringServer:
+    def __init__(self, system, workers=1, window_ms=5, max_batch=32, timeout_s=None):
+        from batch_scorer import BatchScorer
+        from interview_system import CORRECT_THRESHOLD, SCORING_TIMEOUT_S
+
+        self.system = system
+        # Past the client's own timeout nobody is waiting for the answer any more
+        self.timeout_s = SCORING_TIMEOUT_S if timeout_s is None else timeout_s
+        # Reference indexes are looked up per request, by question bank
+        self.scorers = [
+            BatchScorer(
+                system.model,
+                window_ms=window_ms,
+                max_batch=max_batch,
+                threshold=CORRECT_THRESHOLD,
+                encode_fn=system.encode_texts,
+                chunker=system.answer_chunker,
+                cascade=system.cascade_grader,
+            )
+            for _ in range(max(int(workers), 1))
+        ]
+        self._next_scorer = itertools.cycle(self.scorers)
+        self._next_lock = threading.Lock()
+
+    def _scorer(self):
+        with self._next_lock:
+            return next(self._next_scorer)
+
+    def handle(self, message):
+        op = message.get('op')
+        if op == 'score':
+            reference_index = self.system.banks.get(message.get('bank')).reference_index
+            similarity, is_correct = self._scorer().score(
+                message.get('answer', ''), message.get('ref_answers'), message.get('question_id'),
+                timeout=self.timeout_s, reference_index=reference_index,
+            )
+            return {'ok': True, 'similarity': similarity, 'is_correct': is_correct}
+        if op == 'ping':
+            return {'ok': True, 'pid': os.getpid()}
+        if op == 'stats':
+            stats = self.system.get_stats()
+            stats['workers'] = [dict(scorer.stats) for scorer in self.scorers]
+            return {'ok': True, 'stats': stats}
+        return {'ok': False, 'error': f"unknown op {op!r}"}
+
+    def _serve_connection(self, conn):
+        with conn:
+            while True:
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    response = self.handle(message)
+                except Exception as e:
+                    response = {'ok': False, 'error': str(e) or type(e).__name__}
+                try:
+                    conn.send(response)
+                except (BrokenPipeError, OSError):
+                    return
+
+    def serve_forever(self, address):
+        directory = os.path.dirname(os.path.abspath(address))
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700)
+        if os.path.exists(address):
+            os.unlink(address)
+        authkey = create_authkey(address)
+        # The socket is created owner-only, with no window where others could connect
+        old_umask = os.umask(0o177)
+        try:
+            listener = Listener(address, family='AF_UNIX', authkey=authkey)
+        finally:
+            os.umask(old_umask)
+        os.chmod(address, 0o600)
+        with listener:
+            print(f"🎯 Scoring worker {os.getpid()} listening on {address}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    print(f"⚠️ Rejected scoring connection: {e}")
+                    continue
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--socket', default=DEFAULT_SOCKET)
+    parser.add_argument('--workers', type=int, default=1, help='batching scorers sharing the model')
+    parser.add_argument('--threads', type=int, default=1, help='torch intra-op threads for the process')
+    parser.add_argument('--window-ms', type=float, default=5)
+    parser.add_argument('--max-batch', type=int, default=32)
+    parser.add_argument('--timeout-s', type=float, default=None,
+                        help='per-request scoring timeout (default INTERVIEW_SCORING_TIMEOUT_S)')
+    args = parser.parse_args()
+
+    # Must be set before torch spins up its thread pool
+    os.environ.setdefault('OMP_NUM_THREADS', str(args.threads))
+    import torch
+    torch.set_num_threads(args.threads)
+    torch.set_num_interop_threads(1)
+
+    from interview_system import InterviewSystem
+
+    system = InterviewSystem(scoring_socket=None)
+    system.components.load_all()
+    if not system.components.is_ready:
+        raise SystemExit(f"❌ Scoring worker failed to load: {system.components.status()}")
+
+    server = ScoringServer(system, workers=args.workers, window_ms=args.window_ms, max_batch=args.max_batch,
+                           timeout_s=args.timeout_s)
+    server.serve_forever(args.socket)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+class SkillStore:
+    """
+    Resume scan results keyed by upload id.
+
+    Every upload gets its own entry, so concurrent candidates never see each
+    other's skills. Entries live in an in-process dict that is bounded by
+    count (oldest first out) and expire `ttl_s` seconds after the upload. An
+    optional SQLite file keeps them across restarts and lets several API
+    processes share one store; it is written through on put() and read on a
+    memory miss.
+    """
+
+    def __init__(self, ttl_s=24 * 3600, max_entries=10000, db_path=None):
+        self.ttl_s = ttl_s
+        self.max_entries = max(int(max_entries), 1)
+        self.db_path = db_path
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'puts': 0, 'hits': 0, 'disk_hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+
+        self._db = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS skills '
+                '(upload_id TEXT PRIMARY KEY, created REAL NOT NULL, result TEXT NOT NULL)'
+            )
+            self._db.commit()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def new_id():
+        return uuid.uuid4().hex
+
+    def _expired(self, created, now):
+        return self.ttl_s > 0 and now - created > self.ttl_s
+
+    def _evict(self, now):
+        # Entries are in upload order, so expired ones are at the front
+        while self._entries:
+            upload_id, (created, _) = next(iter(self._entries.items()))
+            if not self._expired(created, now):
+                break
+            del self._entries[upload_id]
+            self.stats['expired'] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def put(self, result, upload_id=None):
+        """Store a scan result (a JSON-serializable dict); returns its upload id"""
+        upload_id = upload_id or self.new_id()
+        now = time.time()
+        with self._lock:
+            self._entries[upload_id] = (now, result)
+            self._entries.move_to_end(upload_id)
+            self.stats['puts'] += 1
+            self._evict(now)
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO skills (upload_id, created, result) VALUES (?, ?, ?)',
+                    (upload_id, now, json.dumps(result)),
+                )
+                if self.ttl_s > 0:
+                    self._db.execute('DELETE FROM skills WHERE created < ?', (now - self.ttl_s,))
+                self._db.commit()
+        return upload_id
+
+    def get(self, upload_id):
+        """The stored result, or None if the id is unknown or has expired"""
+        if not upload_id:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(upload_id)
+            if entry is not None:
+                if self._expired(entry[0], now):
+                    del self._entries[upload_id]
+                    self.stats['expired'] += 1
+                    return None
+                self.stats['hits'] += 1
+                return entry[1]
+            if self._db is not None:
+                row = self._db.execute(
+                    'SELECT created, result FROM skills WHERE upload_id = ?', (upload_id,)
+                ).fetchone()
+                if row is not None and not self._expired(row[0], now):
+                    self.stats['disk_hits'] += 1
+                    return json.loads(row[1])
+            self.stats['misses'] += 1
+            return None
+
+    def get_stats(self):
+        with self._lock:
+            self._evict(time.time())
+            stats = dict(self.stats)
+            stats.update({
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_s': self.ttl_s,
+                'disk_enabled': self._db is not None,
+            })
+        return stats
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
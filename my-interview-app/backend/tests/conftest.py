@@ -0,0 +1,9 @@
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Backend modules are flat files imported by name, as app.py does
+sys.path.insert(0, BACKEND_DIR)
+# The resume scanner lives next to my-interview-app; app.py appends it the same way
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(BACKEND_DIR)), "ResumeScanner_AI"))
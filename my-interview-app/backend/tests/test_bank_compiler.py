@@ -0,0 +1,117 @@
+import csv
+
+import numpy as np
+import pytest
+
+import bank_compiler
+from bank_compiler import CompiledQuestionBank, _code_dtype, compile_bank, load_or_compile, read_header
+from question_bank import QUESTION_COLUMNS, QuestionBank
+
+ROWS = [
+    (1, "What is a stack?", "LIFO", "push/pop", "", "", "Data Structures", "Easy"),
+    (2, "What is a queue?", "FIFO", "", "", "", "Data Structures", "Easy"),
+    (3, "Explain B-trees", "Balanced", "Disk friendly", "Logarithmic", "", "Data Structures", "Hard"),
+    (4, "¿Qué es TCP? — ünïcode", "Transport", "Reliable", "", "", "Networking", "Medium"),
+    (5, "What is UDP?", "Datagrams", "", "", "", "Networking", "Easy"),
+    (6, "What is a heap?", "Priority", "", "", "", "Data Structures", "Easy"),
+]
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(QUESTION_COLUMNS)
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def questions_csv(tmp_path):
+    path = tmp_path / "questions.csv"
+    write_csv(path, ROWS)
+    return str(path)
+
+
+def as_records(bank):
+    return [bank.record(pos) for pos in range(len(bank))]
+
+
+def test_round_trip_matches_csv(questions_csv, tmp_path):
+    out_path = str(tmp_path / "questions.qbank")
+    compile_bank(questions_csv, out_path)
+    compiled = CompiledQuestionBank(out_path)
+    expected = QuestionBank([tuple(row) for row in ROWS])
+
+    assert len(compiled) == len(ROWS)
+    assert as_records(compiled) == as_records(expected)
+    assert sorted(compiled.categories) == sorted(expected.categories)
+    for key, positions in expected.by_category_difficulty.items():
+        np.testing.assert_array_equal(compiled.positions(*key), positions)
+    for category, positions in expected.by_category.items():
+        assert sorted(compiled.positions(category).tolist()) == positions.tolist()
+    assert compiled.column('Question') == [row[1] for row in ROWS]
+    picked = compiled.select(["Networking"], 5, seed=1)
+    assert sorted(q['Question Number'] for q in picked) == [4, 5]
+
+
+def test_header_records_section_dtypes(questions_csv, tmp_path):
+    out_path = str(tmp_path / "questions.qbank")
+    header = compile_bank(questions_csv, out_path)
+    assert read_header(out_path) == header
+    assert header['sections']['category_codes'][1] == np.dtype(np.uint16).str
+    assert header['sections']['question_numbers'][1] == np.dtype(np.int64).str
+    for offset, _, _ in header['sections'].values():
+        assert offset % bank_compiler.ALIGN == 0
+
+
+def test_code_dtype_widens():
+    assert _code_dtype(1) == np.uint16
+    assert _code_dtype(65536) == np.uint16
+    assert _code_dtype(65537) == np.uint32
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not_a_bank.qbank"
+    path.write_bytes(b"PK\x03\x04 definitely not a bank")
+    with pytest.raises(ValueError):
+        read_header(str(path))
+
+
+def test_missing_columns_are_reported(tmp_path):
+    path = tmp_path / "questions.csv"
+    path.write_text("Question,Category\nWhat?,General\n", encoding='utf-8')
+    with pytest.raises(ValueError, match="Difficulty"):
+        compile_bank(str(path), str(tmp_path / "questions.qbank"))
+
+
+def test_load_or_compile_reuses_unchanged_bank(questions_csv, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    first = load_or_compile(questions_csv, cache_dir)
+
+    def fail(*args):
+        raise AssertionError("bank was recompiled although the CSV did not change")
+
+    monkeypatch.setattr(bank_compiler, 'compile_bank', fail)
+    second = load_or_compile(questions_csv, cache_dir)
+    assert second.csv_sha256 == first.csv_sha256
+    assert as_records(second) == as_records(first)
+
+
+def test_load_or_compile_rebuilds_when_csv_changes(questions_csv, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    first = load_or_compile(questions_csv, cache_dir)
+
+    changed = ROWS[:2] + [(7, "What is DNS?", "Names", "", "", "", "Networking", "Easy")]
+    write_csv(questions_csv, changed)
+    second = load_or_compile(questions_csv, cache_dir)
+    assert second.csv_sha256 != first.csv_sha256
+    assert len(second) == 3
+    assert second.record(2)['Question'] == "What is DNS?"
+    assert read_header(second.path)['csv_sha256'] == second.csv_sha256
+
+
+def test_load_or_compile_replaces_corrupt_bank(questions_csv, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    (cache_dir / "question_bank.qbank").write_bytes(b"QBNK\xff\xff\xff\xff")
+    bank = load_or_compile(questions_csv, str(cache_dir))
+    assert len(bank) == len(ROWS)
@@ -0,0 +1,109 @@
+import csv
+import json
+
+import pytest
+
+import batch_scan
+from batch_scan import completed_hashes, run
+from modules.scan_cache import file_digest
+from resume_scanner import taxonomy_version
+
+RESUMES = {
+    "alice.txt": "Python and cybersecurity.",
+    "bob.txt": "Cybersecurity analyst.",
+    "nested/carol.txt": "Python, Python everywhere.",
+    "nested/dave.txt": "Gardening.",
+}
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    root = tmp_path / "resumes"
+    for name, text in RESUMES.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+    (root / "notes.md").write_text("Python", encoding='utf-8')
+    taxonomy = tmp_path / "allcategories.csv"
+    taxonomy.write_text("Category\nPython (Programming Language)\nCybersecurity\n", encoding='utf-8')
+    return root, str(taxonomy)
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        if str(path).endswith('.jsonl'):
+            return [json.loads(line) for line in f]
+        return list(csv.DictReader(f))
+
+
+def run_quietly(root, output, taxonomy):
+    return run(str(root), str(output), taxonomy, workers=1, progress_every=1000)
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".csv"])
+def test_scans_every_resume_once(corpus, tmp_path, suffix):
+    root, taxonomy = corpus
+    output = tmp_path / f"results{suffix}"
+    summary = run_quietly(root, output, taxonomy)
+    assert summary['scanned'] == len(RESUMES)
+    assert summary['skipped'] == summary['failed'] == 0
+
+    rows = {row['file'].replace('\\', '/'): row for row in read_rows(output)}
+    assert set(rows) == set(RESUMES)
+    hits = rows["nested/carol.txt"]['hits']
+    assert (json.loads(hits) if suffix == ".csv" else hits) == {"Python (Programming Language)": 2}
+
+    again = run_quietly(root, output, taxonomy)
+    assert again['scanned'] == 0
+    assert again['skipped'] == len(RESUMES)
+    assert len(read_rows(output)) == len(RESUMES)
+
+
+@pytest.mark.parametrize("suffix, torn", [
+    (".jsonl", '{"file": "alice.txt", "sha256": "'),
+    (".csv", 'alice.txt,abc123,deadbeef,"Python (Programming Language)'),
+    (".csv", 'alice.txt,abc123'),
+])
+def test_resume_after_torn_last_line(corpus, tmp_path, suffix, torn):
+    root, taxonomy = corpus
+    output = tmp_path / f"results{suffix}"
+    (root / "nested" / "dave.txt").unlink()
+    run_quietly(root, output, taxonomy)
+    # A crash mid-write leaves the last row cut off, with no newline
+    with open(output, 'a', encoding='utf-8', newline='') as f:
+        f.write(torn)
+    (root / "nested" / "dave.txt").write_text(RESUMES["nested/dave.txt"], encoding='utf-8')
+
+    summary = run_quietly(root, output, taxonomy)
+    assert summary['skipped'] == len(RESUMES) - 1
+    assert summary['scanned'] == 1
+
+    rows = read_rows(output)
+    assert sorted(row['file'].replace('\\', '/') for row in rows) == sorted(RESUMES)
+    with open(output, encoding='utf-8') as f:
+        assert torn not in f.read().splitlines()
+
+
+def test_torn_row_is_not_counted_as_done(corpus, tmp_path):
+    root, taxonomy = corpus
+    output = tmp_path / "results.csv"
+    run_quietly(root, output, taxonomy)
+    version = taxonomy_version(taxonomy)
+    assert len(completed_hashes(str(output), version)) == len(RESUMES)
+
+    digest = file_digest(str(root / "alice.txt"))
+    with open(output, 'a', encoding='utf-8', newline='') as f:
+        f.write(f'alice.txt,{digest},{version},Python,"{{""Python')
+    assert len(completed_hashes(str(output), version)) == len(RESUMES)
+    assert completed_hashes(str(output), "other taxonomy") == set()
+
+
+def test_drop_torn_line_spans_blocks(tmp_path):
+    path = tmp_path / "results.jsonl"
+    path.write_bytes(b'{"a": 1}\n' + b'x' * 50)
+    batch_scan._drop_torn_line(str(path), block_size=8)
+    assert path.read_bytes() == b'{"a": 1}\n'
+
+    path.write_bytes(b'y' * 30)
+    batch_scan._drop_torn_line(str(path), block_size=8)
+    assert path.read_bytes() == b''
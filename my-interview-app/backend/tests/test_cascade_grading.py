@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from cascade_grading import STUB_MODEL, CascadeGrader, StubCrossEncoder, load_cross_encoder
+
+
+class RecordingModel:
+    """Wraps a cross-encoder and records every predict() call"""
+
+    def __init__(self, model=None, scores=None):
+        self.model = model or StubCrossEncoder()
+        self.scores = scores
+        self.calls = []
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        self.calls.append(list(pairs))
+        if self.scores is not None:
+            return np.asarray(self.scores[:len(pairs)], dtype=np.float32)
+        return self.model.predict(pairs, batch_size=batch_size)
+
+
+def test_load_stub():
+    assert isinstance(load_cross_encoder(STUB_MODEL), StubCrossEncoder)
+
+
+def test_stub_scores_word_overlap():
+    scores = StubCrossEncoder().predict([
+        ("a stack is lifo", "a stack is lifo"),
+        ("a stack is lifo", "queues are fifo"),
+        ("stack queue", "stack heap"),
+    ])
+    assert scores.dtype == np.float32
+    assert scores[0] == pytest.approx(1.0)
+    assert scores[1] == 0.0
+    assert scores[2] == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("similarity, expected", [
+    (0.5, True), (0.41, True), (0.59, True), (0.6, True), (0.39, False), (0.61, False), (0.95, False),
+])
+def test_needs_review_band(similarity, expected):
+    grader = CascadeGrader(StubCrossEncoder(), threshold=0.5, band=0.1)
+    assert grader.needs_review(similarity) is expected
+
+
+def test_clear_cases_are_not_escalated():
+    model = RecordingModel()
+    grader = CascadeGrader(model, threshold=0.5, band=0.1)
+    results = grader.grade([("anything", ["reference"]), ("anything", ["reference"])], [0.9, 0.1])
+    assert results == [(pytest.approx(0.9), True), (pytest.approx(0.1), False)]
+    assert model.calls == []
+    stats = grader.get_stats()
+    assert stats['answers'] == 2
+    assert stats['escalated'] == 0
+    assert stats['escalated_pct'] == 0.0
+
+
+def test_escalated_answers_share_one_predict_call():
+    model = RecordingModel()
+    grader = CascadeGrader(model, threshold=0.5, band=0.1)
+    items = [
+        ("a stack is last in first out", ["a stack is last in first out", "lifo order"]),
+        ("clear pass", ["ignored"]),
+        ("bananas", ["a queue is first in first out"]),
+    ]
+    results = grader.grade(items, [0.45, 0.95, 0.55])
+
+    # Both borderline answers, with every reference answer, in a single batch
+    assert len(model.calls) == 1
+    assert len(model.calls[0]) == 3
+    assert results[0] == (pytest.approx(1.0), True)
+    assert results[1] == (pytest.approx(0.95), True)
+    assert results[2] == (0.0, False)
+
+
+def test_threshold_decision_uses_best_reference():
+    grader = CascadeGrader(RecordingModel(scores=[0.2, 0.7, 0.5]), threshold=0.5, band=0.1)
+    (score, is_correct), = grader.grade([("answer", ["r1", "r2", "r3"])], [0.48])
+    assert score == pytest.approx(0.7)
+    assert is_correct
+    # Equal to the threshold is not a pass, as in the first stage
+    grader = CascadeGrader(RecordingModel(scores=[0.5]), threshold=0.5, band=0.1)
+    assert grader.grade([("answer", ["r1"])], [0.52]) == [(pytest.approx(0.5), False)]
+
+
+def test_answers_without_references_keep_first_stage_score():
+    model = RecordingModel()
+    grader = CascadeGrader(model, threshold=0.5, band=0.1)
+    assert grader.grade([("answer", [])], [0.55]) == [(pytest.approx(0.55), True)]
+    assert model.calls == []
+
+
+def test_stats_count_escalations_and_flips():
+    grader = CascadeGrader(RecordingModel(), threshold=0.5, band=0.1)
+    grader.grade([("same words here", ["same words here"]), ("x", ["y"])], [0.45, 0.55])
+    grader.grade([("clear", ["clear"])], [0.05])
+    stats = grader.get_stats()
+    assert stats['answers'] == 3
+    assert stats['escalated'] == 2
+    assert stats['flipped'] == 2
+    assert stats['batches'] == 1
+    assert stats['escalated_pct'] == pytest.approx(66.67)
+    assert 'batch_p50_ms' in stats
+
+
+def test_logit_scores_go_through_sigmoid():
+    grader = CascadeGrader(RecordingModel(scores=[2.0]), threshold=0.5, band=0.1, logits=True)
+    (score, is_correct), = grader.grade([("answer", ["ref"])], [0.45])
+    assert score == pytest.approx(1 / (1 + np.exp(-2.0)))
+    assert is_correct
+
+
+def test_out_of_range_scores_keep_first_stage_grades():
+    grader = CascadeGrader(RecordingModel(scores=[-3.0]), threshold=0.5, band=0.1)
+    assert grader.grade([("answer", ["ref"])], [0.55]) == [(pytest.approx(0.55), True)]
+    stats = grader.get_stats()
+    assert stats['out_of_range'] == 1
+    assert stats['flipped'] == 0
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from embedding_cache import EmbeddingCache, cache_key, normalize_text
+
+DIM = 4
+
+
+class CountingEncoder:
+    """Deterministic fake encoder that records which texts it was asked for"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        rows = []
+        for text in texts:
+            seed = sum(text.encode('utf-8'))
+            row = np.arange(1, DIM + 1, dtype=np.float32) * (seed % 97 + 1)
+            rows.append(row / np.linalg.norm(row))
+        return np.asarray(rows, dtype=np.float32)
+
+    @property
+    def encoded(self):
+        return [text for call in self.calls for text in call]
+
+
+def test_keys_ignore_whitespace_and_depend_on_model():
+    assert normalize_text("  a stack\n is   lifo ") == "a stack is lifo"
+    assert cache_key("m", "a  stack") == cache_key("m", "a stack")
+    assert cache_key("m", "a stack") != cache_key("other", "a stack")
+
+
+def test_hits_skip_the_encoder():
+    encoder = CountingEncoder()
+    cache = EmbeddingCache("m")
+    first = cache.encode(["alpha", "beta", "alpha"], encoder)
+    second = cache.encode(["beta", " alpha "], encoder)
+    assert encoder.encoded == ["alpha", "beta"]
+    np.testing.assert_array_equal(first[0], first[2])
+    np.testing.assert_array_equal(second, first[[1, 0]])
+    stats = cache.get_stats()
+    assert stats['misses'] == 3
+    assert stats['hits'] == 2
+
+
+def test_lru_evicts_least_recently_used():
+    encoder = CountingEncoder()
+    cache = EmbeddingCache("m", max_entries=2)
+    cache.encode(["a", "b"], encoder)
+    cache.encode(["a"], encoder)  # "b" is now the oldest
+    cache.encode(["c"], encoder)
+    assert len(cache) == 2
+    assert cache.get_stats()['evictions'] == 1
+
+    encoder.calls.clear()
+    cache.encode(["a", "c"], encoder)
+    assert encoder.calls == []
+    cache.encode(["b"], encoder)
+    assert encoder.encoded == ["b"]
+
+
+def test_lru_respects_byte_budget():
+    encoder = CountingEncoder()
+    row_bytes = DIM * np.dtype(np.float32).itemsize
+    cache = EmbeddingCache("m", max_entries=100, max_bytes=3 * row_bytes)
+    cache.encode([f"text {i}" for i in range(5)], encoder)
+    stats = cache.get_stats()
+    assert stats['entries'] == 3
+    assert stats['bytes'] == 3 * row_bytes
+    assert stats['evictions'] == 2
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    db_path = str(tmp_path / "cache" / "embeddings.sqlite")
+    encoder = CountingEncoder()
+    cache = EmbeddingCache("m", db_path=db_path)
+    expected = cache.encode(["alpha", "beta"], encoder)
+    cache.close()
+
+    encoder.calls.clear()
+    reopened = EmbeddingCache("m", db_path=db_path)
+    np.testing.assert_array_equal(reopened.encode(["beta", "alpha"], encoder), expected[[1, 0]])
+    assert encoder.calls == []
+    stats = reopened.get_stats()
+    assert stats['disk_hits'] == 2
+    assert stats['disk_entries'] == 2
+    reopened.close()
+
+    other_model = EmbeddingCache("other", db_path=db_path)
+    other_model.encode(["alpha"], encoder)
+    assert encoder.encoded == ["alpha"]
+    other_model.close()
+
+
+def test_memory_evictions_are_served_from_disk(tmp_path):
+    encoder = CountingEncoder()
+    cache = EmbeddingCache("m", max_entries=1, db_path=str(tmp_path / "embeddings.sqlite"))
+    cache.encode(["a", "b"], encoder)
+    encoder.calls.clear()
+    cache.encode(["a"], encoder)
+    assert encoder.calls == []
+    assert cache.get_stats()['disk_hits'] == 1
+    cache.close()
+
+
+def test_empty_input():
+    cache = EmbeddingCache("m")
+    assert cache.encode([], CountingEncoder()).shape == (0, 0)
+
+
+@pytest.mark.parametrize("max_entries", [0, -5])
+def test_disabled_memory_tier_still_encodes(max_entries):
+    encoder = CountingEncoder()
+    cache = EmbeddingCache("m", max_entries=max_entries)
+    assert cache.encode(["a"], encoder).shape == (1, DIM)
+    cache.encode(["a"], encoder)
+    assert encoder.encoded == ["a", "a"]
+    assert len(cache) == 0
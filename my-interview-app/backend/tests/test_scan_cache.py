@@ -0,0 +1,112 @@
+import os
+
+import pytest
+
+from modules.scan_cache import ScanCache, file_digest
+from resume_scanner import ResumeScanner, taxonomy_version
+
+
+def write_taxonomy(path, categories):
+    path.write_text("Category\n" + "".join(f"{c}\n" for c in categories), encoding='utf-8')
+    # Bump the mtime explicitly, so the reload does not depend on timestamp resolution
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+@pytest.fixture
+def taxonomy(tmp_path):
+    path = tmp_path / "allcategories.csv"
+    write_taxonomy(path, ["Python (Programming Language)", "Cybersecurity"])
+    return path
+
+
+@pytest.fixture
+def resume(tmp_path):
+    path = tmp_path / "resume.txt"
+    path.write_text("Python developer who also runs Kubernetes clusters.\n", encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def scanner(taxonomy):
+    scanner = ResumeScanner(str(taxonomy), workers=1, cache=ScanCache())
+    yield scanner
+    scanner.shutdown()
+
+
+def test_taxonomy_version_tracks_file_content(taxonomy):
+    before = taxonomy_version(str(taxonomy))
+    assert taxonomy_version(str(taxonomy)) == before
+    write_taxonomy(taxonomy, ["Kubernetes"])
+    assert taxonomy_version(str(taxonomy)) != before
+
+
+def test_rescan_is_served_from_cache(scanner, resume):
+    first = scanner.scan_file(str(resume))
+    second = scanner.scan_file(str(resume))
+    assert first['cache'] == 'miss'
+    assert second['cache'] == 'hit'
+    assert second['hits'] == first['hits'] == {"Python (Programming Language)": 1}
+    assert second['sha256'] == file_digest(str(resume))
+
+
+def test_new_taxonomy_rematches_cached_text(scanner, taxonomy, resume, monkeypatch):
+    scanner.scan_file(str(resume))
+    write_taxonomy(taxonomy, ["Python (Programming Language)", "Kubernetes"])
+
+    import resume_scanner
+
+    def fail(path):
+        raise AssertionError("text was extracted again although it was cached")
+
+    monkeypatch.setattr(resume_scanner, 'extract_resume_text', fail)
+    rescanned = scanner.scan_file(str(resume))
+    assert rescanned['cache'] == 'text'
+    assert rescanned['hits'] == {"Python (Programming Language)": 1, "Kubernetes": 1}
+    assert scanner.cache.get(rescanned['sha256'])['taxonomy'] == scanner.taxonomy_version
+
+    assert scanner.scan_file(str(resume))['cache'] == 'hit'
+
+
+def test_changed_file_bytes_miss(scanner, resume):
+    scanner.scan_file(str(resume))
+    resume.write_text("Now a Cybersecurity analyst.\n", encoding='utf-8')
+    result = scanner.scan_file(str(resume))
+    assert result['cache'] == 'miss'
+    assert result['categories'] == ["Cybersecurity"]
+
+
+def test_disk_tier_keeps_taxonomy_across_restarts(tmp_path, taxonomy, resume):
+    db_path = str(tmp_path / "scan_cache.sqlite")
+    cache = ScanCache(db_path=db_path)
+    scanner = ResumeScanner(str(taxonomy), workers=1, cache=cache)
+    scanner.scan_file(str(resume))
+    scanner.shutdown()
+    cache.close()
+
+    write_taxonomy(taxonomy, ["Kubernetes"])
+    cache = ScanCache(db_path=db_path)
+    scanner = ResumeScanner(str(taxonomy), workers=1, cache=cache)
+    result = scanner.scan_file(str(resume))
+    assert result['cache'] == 'text'
+    assert result['categories'] == ["Kubernetes"]
+    assert cache.get_stats()['disk_hits'] == 1
+    scanner.shutdown()
+    cache.close()
+
+
+def test_lru_evicts_by_entries_and_bytes():
+    cache = ScanCache(max_entries=2)
+    cache.put("a", "text a", "v1", {})
+    cache.put("b", "text b", "v1", {})
+    cache.get("a")
+    cache.put("c", "text c", "v1", {})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+    small = ScanCache(max_entries=10, max_bytes=10)
+    small.put("a", "12345", "v1", {})
+    small.put("b", "67890", "v1", {})
+    small.put("c", "x", "v1", {})
+    assert small.get_stats()['bytes'] <= 10
+    assert small.get("a") is None
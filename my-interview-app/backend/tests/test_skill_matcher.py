@@ -0,0 +1,96 @@
+import random
+import re
+
+import pytest
+
+from modules.skill_matcher import SkillMatcher
+from resume_scanner import (
+    DEFAULT_ALLCATEGORIES, compile_categories, extract_keywords_from_category, read_allcategories,
+)
+
+TAXONOMY = [
+    ("Java", ["java"]),
+    ("JavaScript", ["javascript", "typescript"]),
+    ("C++", ["c++"]),
+    ("Machine Learning", ["machine learning", "learning"]),
+    ("Go", ["go"]),
+    ("Databases", ["sql", "nosql"]),
+]
+
+
+def regex_hits(taxonomy, text):
+    """Whole-word reference matcher: one regex per keyword, overlapping hits counted"""
+    text = text.lower()
+    hits = {}
+    for category, keywords in taxonomy:
+        count = 0
+        for keyword in {k.strip().lower() for k in keywords if k.strip()}:
+            pattern = r'(?=(?<!\w)' + re.escape(keyword) + r'(?!\w))'
+            count += sum(1 for _ in re.finditer(pattern, text))
+        if count:
+            hits[category] = count
+    return hits
+
+
+def legacy_match(text, allcats):
+    """scan_single_resume's substring loop before SkillMatcher"""
+    text_lower = text.lower()
+    return [category for category in allcats
+            if any(keyword in text_lower for keyword in extract_keywords_from_category(category))]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Ten years of Java.", ["Java"]),
+    ("Wrote JavaScript daily", ["JavaScript"]),
+    ("java_script and javas", []),
+    ("C++17 and c++", ["C++"]),
+    ("cpp, c+, c++", ["C++"]),
+    ("MACHINE   learning", ["Machine Learning"]),
+    ("deep-learning", ["Machine Learning"]),
+    ("Django, golang, go-to", ["Go"]),
+    ("NoSQL/SQL", ["Databases"]),
+    ("", []),
+])
+def test_word_boundaries(text, expected):
+    assert SkillMatcher(TAXONOMY).match(text) == expected
+
+
+def test_overlapping_keywords_all_count():
+    hits = SkillMatcher(TAXONOMY).category_hits("machine learning and more learning")
+    assert hits == {"Machine Learning": 3}
+
+
+def test_find_reports_spans():
+    text = "Knows Java and C++."
+    spans = [(start, end, keyword) for start, end, keyword in SkillMatcher(TAXONOMY).find(text)]
+    assert spans == [(6, 10, "java"), (15, 18, "c++")]
+    assert [text[start:end].lower() for start, end, _ in spans] == ["java", "c++"]
+
+
+def test_shared_keyword_counts_for_every_category():
+    matcher = SkillMatcher([("A", ["python"]), ("B", ["python", "django"]), ("C", ["rust"])])
+    assert matcher.category_hits("python and django") == {"A": 1, "B": 2}
+
+
+def test_matches_regex_reference_on_random_text():
+    rng = random.Random(7)
+    keywords = sorted({k for _, words in TAXONOMY for k in words})
+    pieces = keywords + ["script", "sharp", "_", "+", "-", ".", ",", "ing", "x", "\n"]
+    matcher = SkillMatcher(TAXONOMY)
+    for _ in range(300):
+        text = "".join(rng.choice(pieces) + rng.choice(["", " ", " ", "/"]) for _ in range(rng.randint(0, 40)))
+        assert matcher.category_hits(text) == regex_hits(TAXONOMY, text), text
+
+
+def test_real_taxonomy_agrees_with_regex_and_legacy_matchers():
+    allcats = read_allcategories(DEFAULT_ALLCATEGORIES)
+    assert allcats
+    taxonomy = [(category, extract_keywords_from_category(category)) for category in allcats]
+    matcher = compile_categories(allcats)
+    text = ("Built machine learning pipelines on AWS and Azure, wrote Python and TypeScript, "
+            "ran CI/CD and data analytics for a full-stack team.")
+    assert matcher.category_hits(text) == regex_hits(taxonomy, text)
+    # Whole words only ever drop hits the old substring loop made, never add new ones
+    assert matcher.match(text) == legacy_match(text, allcats)
+    glued = "pythonic javascripting databases"
+    assert set(matcher.match(glued)) < set(legacy_match(glued, allcats))
@@ -20,6 +20,7 @@ interface ExtractedSkill {
 
 interface UploadResponse {
   message: string;
+  upload_id?: string;
   filename: string;
   extracted_skills: {
     skills_found: ExtractedSkill[];
@@ -512,6 +513,8 @@ export function InterviewEaseInterview({ onStartInterview }: InterviewEaseInterv
         headers: {
           'Content-Type': 'application/json',
         },
+        // Questions come from this candidate's own upload
+        body: JSON.stringify({ upload_id: uploadResult?.upload_id }),
       });
 
       const result = await response.json();